@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Betweenness Centrality Benchmark
+Compares exact, sampled-pivot and process-parallel betweenness on synthetic graphs
+
+Usage:
+    python benchmarks/bench_betweenness.py
+    python benchmarks/bench_betweenness.py --sizes 1000,4000 --sample-size 200 --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soccer_mcp_server import betweenness_centrality, betweenness_error_bound  # noqa: E402
+
+
+def top_ids(centrality: dict, n: int = 10) -> set:
+    """IDs of the n highest-scoring nodes"""
+    return {node for node, _ in sorted(centrality.items(), key=lambda x: x[1], reverse=True)[:n]}
+
+
+def run_size(n_nodes: int, sample_size: int, workers: int, seed: int) -> dict:
+    """Benchmark one graph size and return its measurements"""
+    graph = nx.barabasi_albert_graph(n_nodes, 5, seed=seed)
+
+    start = time.perf_counter()
+    exact = betweenness_centrality(graph)
+    exact_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    approx = betweenness_centrality(graph, sample_size=sample_size)
+    approx_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = betweenness_centrality(graph, workers=workers)
+    parallel_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel_approx = betweenness_centrality(graph, sample_size=sample_size, workers=workers)
+    parallel_approx_seconds = time.perf_counter() - start
+
+    pivots = min(sample_size, n_nodes)
+    return {
+        "nodes": n_nodes,
+        "edges": graph.number_of_edges(),
+        "sample_size": pivots,
+        "workers": workers,
+        "exact_seconds": round(exact_seconds, 4),
+        "approx_seconds": round(approx_seconds, 4),
+        "parallel_exact_seconds": round(parallel_seconds, 4),
+        "parallel_approx_seconds": round(parallel_approx_seconds, 4),
+        "approx_max_abs_error": max(abs(exact[v] - approx[v]) for v in graph),
+        "approx_error_bound": betweenness_error_bound(n_nodes, pivots),
+        "approx_top10_overlap": len(top_ids(exact) & top_ids(approx)) / 10,
+        "parallel_max_abs_diff": max(abs(exact[v] - parallel[v]) for v in graph),
+        "parallel_approx_max_abs_diff": max(abs(approx[v] - parallel_approx[v]) for v in graph)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exact vs approximate betweenness centrality")
+    parser.add_argument('--sizes', default='500,1000,2000,4000', help="Comma-separated node counts")
+    parser.add_argument('--sample-size', type=int, default=100, help="Pivots for the approximate mode")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Processes for the parallel mode")
+    parser.add_argument('--seed', type=int, default=42, help="Graph generator seed")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for size in [int(s) for s in args.sizes.split(',')]:
+        result = run_size(size, args.sample_size, args.workers, args.seed)
+        results.append(result)
+        print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
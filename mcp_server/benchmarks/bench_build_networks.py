@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Graph Construction Benchmark
+Times SoccerGraphLoader.build_networks on synthetic data from 10k to 10M appearance rows
+
+Usage:
+    python benchmarks/bench_build_networks.py
+    python benchmarks/bench_build_networks.py --scales 10000,100000 --verify
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soccer_mcp_server import SoccerGraphLoader, shared_bucket_pairs  # noqa: E402
+from synthetic_data import generate_tables  # noqa: E402
+
+
+def legacy_build_networks(graph_data: dict):
+    """Row-by-row graph construction used before vectorization (reference only)"""
+    player_graph = nx.Graph()
+    persons_df = graph_data['persons']
+    player_contracts_df = graph_data['player_contracts']
+    match_appearances_df = graph_data['match_appearances']
+
+    for _, person in persons_df[persons_df['ROLE'] == 'PLAYER'].iterrows():
+        player_graph.add_node(person['PERSON_ID'], name=person['NAME'],
+                              nationality=person['NATIONALITY'], position=person['POSITION'])
+
+    for _, contract in player_contracts_df.iterrows():
+        club_id = contract['CLUB_ID']
+        player_id = contract['PERSON_ID']
+        other_contracts = player_contracts_df[
+            (player_contracts_df['CLUB_ID'] == club_id) &
+            (player_contracts_df['PERSON_ID'] != player_id)
+        ]
+        for _, other_contract in other_contracts.iterrows():
+            other_player_id = other_contract['PERSON_ID']
+            if not player_graph.has_edge(player_id, other_player_id):
+                player_graph.add_edge(player_id, other_player_id, relationship='teammate', club_id=club_id)
+
+    for _, appearance in match_appearances_df.iterrows():
+        match_id = appearance['MATCH_ID']
+        player_id = appearance['PERSON_ID']
+        other_appearances = match_appearances_df[
+            (match_appearances_df['MATCH_ID'] == match_id) &
+            (match_appearances_df['PERSON_ID'] != player_id)
+        ]
+        for _, other_appearance in other_appearances.iterrows():
+            other_player_id = other_appearance['PERSON_ID']
+            if not player_graph.has_edge(player_id, other_player_id):
+                player_graph.add_edge(player_id, other_player_id,
+                                      relationship='match_co_participation', match_id=match_id)
+
+    club_graph = nx.Graph()
+    clubs_df = graph_data['clubs']
+    matches_df = graph_data['matches']
+
+    for _, club in clubs_df.iterrows():
+        club_graph.add_node(club['CLUB_ID'], name=club['CLUB_NAME'],
+                            country=club['COUNTRY'], founded_year=club['FOUNDED_YEAR'])
+
+    for _, match in matches_df.iterrows():
+        home_club = match['HOME_TEAM_ID']
+        away_club = match['AWAY_TEAM_ID']
+        if not club_graph.has_edge(home_club, away_club):
+            club_graph.add_edge(home_club, away_club, relationship='match', match_id=match['MATCH_ID'])
+
+    for _, contract in player_contracts_df.iterrows():
+        club_id = contract['CLUB_ID']
+        player_id = contract['PERSON_ID']
+        other_contracts = player_contracts_df[
+            (player_contracts_df['PERSON_ID'] == player_id) &
+            (player_contracts_df['CLUB_ID'] != club_id)
+        ]
+        for _, other_contract in other_contracts.iterrows():
+            other_club_id = other_contract['CLUB_ID']
+            if not club_graph.has_edge(club_id, other_club_id):
+                club_graph.add_edge(club_id, other_club_id, relationship='transfer', player_id=player_id)
+
+    return player_graph, club_graph
+
+
+def same_graph(expected: nx.Graph, actual: nx.Graph) -> bool:
+    """Compare nodes, edges and attributes, including insertion order"""
+    return (list(expected.nodes(data=True)) == list(actual.nodes(data=True)) and
+            list(expected.edges(data=True)) == list(actual.edges(data=True)))
+
+
+def run_scale(n_appearances: int, verify: bool, legacy_max_rows: int) -> dict:
+    """Benchmark one scale and return its measurements"""
+    graph_data = generate_tables(n_appearances)
+    loader = SoccerGraphLoader()
+    loader.graph_data = graph_data
+
+    start = time.perf_counter()
+    pairs = shared_bucket_pairs(graph_data['match_appearances'], 'MATCH_ID', 'PERSON_ID')
+    pair_seconds = time.perf_counter() - start
+    del pairs
+
+    start = time.perf_counter()
+    if not loader.build_networks():
+        raise RuntimeError("build_networks failed")
+    build_seconds = time.perf_counter() - start
+
+    result = {
+        "appearance_rows": len(graph_data['match_appearances']),
+        "contract_rows": len(graph_data['player_contracts']),
+        "co_participation_pairs_seconds": round(pair_seconds, 4),
+        "build_networks_seconds": round(build_seconds, 4),
+        "player_nodes": loader.player_graph.number_of_nodes(),
+        "player_edges": loader.player_graph.number_of_edges(),
+        "club_nodes": loader.club_graph.number_of_nodes(),
+        "club_edges": loader.club_graph.number_of_edges(),
+        "edge_weight_bytes": loader.player_weights.nbytes + loader.club_weights.nbytes
+    }
+
+    if n_appearances <= legacy_max_rows:
+        start = time.perf_counter()
+        legacy_player_graph, legacy_club_graph = legacy_build_networks(graph_data)
+        result["legacy_build_seconds"] = round(time.perf_counter() - start, 4)
+        if verify:
+            result["identical_to_legacy"] = (same_graph(legacy_player_graph, loader.player_graph) and
+                                             same_graph(legacy_club_graph, loader.club_graph))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark graph construction")
+    parser.add_argument('--scales', default='10000,100000,1000000,10000000',
+                        help="Comma-separated appearance row counts")
+    parser.add_argument('--verify', action='store_true',
+                        help="Check the vectorized graphs against the row-by-row reference")
+    parser.add_argument('--legacy-max-rows', type=int, default=10000,
+                        help="Largest scale at which the row-by-row reference is also timed")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for scale in [int(s) for s in args.scales.split(',')]:
+        result = run_scale(scale, args.verify, args.legacy_max_rows)
+        results.append(result)
+        print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
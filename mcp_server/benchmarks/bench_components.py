@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Connected Component Benchmark
+Compares whole-graph closeness and Louvain with the per-component versions the server runs
+(component_closeness, component_louvain) on synthetic graphs made of disconnected "leagues"
+of random sizes, in one process and across a process pool
+
+Usage:
+    python benchmarks/bench_components.py
+    python benchmarks/bench_components.py --sizes 2000,8000 --leagues 40 --workers 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soccer_mcp_server import component_closeness, component_louvain, connected_components  # noqa: E402
+
+
+def league_graph(n_nodes: int, leagues: int, seed: int) -> nx.Graph:
+    """Disjoint union of `leagues` clustered graphs whose sizes add up to n_nodes, plus a few
+    isolated nodes"""
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, n_nodes - leagues), leagues - 1))
+    sizes = [b - a for a, b in zip([0] + cuts, cuts + [n_nodes - leagues])]
+    parts = [nx.powerlaw_cluster_graph(size + 5, 3, 0.3, seed=seed + i) for i, size in enumerate(sizes)]
+    graph = nx.disjoint_union_all(parts)
+    graph.add_nodes_from(range(len(graph), len(graph) + 10))
+    return graph
+
+
+def timed(function, *args):
+    """(result, seconds) of one call"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run_size(n_nodes: int, leagues: int, workers: int, seed: int) -> dict:
+    """Benchmark one graph size and return its measurements"""
+    graph = league_graph(n_nodes, leagues, seed)
+    components, components_seconds = timed(connected_components, graph)
+
+    exact, closeness_seconds = timed(nx.closeness_centrality, graph)
+    serial, serial_seconds = timed(component_closeness, graph, components, None, 1)
+    parallel, parallel_seconds = timed(component_closeness, graph, components, None, workers)
+
+    whole, louvain_seconds = timed(nx.community.louvain_communities, graph)
+    communities, component_louvain_seconds = timed(component_louvain, graph, components, 1)
+    parallel_communities, parallel_louvain_seconds = timed(component_louvain, graph, components, workers)
+    return {
+        "nodes": len(graph),
+        "edges": graph.number_of_edges(),
+        "components": len(components),
+        "workers": workers,
+        "components_seconds": round(components_seconds, 4),
+        "closeness_seconds": round(closeness_seconds, 4),
+        "component_closeness_seconds": round(serial_seconds, 4),
+        "parallel_closeness_seconds": round(parallel_seconds, 4),
+        "closeness_matches_networkx": serial == exact and parallel == exact,
+        "louvain_seconds": round(louvain_seconds, 4),
+        "component_louvain_seconds": round(component_louvain_seconds, 4),
+        "parallel_louvain_seconds": round(parallel_louvain_seconds, 4),
+        "louvain_modularity": round(nx.community.modularity(graph, whole), 4),
+        "component_louvain_modularity": round(nx.community.modularity(graph, [set(c) for c in communities]), 4),
+        "communities": len(communities),
+        "louvain_reproducible": communities == parallel_communities == component_louvain(graph, components, 1)
+    }
+
+
+def zero_weight_cases(seed: int) -> dict:
+    """component_louvain on graphs with components whose edges all weigh 0 (as 'shared_matches'
+    weighting gives edges without that relationship), compared with whole-graph Louvain"""
+    mixed = league_graph(600, 4, seed)
+    nx.set_edge_attributes(mixed, 1, 'weight')
+    zero_component = max(nx.connected_components(mixed), key=len)
+    nx.set_edge_attributes(mixed.subgraph(zero_component), 0, 'weight')
+    whole = nx.community.louvain_communities(mixed, weight='weight', seed=42)
+    communities = component_louvain(mixed, connected_components(mixed), 1)
+    
+    # Whole-graph Louvain divides by the total weight of 0 here, so only the singletons are checked
+    empty = nx.Graph([(1, 2, {'weight': 0}), (3, 4, {'weight': 0}), (4, 5, {'weight': 0})])
+    empty_communities = component_louvain(empty, connected_components(empty), 1)
+    return {
+        "zero_weight_nodes": len(zero_component),
+        "zero_weight_singletons": all((node,) in communities for node in zero_component),
+        "networkx_singletons": all({node} in whole for node in zero_component),
+        "louvain_modularity": round(nx.community.modularity(mixed, whole), 4),
+        "component_louvain_modularity": round(nx.community.modularity(mixed, [set(c) for c in communities]), 4),
+        "all_zero_singletons": sorted(empty_communities) == [(node,) for node in sorted(empty)]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-component closeness and Louvain")
+    parser.add_argument('--sizes', default='2000,6000', help="Comma-separated node counts")
+    parser.add_argument('--leagues', type=int, default=30, help="Disconnected components per graph")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Processes for the parallel runs")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for n_nodes in [int(s) for s in args.sizes.split(',') if s]:
+        results.append(run_size(n_nodes, args.leagues, args.workers, args.seed))
+        print(json.dumps(results[-1]), flush=True)
+    zero_weight = zero_weight_cases(args.seed)
+    print(json.dumps(zero_weight), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"sizes": results, "zero_weight": zero_weight}, f, indent=2)
+    if not all(value for key, value in zero_weight.items() if key.endswith('singletons')):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Graph Engine Benchmark
+Compares the NetworkX and CSR engines on the synthetic player graph: memory held by the
+graph structure, and latency of shortest paths, degree, eigenvector and PageRank, checking
+that both engines return identical results
+
+Usage:
+    python benchmarks/bench_graph_engine.py
+    python benchmarks/bench_graph_engine.py --scales 10000,100000 --paths 200
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soccer_mcp_server import CSRGraph, SoccerGraphLoader, pagerank_centrality  # noqa: E402
+from synthetic_data import generate_tables  # noqa: E402
+
+
+def traced_bytes(build):
+    """Return (result, bytes allocated and still held by build())"""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(function, *args):
+    """Return (result, seconds)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run_scale(n_appearances: int, n_paths: int) -> dict:
+    """Benchmark one scale and return its measurements"""
+    loader = SoccerGraphLoader()
+    loader.graph_data = generate_tables(n_appearances)
+    if not loader.build_networks():
+        raise RuntimeError("build_networks failed")
+    graph, graph_bytes = traced_bytes(lambda: nx.Graph(loader.player_graph))
+    csr, csr_seconds = timed(CSRGraph.from_graph, graph)
+
+    result = {
+        "appearance_rows": len(loader.graph_data['match_appearances']),
+        "nodes": graph.number_of_nodes(),
+        "edges": graph.number_of_edges(),
+        "networkx_bytes": graph_bytes,
+        "csr_bytes": csr.nbytes,
+        "csr_build_seconds": round(csr_seconds, 4)
+    }
+
+    nodes = list(graph)
+    rng = random.Random(0)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(n_paths)]
+    nx_paths, nx_seconds = timed(lambda: [nx.shortest_path(graph, s, t) for s, t in pairs])
+    csr_paths, csr_path_seconds = timed(lambda: [csr.shortest_path(s, t) for s, t in pairs])
+    result["shortest_path"] = {
+        "networkx_ms": round(nx_seconds / n_paths * 1000, 4),
+        "csr_ms": round(csr_path_seconds / n_paths * 1000, 4),
+        "identical": nx_paths == csr_paths
+    }
+
+    for name, nx_function, csr_function in [
+        ("degree", nx.degree_centrality, CSRGraph.degree_centrality),
+        ("eigenvector", nx.eigenvector_centrality, CSRGraph.eigenvector_centrality),
+        ("pagerank", pagerank_centrality, CSRGraph.pagerank)
+    ]:
+        expected, nx_seconds = timed(nx_function, graph)
+        actual, csr_seconds = timed(csr_function, csr)
+        result[name] = {
+            "networkx_seconds": round(nx_seconds, 4),
+            "csr_seconds": round(csr_seconds, 4),
+            "identical": expected == actual
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the NetworkX and CSR graph engines")
+    parser.add_argument('--scales', default='10000,100000,1000000',
+                        help="Comma-separated appearance row counts")
+    parser.add_argument('--paths', type=int, default=100, help="Random shortest path queries per scale")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for scale in [int(s) for s in args.scales.split(',')]:
+        result = run_scale(scale, args.paths)
+        results.append(result)
+        print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Incremental Ingestion Benchmark
+Loads a prefix of synthetic data, ingests the remaining rows with SoccerGraphLoader.ingest
+and checks the result against a full build_networks over all rows: graphs, edge weights,
+temporal interval indexes and the contract cube. Two ways of ingesting the tail are checked:
+
+- tail: every table's remaining rows in one ingest
+- late_rows: one ingest per table, rows that reference others first (contracts and
+  appearances before the persons, clubs and matches they point to); each step must also
+  report as stale every graph whose weights or intervals it changed
+
+Exits with status 1 if any result differs from the full build.
+
+Usage:
+    python benchmarks/bench_incremental.py
+    python benchmarks/bench_incremental.py --scales 10000,100000 --tail-fraction 0.01
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import networkx as nx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soccer_mcp_server import SoccerGraphLoader  # noqa: E402
+from synthetic_data import generate_tables  # noqa: E402
+
+# Ingest order of the late_rows scenario: rows referencing other tables arrive first
+LATE_ROWS_ORDER = ['player_contracts', 'match_appearances', 'coach_contracts', 'matches', 'clubs', 'persons']
+
+
+def same_graph_content(expected: nx.Graph, actual: nx.Graph) -> bool:
+    """Compare nodes, edges and attributes, ignoring insertion order"""
+    if dict(expected.nodes(data=True)) != dict(actual.nodes(data=True)):
+        return False
+    if expected.number_of_edges() != actual.number_of_edges():
+        return False
+    return all(actual.has_edge(u, v) and actual.edges[u, v] == data
+               for u, v, data in expected.edges(data=True))
+
+
+def same_columns(expected: dict, actual: dict) -> bool:
+    """Whether two dicts of NumPy arrays hold equal arrays under the same keys"""
+    return expected.keys() == actual.keys() and all(np.array_equal(expected[k], actual[k]) for k in expected)
+
+
+def derived_state(bundle: SoccerGraphLoader, graph_type: str) -> list:
+    """(name, arrays) of everything besides the graph that analytics of one graph type read"""
+    weights = getattr(bundle, f"{graph_type}_weights")
+    state = [(f"{graph_type}_weights", weights.columns)]
+    for relationship, _, index in bundle.temporal_indexes[graph_type]:
+        state.append((f"{graph_type}_intervals/{relationship}", {
+            "buckets": index.buckets, "members": index.members, "start_ns": index.start_ns, "end_ns": index.end_ns}))
+    return state
+
+
+def differences(expected: SoccerGraphLoader, actual: SoccerGraphLoader) -> list:
+    """Names of the parts of actual that differ from expected"""
+    found = []
+    for graph_type in ['player', 'club']:
+        if not same_graph_content(getattr(expected, f"{graph_type}_graph"), getattr(actual, f"{graph_type}_graph")):
+            found.append(f"{graph_type}_graph")
+        found += [name for (name, left), (_, right) in zip(derived_state(expected, graph_type),
+                                                          derived_state(actual, graph_type))
+                  if not same_columns(left, right)]
+    cube, other = expected.contract_cube, actual.contract_cube
+    if not (cube.labels == other.labels and same_columns(cube.cells, other.cells)
+            and same_columns(cube.sketch, other.sketch)):
+        found.append("contract_cube")
+    return found
+
+
+def unreported_stale(before: SoccerGraphLoader, after: SoccerGraphLoader, stale: set) -> list:
+    """Graph types whose graph, weights or intervals changed in an ingest that did not report them"""
+    return [graph_type for graph_type in ['player', 'club'] if graph_type not in stale and (
+        not same_graph_content(getattr(before, f"{graph_type}_graph"), getattr(after, f"{graph_type}_graph")) or
+        not all(same_columns(left, right) for (_, left), (_, right) in zip(derived_state(before, graph_type),
+                                                                           derived_state(after, graph_type))))]
+
+
+def split_tables(graph_data: dict, tail_fraction: float):
+    """Split every table into a loaded prefix and an ingested tail"""
+    prefix, tail = {}, {}
+    for table_name, df in graph_data.items():
+        cut = len(df) - int(len(df) * tail_fraction)
+        prefix[table_name] = df.iloc[:cut].reset_index(drop=True)
+        tail[table_name] = df.iloc[cut:].reset_index(drop=True)
+    return prefix, tail
+
+
+def run_scale(n_appearances: int, tail_fraction: float) -> dict:
+    """Benchmark one scale and return its measurements"""
+    graph_data = generate_tables(n_appearances)
+    prefix, tail = split_tables(graph_data, tail_fraction)
+
+    full = SoccerGraphLoader()
+    full.graph_data = graph_data
+    start = time.perf_counter()
+    if not full.build_networks():
+        raise RuntimeError("build_networks failed")
+    full_seconds = time.perf_counter() - start
+
+    base = SoccerGraphLoader()
+    base.graph_data = prefix
+    if not base.build_networks():
+        raise RuntimeError("build_networks failed")
+
+    incremental = base.copy()
+    start = time.perf_counter()
+    stale = incremental.ingest(tail)
+    ingest_seconds = time.perf_counter() - start
+
+    # Each step ingests into a copy, as GraphStore.ingest does, so the previous bundle stays intact
+    late, unreported = base, {}
+    for table_name in LATE_ROWS_ORDER:
+        following = late.copy()
+        step_stale = following.ingest({table_name: tail[table_name]})
+        missed = unreported_stale(late, following, step_stale)
+        if missed:
+            unreported[table_name] = missed
+        late = following
+
+    mismatches = {"tail": differences(full, incremental), "late_rows": differences(full, late)}
+    return {
+        "appearance_rows": len(graph_data['match_appearances']),
+        "ingested_rows": sum(len(df) for df in tail.values()),
+        "full_build_seconds": round(full_seconds, 4),
+        "ingest_seconds": round(ingest_seconds, 4),
+        "stale_graphs": sorted(stale),
+        "mismatches": {scenario: found for scenario, found in mismatches.items() if found},
+        "unreported_stale": unreported,
+        "identical_to_full_build": not any(mismatches.values()) and not unreported
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental ingestion")
+    parser.add_argument('--scales', default='10000,100000,1000000',
+                        help="Comma-separated appearance row counts")
+    parser.add_argument('--tail-fraction', type=float, default=0.01,
+                        help="Fraction of each table ingested incrementally")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for scale in [int(s) for s in args.scales.split(',')]:
+        result = run_scale(scale, args.tail_fraction)
+        results.append(result)
+        print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if not all(result["identical_to_full_build"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
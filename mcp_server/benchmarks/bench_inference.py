@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Ontology Inference Benchmark
+Times the inference and constraint engine (ontology_inference.py) two ways:
+
+- Seed metadata over synthetic graph_data: KG_EDGE construction, inference, and the full
+  SP_RUN_ONTOLOGY_INFERENCE and SP_CHECK_ONTOLOGY_CONSTRAINTS handlers against a LocalSession
+  (read, evaluate, bulk write)
+- TRANSITIVE rules over random layered DAGs: semi-naive closure against the row-at-a-time
+  path expansion of the former recursive CTE (every path up to depth 5, then DISTINCT),
+  with --verify checking the closure and hop counts against NetworkX
+
+Usage:
+    python benchmarks/bench_inference.py
+    python benchmarks/bench_inference.py --scales 10000,100000 --dag-sizes 1000,5000 --verify
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ontology_inference  # noqa: E402
+from synthetic_data import generate_tables  # noqa: E402
+
+TRANSITIVE_RULE = {"RULE_ID": 'RULE_TRN_BENCH', "RULE_KIND": 'TRANSITIVE', "TARGET_REL": 'PART_OF',
+                   "SOURCE_REL_1": None, "SOURCE_REL_2": None, "INVERSE_OF": None}
+
+
+def timed(function, *args):
+    """(result, seconds) of one call"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run_scale(n_appearances: int, seed: int) -> dict:
+    """Seed inverse rules and relation constraints over synthetic graph_data"""
+    graph_data = generate_tables(n_appearances, seed=seed)
+    tables, kg_seconds = timed(ontology_inference.kg_tables_from_graph_data, graph_data)
+    inferred, infer_seconds = timed(ontology_inference.infer, tables['KG_EDGE'], ontology_inference.SEED_RULES,
+                                    ontology_inference.SEED_RELATIONS)
+    session = ontology_inference.local_session(graph_data)
+    _, procedure_seconds = timed(ontology_inference.sp_run_ontology_inference, session)
+    written = session.sql("SELECT COUNT(*) AS CNT FROM REL_EDGE_INFERRED").collect()[0]['CNT']
+    node_ids = tables['KG_NODE']['NODE_ID']
+    checks = ontology_inference.constraint_checks(ontology_inference.SEED_RELATIONS)
+    violations, check_seconds = timed(ontology_inference.check_constraints, node_ids, tables['KG_EDGE'], checks)
+    _, check_procedure_seconds = timed(ontology_inference.sp_check_ontology_constraints, session)
+    return {
+        "appearances": n_appearances,
+        "kg_edges": len(tables['KG_EDGE']),
+        "inferred": len(inferred),
+        "written": written,
+        "kg_edge_seconds": round(kg_seconds, 4),
+        "infer_seconds": round(infer_seconds, 4),
+        "procedure_seconds": round(procedure_seconds, 4),
+        "checks": len(checks),
+        "violations": len(violations),
+        "check_seconds": round(check_seconds, 4),
+        "check_procedure_seconds": round(check_procedure_seconds, 4)
+    }
+
+
+def layered_dag(n_nodes: int, layers: int, fan_out: int, rng: np.random.Generator) -> pd.DataFrame:
+    """KG_EDGE rows of a random DAG: each node links to `fan_out` nodes of the next layer"""
+    layer_of = np.arange(n_nodes) * layers // n_nodes
+    src, dst = [], []
+    for layer in range(layers - 1):
+        members = np.flatnonzero(layer_of == layer)
+        targets = np.flatnonzero(layer_of == layer + 1)
+        src.append(np.repeat(members, fan_out))
+        dst.append(rng.choice(targets, len(members) * fan_out))
+    edges = pd.DataFrame({"SRC_ID": np.concatenate(src).astype(str), "DST_ID": np.concatenate(dst).astype(str)})
+    edges = edges.drop_duplicates(ignore_index=True)
+    edges['EDGE_TYPE'] = 'PART_OF'
+    edges['WEIGHT'] = 1.0
+    edges['EFFECTIVE_START'] = pd.NaT
+    edges['EFFECTIVE_END'] = pd.NaT
+    return edges
+
+
+def path_expansion(edges: pd.DataFrame, max_depth: int = 5) -> tuple:
+    """The former recursive CTE: extend every path one edge per level up to max_depth, then
+    DISTINCT. Returns (distinct pairs, path rows generated)"""
+    successors = edges.groupby('SRC_ID')['DST_ID'].apply(list).to_dict()
+    frontier = list(zip(edges['SRC_ID'], edges['DST_ID']))
+    pairs = set(frontier)
+    rows = len(frontier)
+    for _ in range(max_depth - 1):
+        frontier = [(src, nxt) for src, dst in frontier for nxt in successors.get(dst, ()) if nxt != src]
+        rows += len(frontier)
+        pairs.update(frontier)
+    return pairs - set(zip(edges['SRC_ID'], edges['DST_ID'])), rows
+
+
+def verify_closure(edges: pd.DataFrame, inferred: pd.DataFrame) -> bool:
+    """Whether the inferred pairs and weights equal NetworkX shortest path lengths >= 2"""
+    graph = nx.DiGraph(list(zip(edges['SRC_ID'], edges['DST_ID'])))
+    expected = {}
+    for source, lengths in nx.all_pairs_shortest_path_length(graph):
+        for target, hops in lengths.items():
+            if hops >= 2:
+                expected[(source, target)] = 1.0 / hops
+    actual = dict(zip(zip(inferred['SRC_ID'], inferred['DST_ID']), inferred['WEIGHT']))
+    return actual == expected
+
+
+def run_dag(n_nodes: int, args) -> dict:
+    """Transitive closure of one random layered DAG"""
+    edges = layered_dag(n_nodes, args.layers, args.fan_out, np.random.default_rng(args.seed))
+    inferred, infer_seconds = timed(ontology_inference.infer, edges, [TRANSITIVE_RULE], [])
+    result = {
+        "nodes": n_nodes,
+        "edges": len(edges),
+        "closure_pairs": len(inferred),
+        "max_hops": int(round(1 / inferred['WEIGHT'].min())) if len(inferred) else 0,
+        "semi_naive_seconds": round(infer_seconds, 4)
+    }
+    if not args.skip_naive:
+        (pairs, rows), naive_seconds = timed(path_expansion, edges)
+        result["depth5_pairs"] = len(pairs)
+        result["depth5_path_rows"] = rows
+        result["depth5_expansion_seconds"] = round(naive_seconds, 4)
+    if args.verify:
+        result["matches_networkx"] = verify_closure(edges, inferred)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ontology inference engine")
+    parser.add_argument('--scales', default='10000,100000', help="Comma-separated synthetic appearance counts")
+    parser.add_argument('--dag-sizes', default='1000,4000', help="Comma-separated DAG node counts")
+    parser.add_argument('--layers', type=int, default=10, help="DAG depth (closures reach layers - 1 hops)")
+    parser.add_argument('--fan-out', type=int, default=4, help="Edges from each node to the next layer")
+    parser.add_argument('--skip-naive', action='store_true', help="Skip the depth-5 path expansion")
+    parser.add_argument('--verify', action='store_true', help="Check closures against NetworkX")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = {"graph_data": [], "transitive": []}
+    for scale in [int(s) for s in args.scales.split(',') if s]:
+        results["graph_data"].append(run_scale(scale, args.seed))
+        print(json.dumps(results["graph_data"][-1]), flush=True)
+    for n_nodes in [int(s) for s in args.dag_sizes.split(',') if s]:
+        results["transitive"].append(run_dag(n_nodes, args))
+        print(json.dumps(results["transitive"][-1]), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
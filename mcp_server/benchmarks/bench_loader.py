@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+JSON Loader Benchmark
+Writes synthetic tables as JSON arrays and as newline-delimited JSON, then loads
+match_appearances in a fresh subprocess per run with json.load + DataFrame (the loader
+used before streaming) and with the streaming loader, reporting peak RSS, load time and
+the memory held by the resulting table
+
+Usage:
+    python benchmarks/bench_loader.py
+    python benchmarks/bench_loader.py --scales 100000,1000000 --keep-files
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import generate_tables, write_graph_data  # noqa: E402
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a subprocess so each measurement starts from a clean peak RSS
+LOAD_SCRIPT = """
+import json, sys, time
+import pandas as pd
+sys.path.insert(0, {server_dir!r})
+from soccer_mcp_server import iter_json_records, peak_rss_bytes, records_to_table
+baseline = peak_rss_bytes()
+start = time.perf_counter()
+if {mode!r} == 'json.load':
+    with open({path!r}) as f:
+        df = pd.DataFrame(json.load(f))
+else:
+    df = records_to_table(iter_json_records({path!r}), 'match_appearances')
+seconds = time.perf_counter() - start
+print(json.dumps({{"rows": len(df), "seconds": round(seconds, 3),
+                  "peak_rss_mb": round((peak_rss_bytes() - baseline) / 2 ** 20, 1),
+                  "table_mb": round(df.memory_usage(deep=True).sum() / 2 ** 20, 1)}}))
+"""
+
+
+def measure(mode: str, path: str) -> dict:
+    """Load one file in a fresh interpreter and return its measurements"""
+    script = LOAD_SCRIPT.format(server_dir=SERVER_DIR, mode=mode, path=path)
+    output = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_scale(n_appearances: int, data_dir: str) -> dict:
+    """Benchmark one scale and return its measurements"""
+    graph_data = generate_tables(n_appearances)
+    json_path = write_graph_data(graph_data, os.path.join(data_dir, 'json'))['match_appearances']
+    ndjson_path = write_graph_data(graph_data, os.path.join(data_dir, 'ndjson'), 'ndjson')['match_appearances']
+    return {
+        "appearance_rows": n_appearances,
+        "json_file_mb": round(os.path.getsize(json_path) / 2 ** 20, 1),
+        "json.load": measure('json.load', json_path),
+        "streaming_json": measure('stream', json_path),
+        "streaming_ndjson": measure('stream', ndjson_path)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare peak memory of the JSON loaders")
+    parser.add_argument('--scales', default='100000,1000000,5000000',
+                        help="Comma-separated appearance row counts")
+    parser.add_argument('--keep-files', action='store_true', help="Keep the generated data directory")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix='graph_data_')
+    results = []
+    try:
+        for scale in [int(s) for s in args.scales.split(',')]:
+            result = run_scale(scale, data_dir)
+            results.append(result)
+            print(json.dumps(result), flush=True)
+    finally:
+        if args.keep_files:
+            print(f"Data written to {data_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(data_dir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
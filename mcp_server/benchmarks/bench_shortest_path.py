@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Shortest Path Benchmark
+Times shortest path queries on the synthetic player graph: NetworkX's nx.shortest_path,
+the depth-bounded bidirectional search, answers from hub BFS trees and path cache hits
+
+Usage:
+    python benchmarks/bench_shortest_path.py
+    python benchmarks/bench_shortest_path.py --scales 10000,100000 --queries 500
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soccer_mcp_server import SoccerGraphLoader, bidirectional_path, find_paths, hub_tree_path  # noqa: E402
+from synthetic_data import generate_tables  # noqa: E402
+
+
+def microseconds_per_query(function, pairs) -> float:
+    """Mean latency of function(source, target) over pairs, in microseconds"""
+    start = time.perf_counter()
+    for source, target in pairs:
+        function(source, target)
+    return round((time.perf_counter() - start) / len(pairs) * 1e6, 2)
+
+
+def run_scale(n_appearances: int, n_queries: int) -> dict:
+    """Benchmark one scale and return its measurements"""
+    loader = SoccerGraphLoader()
+    loader.graph_data = generate_tables(n_appearances)
+    if not loader.build_networks():
+        raise RuntimeError("build_networks failed")
+    graph = loader.player_graph
+    hub_trees = loader.hub_trees['player']
+
+    rng = random.Random(0)
+    nodes = list(graph)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(n_queries)]
+    hub_pairs = [(rng.choice(list(hub_trees)), target) for _, target in pairs]
+
+    def cached(source, target):
+        return find_paths(loader, 'player', source, target)
+
+    for source, target in pairs:
+        cached(source, target)
+
+    return {
+        "appearance_rows": len(loader.graph_data['match_appearances']),
+        "nodes": graph.number_of_nodes(),
+        "edges": graph.number_of_edges(),
+        "networkx_us": microseconds_per_query(lambda s, t: nx.shortest_path(graph, s, t), pairs),
+        "bidirectional_us": microseconds_per_query(lambda s, t: bidirectional_path(graph, s, t), pairs),
+        "hub_tree_us": microseconds_per_query(lambda s, t: hub_tree_path(hub_trees, s, t), hub_pairs),
+        "cache_hit_us": microseconds_per_query(cached, pairs)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shortest path queries")
+    parser.add_argument('--scales', default='10000,100000,1000000',
+                        help="Comma-separated appearance row counts")
+    parser.add_argument('--queries', type=int, default=1000, help="Random queries per scale")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for scale in [int(s) for s in args.scales.split(',')]:
+        result = run_scale(scale, args.queries)
+        results.append(result)
+        print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
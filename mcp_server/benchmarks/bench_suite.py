@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Writes synthetic graph_data at each scale, then times load_from_static_files,
+build_networks, every MCP tool and every Flask endpoint, reporting latency percentiles
+and peak RSS per phase. Results are saved as JSON and can be compared with an earlier
+run to catch regressions.
+
+Usage:
+    python benchmarks/bench_suite.py --scales 10000,100000 --output results.json
+    python benchmarks/bench_suite.py --scales 10000 --output new.json --compare results.json
+    python benchmarks/bench_suite.py --scales 1000000 --skip player/closeness,player/betweenness,/centrality
+
+Peak RSS is the process high-water mark while a phase ran (reset before each phase where
+the kernel allows it, otherwise the high-water mark since start).
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import soccer_mcp_server as server  # noqa: E402
+from synthetic_data import generate_tables, write_graph_data  # noqa: E402
+
+RESULTS_FORMAT_VERSION = 1
+
+
+def latency_stats(samples: list) -> dict:
+    """Count, mean and percentiles of latencies given in seconds, reported in milliseconds"""
+    ms = np.array(samples) * 1000
+    return {
+        "count": len(ms),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p90_ms": round(float(np.percentile(ms, 90)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3)
+    }
+
+
+def measure(calls: list, before_each=None) -> dict:
+    """Time each call, returning latency stats and the peak RSS reached while they ran.
+
+    Args:
+        calls: Zero-argument callables, each timed separately
+        before_each: Optional untimed callable run before every call (e.g. clearing caches)
+    """
+    server.reset_peak_rss()
+    samples = []
+    errors = 0
+    for call in calls:
+        if before_each:
+            before_each()
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception:
+            result = None
+        samples.append(time.perf_counter() - start)
+        if result is None or (isinstance(result, str) and result.startswith('{"error"')):
+            errors += 1
+    stats = latency_stats(samples)
+    stats["errors"] = errors
+    stats["peak_rss_mb"] = round(server.peak_rss_bytes() / 2 ** 20, 1)
+    return stats
+
+
+def clear_caches():
+    """Drop cached analytics and paths so the next call recomputes"""
+    server.analytics_cache.clear()
+    server.path_cache.clear()
+
+
+def tool_cases(bundle: server.SoccerGraphLoader, rng: random.Random, args) -> dict:
+    """Name -> (list of argument dicts, tool, clear caches before each call)"""
+    players = list(bundle.player_graph.nodes)
+    clubs = list(bundle.club_graph.nodes)
+    n = args.calls
+    sample = args.betweenness_sample
+    return {
+        "graph_shortest_path/player": (
+            [dict(source_id=rng.choice(players), target_id=rng.choice(players)) for _ in range(n)],
+            server.graph_shortest_path, True),
+        "graph_shortest_path/club": (
+            [dict(source_id=rng.choice(clubs), target_id=rng.choice(clubs), graph_type='club') for _ in range(n)],
+            server.graph_shortest_path, True),
+        **{
+            f"graph_centrality_analysis/{graph_type}/{analysis}": (
+                [dict(graph_type=graph_type, analysis_type=analysis,
+                      sample_size=sample if analysis == 'betweenness' and graph_type == 'player' else 0)] * args.heavy_calls,
+                server.graph_centrality_analysis, True)
+            for graph_type in ['player', 'club']
+            for analysis in ['degree', 'betweenness', 'closeness', 'eigenvector', 'pagerank']
+        },
+        "graph_centrality_analysis/player/degree/cached": (
+            [dict(graph_type='player', analysis_type='degree')] * n, server.graph_centrality_analysis, False),
+        **{
+            f"graph_community_detection/{graph_type}": (
+                [dict(graph_type=graph_type)] * args.heavy_calls, server.graph_community_detection, True)
+            for graph_type in ['player', 'club']
+        },
+        "graph_community_detection/player/cached": (
+            [dict(graph_type='player')] * n, server.graph_community_detection, False),
+        "graph_community_detection/player/top10/cached": (
+            [dict(graph_type='player', top_k=10, max_members=20)] * n, server.graph_community_detection, False),
+        "graph_transfer_network_analysis/club": (
+            [dict(club_id=rng.choice(clubs)) for _ in range(n)], server.graph_transfer_network_analysis, False),
+        "graph_transfer_network_analysis/player": (
+            [dict(player_id=rng.choice(players)) for _ in range(n)], server.graph_transfer_network_analysis, False),
+        **{
+            f"graph_temporal_analysis/{analysis}": (
+                [dict(time_range='2015-2025', analysis_type=analysis)] * n, server.graph_temporal_analysis, False)
+            for analysis in ['evolution', 'trends']
+        }
+    }
+
+
+def endpoint_cases(bundle: server.SoccerGraphLoader, rng: random.Random, args) -> dict:
+    """Path -> (list of request bodies, clear caches before each request)"""
+    players = list(bundle.player_graph.nodes)
+    clubs = list(bundle.club_graph.nodes)
+    n = args.calls
+    size = args.batch_size
+
+    def batches(make_row, count):
+        return [{"data": [[i, *make_row()] for i in range(size)]} for _ in range(count)]
+
+    sample = args.betweenness_sample
+    return {
+        "/shortest-path": (batches(lambda: [rng.choice(players), rng.choice(players), 'player'], n), True),
+        "/centrality": (batches(lambda: ['player', 'betweenness', 10, sample], args.heavy_calls), True),
+        "/community-detect": (batches(lambda: ['club'], args.heavy_calls), True),
+        "/community-detect?format=ndjson": (batches(lambda: ['player'], n), False),
+        "/transfer-network": (batches(lambda: [rng.choice(clubs), 0, None, None], n), False),
+        "/temporal-analysis": (batches(lambda: ['2015-2025', rng.choice(['evolution', 'trends'])], n), False),
+        "/health": (None, False)
+    }
+
+
+def skipped(name: str, args) -> bool:
+    """Whether a case matches one of the --skip substrings"""
+    return any(pattern and pattern in name for pattern in args.skip.split(','))
+
+
+def run_tools(bundle: server.SoccerGraphLoader, rng: random.Random, args) -> dict:
+    """Latency of every MCP tool, called the way FastMCP calls them (awaited on one event loop)"""
+    loop = asyncio.new_event_loop()
+    results = {}
+    try:
+        for name, (kwargs_list, tool, cold) in tool_cases(bundle, rng, args).items():
+            if skipped(name, args):
+                continue
+            calls = [lambda kwargs=kwargs: loop.run_until_complete(tool(**kwargs)) for kwargs in kwargs_list]
+            results[name] = measure(calls, clear_caches if cold else None)
+    finally:
+        loop.close()
+    return results
+
+
+def response_text(response):
+    """Body of a successful response, or None for an HTTP error (counted by measure)"""
+    return response.get_data(as_text=True) if response.status_code < 400 else None
+
+
+def run_endpoints(bundle: server.SoccerGraphLoader, rng: random.Random, args) -> dict:
+    """Latency of every Flask endpoint through the WSGI test client (no network)"""
+    client = server.flask_app.test_client()
+    results = {}
+    for path, (bodies, cold) in endpoint_cases(bundle, rng, args).items():
+        if skipped(path, args):
+            continue
+        if bodies is None:
+            calls = [lambda: response_text(client.get(path)) for _ in range(args.calls)]
+        else:
+            calls = [lambda body=body: response_text(client.post(path, json=body)) for body in bodies]
+        results[path] = measure(calls, clear_caches if cold else None)
+        results[path]["batch_size"] = args.batch_size if bodies is not None else 1
+    return results
+
+
+def run_scale(n_appearances: int, data_dir: str, args) -> dict:
+    """Write synthetic data at one scale and benchmark every phase over it"""
+    graph_data = generate_tables(n_appearances)
+    paths = write_graph_data(graph_data, data_dir, args.format)
+    rng = random.Random(args.seed)
+
+    loader = None
+
+    def load():
+        nonlocal loader
+        loader = server.SoccerGraphLoader()
+        return loader.load_from_static_files(data_dir) or None
+
+    def build():
+        return loader.build_networks() or None
+
+    result = {
+        "appearance_rows": len(graph_data['match_appearances']),
+        "data_mb": round(sum(os.path.getsize(p) for p in paths.values()) / 2 ** 20, 1),
+        "load_from_static_files": measure([load] * args.load_repeats),
+        "build_networks": measure([build] * args.load_repeats)
+    }
+    result["table_memory_mb"] = {name: stats["memory_mb"] for name, stats in loader.load_stats.items()}
+    result["player_graph"] = {"nodes": loader.player_graph.number_of_nodes(), "edges": loader.player_graph.number_of_edges()}
+    result["club_graph"] = {"nodes": loader.club_graph.number_of_nodes(), "edges": loader.club_graph.number_of_edges()}
+
+    server.graph_store.publish(loader)
+    result["tools"] = run_tools(loader, rng, args)
+    result["endpoints"] = run_endpoints(loader, rng, args)
+    result["rss_mb"] = round(server.current_rss_bytes() / 2 ** 20, 1)
+    return result
+
+
+def run_metadata(args) -> dict:
+    """Environment and options a run was measured under"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "timestamp": datetime.datetime.now().isoformat(timespec='seconds'),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "graph_engine": server.GRAPH_ENGINE,
+        "options": {key: value for key, value in vars(args).items() if key not in ('output', 'compare')}
+    }
+
+
+def latency_entries(results: dict) -> dict:
+    """(appearance rows, phase) -> p50_ms for every timed phase in a results file"""
+    entries = {}
+    for scale in results["scales"]:
+        rows = scale["appearance_rows"]
+        for phase in ["load_from_static_files", "build_networks"]:
+            entries[(rows, phase)] = scale[phase]["p50_ms"]
+        for section in ["tools", "endpoints"]:
+            for name, stats in scale[section].items():
+                entries[(rows, f"{section}:{name}")] = stats["p50_ms"]
+    return entries
+
+
+def compare_results(baseline: dict, current: dict, threshold: float, min_ms: float) -> list:
+    """Print p50 ratios against a baseline run and return the regressions.
+
+    A phase regresses when its p50 grew by more than `threshold` (e.g. 1.25 = 25% slower)
+    and by at least `min_ms`, so sub-millisecond jitter is not reported.
+    """
+    before = latency_entries(baseline)
+    after = latency_entries(current)
+    regressions = []
+    for key in sorted(set(before) & set(after)):
+        old, new = before[key], after[key]
+        ratio = new / old if old > 0 else float('inf')
+        regressed = ratio > threshold and new - old >= min_ms
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{key[0]:>10} {key[1]:<60} {old:>10.3f} -> {new:>10.3f} ms  x{ratio:.2f}{marker}")
+        if regressed:
+            regressions.append({"appearance_rows": key[0], "phase": key[1], "baseline_p50_ms": old,
+                                "p50_ms": new, "ratio": round(ratio, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading, graph construction, MCP tools and endpoints")
+    parser.add_argument('--scales', default='10000,100000', help="Comma-separated appearance row counts")
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json', help="Synthetic data file format")
+    parser.add_argument('--calls', type=int, default=50, help="Calls per lightweight tool or endpoint")
+    parser.add_argument('--heavy-calls', type=int, default=3,
+                        help="Calls per whole-graph analysis (caches are cleared before each)")
+    parser.add_argument('--load-repeats', type=int, default=3, help="Repeats of loading and graph construction")
+    parser.add_argument('--batch-size', type=int, default=10, help="Rows per Service Function request")
+    parser.add_argument('--betweenness-sample', type=int, default=100,
+                        help="Pivot sample for player-graph betweenness (0 = exact)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for query arguments")
+    parser.add_argument('--skip', default='',
+                        help="Comma-separated substrings of tool/endpoint cases to skip (e.g. player/closeness)")
+    parser.add_argument('--data-dir', help="Write the synthetic data here and keep it (default: temporary)")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    parser.add_argument('--compare', help="Earlier results JSON to compare p50 latencies against")
+    parser.add_argument('--threshold', type=float, default=1.25, help="p50 ratio counted as a regression")
+    parser.add_argument('--min-ms', type=float, default=1.0, help="Smallest p50 increase counted as a regression")
+    args = parser.parse_args()
+
+    logging.getLogger('soccer_mcp_server').setLevel(logging.WARNING)
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='graph_data_')
+    results = {"meta": run_metadata(args), "scales": []}
+    try:
+        for scale in [int(s) for s in args.scales.split(',')]:
+            result = run_scale(scale, data_dir, args)
+            results["scales"].append(result)
+            print(json.dumps(result), flush=True)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold, args.min_ms)
+        print(f"{len(regressions)} regression(s) against {args.compare}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
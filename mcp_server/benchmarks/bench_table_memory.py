@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Table Memory Benchmark
+Compares the memory held by each synthetic table with pandas default dtypes (object
+strings, int64 IDs) and with the TABLE_SCHEMAS dtypes, and times the per-year aggregation
+of graph_temporal_analysis: a pandas groupby with nunique on default dtypes against
+yearly_contract_stats on schema dtypes
+
+Usage:
+    python benchmarks/bench_table_memory.py
+    python benchmarks/bench_table_memory.py --scales 100000,1000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soccer_mcp_server import apply_schema, table_memory_mb, yearly_contract_stats  # noqa: E402
+from synthetic_data import generate_tables  # noqa: E402
+
+
+def groupby_yearly_stats(contracts_df: pd.DataFrame) -> pd.DataFrame:
+    """Per-year aggregation as graph_temporal_analysis computed it before yearly_contract_stats"""
+    years = contracts_df['START_DATE'].dt.year.rename('YEAR')
+    return contracts_df.groupby(years).agg({
+        'PERSON_ID': 'nunique', 'CLUB_ID': 'nunique', 'CONTRACT_VALUE': 'sum'
+    }).reset_index()
+
+
+def best_time(function, *args, repeats: int = 5) -> tuple:
+    """Return (result, best of `repeats` runs in seconds)"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def run_scale(n_appearances: int, contracts_per_player: float) -> dict:
+    """Benchmark one scale and return its measurements"""
+    graph_data = generate_tables(n_appearances, contracts_per_player=contracts_per_player)
+    typed = {table_name: apply_schema(df, table_name) for table_name, df in graph_data.items()}
+
+    tables = {
+        table_name: {"rows": len(df), "default_mb": table_memory_mb(df), "schema_mb": table_memory_mb(typed[table_name])}
+        for table_name, df in graph_data.items()
+    }
+    expected, groupby_seconds = best_time(groupby_yearly_stats, graph_data['player_contracts'])
+    actual, stats_seconds = best_time(yearly_contract_stats, typed['player_contracts'])
+    return {
+        "appearance_rows": n_appearances,
+        "tables": tables,
+        "default_total_mb": round(sum(t["default_mb"] for t in tables.values()), 1),
+        "schema_total_mb": round(sum(t["schema_mb"] for t in tables.values()), 1),
+        "contract_rows": len(graph_data['player_contracts']),
+        "yearly_groupby_seconds": round(groupby_seconds, 4),
+        "yearly_contract_stats_seconds": round(stats_seconds, 4),
+        "identical_yearly_stats": expected.astype('int64').equals(actual.astype('int64'))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare table memory with default and schema dtypes")
+    parser.add_argument('--scales', default='100000,1000000,10000000',
+                        help="Comma-separated appearance row counts")
+    parser.add_argument('--contracts-per-player', type=float, default=20.0,
+                        help="Average contracts per player (sizes the contracts table)")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for scale in [int(s) for s in args.scales.split(',')]:
+        result = run_scale(scale, args.contracts_per_player)
+        results.append(result)
+        print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Temporal Rollup Benchmark
+Compares the contract rollup cube behind graph_temporal_analysis (ContractCube) with regrouping
+player_contracts on every call (yearly_contract_stats) on synthetic graph_data:
+
+- Build time of the cube, and its size next to the contracts table
+- Per-query time of evolution over all years, and over a five-year range
+- Relative error of the sketched unique player counts against exact per-year counts
+- Time to merge a batch of new contracts into the cube (as ingest does), and whether the
+  result equals a rebuild
+
+Usage:
+    python benchmarks/bench_temporal_cube.py
+    python benchmarks/bench_temporal_cube.py --clubs 100,2000,10000 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soccer_mcp_server import ContractCube, contract_evolution, yearly_contract_stats  # noqa: E402
+from synthetic_data import generate_tables  # noqa: E402
+
+
+def timed(function, *args):
+    """(result, seconds) of one call"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def per_call(function, repeat: int, *args) -> float:
+    """Mean seconds per call over `repeat` calls"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def same_cube(left: ContractCube, right: ContractCube) -> bool:
+    """Whether two cubes hold the same cells, labels and sketch"""
+    return (left.labels == right.labels
+            and all(np.array_equal(left.cells[key], right.cells[key]) for key in left.cells)
+            and all(np.array_equal(left.sketch[key], right.sketch[key]) for key in left.sketch))
+
+
+def run_scale(n_clubs: int, args) -> dict:
+    """Benchmark one synthetic league size and return its measurements"""
+    graph_data = generate_tables(args.appearances, n_clubs=n_clubs, seed=args.seed)
+    contracts_df, persons_df = graph_data['player_contracts'], graph_data['persons']
+    cube, build_seconds = timed(ContractCube.from_contracts, contracts_df, persons_df)
+
+    years = yearly_contract_stats(contracts_df)
+    last_year = int(years['YEAR'].max())
+    recent = (12 * (last_year - 4), 12 * last_year + 11)
+    evolution = {entry['year']: entry for entry in contract_evolution(cube, None, '')}
+    errors = [abs(evolution[int(row.YEAR)]['unique_players'] - row.PERSON_ID) / row.PERSON_ID
+              for row in years.itertuples()]
+
+    split = int(len(contracts_df) * (1 - args.batch))
+    base = ContractCube.from_contracts(contracts_df.iloc[:split], persons_df)
+    # What ingest does: cube the new contracts only, then merge it into the existing cube
+    merged, merge_seconds = timed(lambda: base.merge(ContractCube.from_contracts(contracts_df.iloc[split:], persons_df)))
+    return {
+        "clubs": n_clubs,
+        "contracts": len(contracts_df),
+        "years": len(years),
+        "cube_cells": len(cube),
+        "cube_mb": round(cube.nbytes / 2**20, 3),
+        "contracts_mb": round(contracts_df.memory_usage(deep=True).sum() / 2**20, 3),
+        "build_seconds": round(build_seconds, 4),
+        "regroup_all_seconds": round(per_call(yearly_contract_stats, args.repeat, contracts_df), 5),
+        "cube_all_seconds": round(per_call(contract_evolution, args.repeat, cube, None, ''), 5),
+        "cube_range_seconds": round(per_call(contract_evolution, args.repeat, cube, recent, ''), 5),
+        "cube_nationality_seconds": round(per_call(contract_evolution, args.repeat, cube, None, 'nationality'), 5),
+        "exact_counts_match": all(evolution[int(row.YEAR)]['contracts'] == len(contracts_df[
+            pd.to_datetime(contracts_df['START_DATE'], errors='coerce').dt.year == row.YEAR])
+            for row in years.itertuples()) if args.verify else None,
+        "unique_players_mean_error": round(float(np.mean(errors)), 5),
+        "unique_players_max_error": round(float(np.max(errors)), 5),
+        "merge_batch_rows": len(contracts_df) - split,
+        "merge_seconds": round(merge_seconds, 4),
+        "merge_matches_rebuild": same_cube(merged, cube)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the temporal rollup cube")
+    parser.add_argument('--clubs', default='100,2000', help="Comma-separated club counts (30 players and ~2 contracts each)")
+    parser.add_argument('--appearances', type=int, default=10000, help="Synthetic appearance rows (unused by the cube)")
+    parser.add_argument('--repeat', type=int, default=10, help="Calls per query timing")
+    parser.add_argument('--batch', type=float, default=0.1, help="Share of contracts merged in as new rows")
+    parser.add_argument('--verify', action='store_true', help="Check per-year contract counts against the table")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for n_clubs in [int(s) for s in args.clubs.split(',') if s]:
+        results.append(run_scale(n_clubs, args))
+        print(json.dumps(results[-1]), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Pre-fork Worker Benchmark
+Writes synthetic graph_data, then starts the ASGI server with each HTTP_WORKERS setting
+and drives /shortest-path and /transfer-network batches from concurrent clients. Reports
+throughput, latency percentiles and the memory of the whole process tree: summed RSS
+(counting shared pages once per process) and summed PSS (shared pages split between the
+processes that map them), before and after the load, next to one single-process server
+per worker.
+
+Usage:
+    python benchmarks/bench_workers.py
+    python benchmarks/bench_workers.py --scale 1000000 --workers 1,2,4,8 --seconds 30
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import generate_tables, write_graph_data  # noqa: E402
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVER_SCRIPT = """
+import sys
+sys.path.insert(0, {server_dir!r})
+import soccer_mcp_server as server
+server.graph_store.data_dir = {data_dir!r}
+server.run_http_server('127.0.0.1', {port})
+"""
+
+
+def process_tree(pid: int) -> list:
+    """pid and all its descendants"""
+    pids = [pid]
+    for child in pids:
+        try:
+            with open(f'/proc/{child}/task/{child}/children') as f:
+                pids.extend(int(p) for p in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def tree_memory_mb(pid: int) -> dict:
+    """Summed RSS and PSS of a process tree, from /proc/<pid>/smaps_rollup"""
+    totals = {"processes": 0, "rss_mb": 0.0, "pss_mb": 0.0}
+    for member in process_tree(pid):
+        fields = {}
+        try:
+            with open(f'/proc/{member}/smaps_rollup') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    if key in ('Rss', 'Pss'):
+                        fields[key] = int(value.split()[0])
+        except OSError:
+            continue
+        totals["processes"] += 1
+        totals["rss_mb"] += fields['Rss'] / 1024
+        totals["pss_mb"] += fields['Pss'] / 1024
+    return {key: round(value, 1) for key, value in totals.items()}
+
+
+def post(url: str, body: dict):
+    """POST a JSON body, returning (status, response bytes)"""
+    request = urllib.request.Request(url, data=json.dumps(body).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        return response.status, response.read()
+
+
+def wait_until_ready(url: str, timeout: float = 600):
+    """Poll /health until the server reports a loaded bundle"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url + '/health', timeout=5) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"Server at {url} did not become ready")
+
+
+def drive_load(url: str, graph_data: dict, clients: int, seconds: float, batch_size: int, seed: int) -> dict:
+    """Send batches from `clients` threads for `seconds`, returning throughput and latency"""
+    player_ids = graph_data['persons']['PERSON_ID'].tolist()
+    club_ids = graph_data['clubs']['CLUB_ID'].tolist()
+    samples = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client(index):
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            if rng.random() < 0.8:
+                path = '/shortest-path'
+                rows = [[i, rng.choice(player_ids), rng.choice(player_ids), 'player'] for i in range(batch_size)]
+            else:
+                path = '/transfer-network'
+                rows = [[i, rng.choice(club_ids), None, None, None] for i in range(batch_size)]
+            start = time.perf_counter()
+            try:
+                status, _ = post(url + path, {"data": rows})
+                failed = status >= 400
+            except (urllib.error.URLError, ConnectionError):
+                failed = True
+            elapsed = time.perf_counter() - start
+            with lock:
+                samples.append(elapsed)
+                errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    ms = np.array(samples) * 1000
+    return {
+        "requests": len(samples),
+        "errors": errors[0],
+        "requests_per_second": round(len(samples) / wall, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2)
+    }
+
+
+def run_workers(workers: int, data_dir: str, graph_data: dict, args) -> dict:
+    """Start one server with `workers` processes, measure memory and throughput, then stop it"""
+    env = dict(os.environ, HTTP_WORKERS=str(workers), PRELOAD_ON_STARTUP='true')
+    script = SERVER_SCRIPT.format(server_dir=SERVER_DIR, data_dir=data_dir, port=args.port)
+    process = subprocess.Popen([sys.executable, '-c', script], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{args.port}'
+    try:
+        start = time.perf_counter()
+        wait_until_ready(url)
+        ready_seconds = time.perf_counter() - start
+        # Let every worker finish starting before measuring
+        time.sleep(2)
+        idle = tree_memory_mb(process.pid)
+        load = drive_load(url, graph_data, args.clients_per_worker * workers, args.seconds,
+                          args.batch_size, args.seed)
+        return {
+            "workers": workers,
+            "ready_seconds": round(ready_seconds, 1),
+            "memory_idle": idle,
+            "memory_after_load": tree_memory_mb(process.pid),
+            "load": load
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare throughput and memory across HTTP_WORKERS settings")
+    parser.add_argument('--scale', type=int, default=100000, help="Synthetic appearance rows")
+    parser.add_argument('--workers', default='1,2,4', help="Comma-separated HTTP_WORKERS settings")
+    parser.add_argument('--seconds', type=float, default=10.0, help="Load duration per setting")
+    parser.add_argument('--clients-per-worker', type=int, default=4, help="Concurrent clients per worker")
+    parser.add_argument('--batch-size', type=int, default=10, help="Rows per Service Function batch")
+    parser.add_argument('--port', type=int, default=5077)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix='graph_data_')
+    graph_data = generate_tables(args.scale)
+    write_graph_data(graph_data, data_dir)
+    results = []
+    try:
+        for workers in [int(w) for w in args.workers.split(',')]:
+            result = run_workers(workers, data_dir, graph_data, args)
+            if results and results[0]["workers"] == 1:
+                # Memory N independent single-process servers would need
+                result["separate_processes_rss_mb"] = round(results[0]["memory_after_load"]["rss_mb"] * workers, 1)
+            results.append(result)
+            print(json.dumps(result), flush=True)
+    finally:
+        shutil.rmtree(data_dir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Snapshot Equivalence Check
+Builds the graph bundle twice from the same data - from the JSON files (load_from_static_files
++ build_networks) and from a binary snapshot written from it (load_from_snapshot) - then runs
+the same MCP tool calls against each and exits with status 1 if any output differs
+
+Usage:
+    python benchmarks/check_snapshot.py
+    python benchmarks/check_snapshot.py --scales 10000 --pairs 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import soccer_mcp_server as server  # noqa: E402
+from synthetic_data import generate_tables, write_graph_data  # noqa: E402
+
+GRAPH_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'graph_data')
+
+
+def tool_calls(bundle: server.SoccerGraphLoader, n_pairs: int, seed: int) -> list:
+    """(name, tool, kwargs) for every call compared"""
+    rng = random.Random(seed)
+    calls = []
+    for graph_type, graph in [('player', bundle.player_graph), ('club', bundle.club_graph)]:
+        nodes = sorted(graph.nodes)
+        for _ in range(n_pairs):
+            source, target = rng.choice(nodes), rng.choice(nodes)
+            for mode in server.PATH_MODES:
+                calls.append((f"graph_shortest_path/{graph_type}/{mode}", server.graph_shortest_path,
+                              dict(source_id=source, target_id=target, graph_type=graph_type, mode=mode)))
+            calls.append((f"graph_shortest_path/{graph_type}/all", server.graph_shortest_path,
+                          dict(source_id=source, target_id=target, graph_type=graph_type, weight_by='all')))
+        for analysis in server.CENTRALITY_ALGORITHMS:
+            calls.append((f"graph_centrality_analysis/{graph_type}/{analysis}", server.graph_centrality_analysis,
+                          dict(graph_type=graph_type, analysis_type=analysis, top_n=len(nodes))))
+        calls.append((f"graph_centrality_analysis/{graph_type}/pagerank/all", server.graph_centrality_analysis,
+                      dict(graph_type=graph_type, analysis_type='pagerank', top_n=len(nodes), weight_by='all')))
+        calls.append((f"graph_community_detection/{graph_type}", server.graph_community_detection,
+                      dict(graph_type=graph_type)))
+        calls.append((f"graph_community_detection/{graph_type}/all", server.graph_community_detection,
+                      dict(graph_type=graph_type, weight_by='all')))
+    for club_id in sorted(bundle.club_graph.nodes):
+        calls.append(("graph_transfer_network_analysis/club", server.graph_transfer_network_analysis,
+                      dict(club_id=club_id)))
+    for analysis in ['evolution', 'trends']:
+        calls.append((f"graph_temporal_analysis/{analysis}", server.graph_temporal_analysis,
+                      dict(time_range='all', analysis_type=analysis)))
+    return calls
+
+
+def tool_outputs(bundle: server.SoccerGraphLoader, calls: list) -> list:
+    """Output of every call with the bundle published and caches empty"""
+    server.graph_store.publish(bundle)
+    server.analytics_cache.clear()
+    server.path_cache.clear()
+    loop = asyncio.new_event_loop()
+    try:
+        return [loop.run_until_complete(tool(**kwargs)) for _, tool, kwargs in calls]
+    finally:
+        loop.close()
+
+
+def check_data_dir(data_dir: str, args) -> dict:
+    """Compare JSON-built and snapshot-built bundles over one data directory"""
+    from_json = server.SoccerGraphLoader()
+    if not (from_json.load_from_static_files(data_dir) and from_json.build_networks()):
+        raise RuntimeError(f"Could not load {data_dir}")
+    if not from_json.save_snapshot():
+        raise RuntimeError(f"Could not write a snapshot to {data_dir}")
+    from_snapshot = server.SoccerGraphLoader()
+    if not from_snapshot.load_from_snapshot(data_dir):
+        raise RuntimeError(f"Could not load the snapshot in {data_dir}")
+
+    calls = tool_calls(from_json, args.pairs, args.seed)
+    expected = tool_outputs(from_json, calls)
+    actual = tool_outputs(from_snapshot, calls)
+    mismatches = [name for (name, _, _), left, right in zip(calls, expected, actual) if left != right]
+    return {
+        "player_nodes": from_json.player_graph.number_of_nodes(),
+        "club_nodes": from_json.club_graph.number_of_nodes(),
+        "calls": len(calls),
+        "mismatches": len(mismatches),
+        "mismatched_tools": sorted(set(mismatches))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that snapshot loads give the same tool outputs as JSON loads")
+    parser.add_argument('--scales', default='',
+                        help="Comma-separated synthetic appearance counts to check besides graph_data")
+    parser.add_argument('--pairs', type=int, default=100, help="Shortest path pairs per graph")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.getLogger('soccer_mcp_server').setLevel(logging.WARNING)
+    failed = False
+    sources = [('graph_data', None)] + [(f"synthetic/{s}", int(s)) for s in args.scales.split(',') if s]
+    for label, scale in sources:
+        # Snapshots are written next to the data, so work on a temporary copy
+        data_dir = tempfile.mkdtemp(prefix='graph_data_')
+        try:
+            if scale is None:
+                shutil.copytree(GRAPH_DATA_DIR, data_dir, dirs_exist_ok=True,
+                                ignore=shutil.ignore_patterns(server.SNAPSHOT_DIRNAME))
+            else:
+                write_graph_data(generate_tables(scale, seed=args.seed), data_dir)
+            result = {"data": label, **check_data_dir(data_dir, args)}
+        finally:
+            shutil.rmtree(data_dir)
+        print(json.dumps(result), flush=True)
+        failed = failed or result["mismatches"] > 0
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
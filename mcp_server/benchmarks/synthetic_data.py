@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Synthetic Soccer Data Generator
+Generates soccer knowledge graph tables at configurable scales for benchmarking, and
+writes them as JSON files shaped like mcp_server/graph_data
+
+Usage:
+    python benchmarks/synthetic_data.py --appearances 100000 --output /tmp/graph_data
+    python benchmarks/synthetic_data.py --appearances 1000000 --output /tmp/graph_data --format ndjson
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soccer_mcp_server import GRAPH_DATA_FILES  # noqa: E402
+
+NATIONALITIES = ['England', 'Spain', 'France', 'Germany', 'Italy', 'Brazil', 'Argentina', 'Portugal', 'Netherlands', 'Norway']
+POSITIONS = ['Goalkeeper', 'Defender', 'Midfielder', 'Forward']
+COUNTRIES = ['England', 'Spain', 'Germany', 'Italy', 'France']
+LEAGUES = ['Premier League', 'La Liga', 'Bundesliga', 'Serie A', 'Ligue 1']
+
+
+def generate_tables(n_appearances: int, n_clubs: int = 100, players_per_club: int = 30,
+                    contracts_per_player: float = 2.0, players_per_side: int = 11, seed: int = 42) -> dict:
+    """Generate tables shaped like SoccerGraphLoader.graph_data after loading.
+
+    Args:
+        n_appearances: Target number of match appearance rows
+        n_clubs: Number of clubs (the club graph size)
+        players_per_club: Average squad size, which sets the number of players
+        contracts_per_player: Average number of contracts per player (drives transfers)
+        players_per_side: Appearances recorded per club per match
+        seed: Random seed for reproducible data
+    """
+    rng = np.random.default_rng(seed)
+    n_players = n_clubs * players_per_club
+    n_matches = max(1, n_appearances // (2 * players_per_side))
+
+    # Persons: players first, then one coach per club
+    n_persons = n_players + n_clubs
+    person_ids = np.arange(1, n_persons + 1)
+    is_player = person_ids <= n_players
+    persons = pd.DataFrame({
+        'PERSON_ID': person_ids,
+        'NAME': [f"{'Player' if p else 'Coach'} {i}" for i, p in zip(person_ids, is_player)],
+        'NATIONALITY': rng.choice(NATIONALITIES, n_persons),
+        'DATE_OF_BIRTH': pd.to_datetime('1985-01-01') + pd.to_timedelta(rng.integers(0, 6000, n_persons), unit='D'),
+        'ROLE': np.where(is_player, 'PLAYER', 'COACH'),
+        'POSITION': np.where(is_player, rng.choice(POSITIONS, n_persons), None),
+        'CREATED_AT': pd.Timestamp('2025-10-07')
+    })
+
+    # Clubs
+    club_ids = np.arange(1, n_clubs + 1)
+    clubs = pd.DataFrame({
+        'CLUB_ID': club_ids,
+        'CLUB_NAME': [f"Club {i}" for i in club_ids],
+        'COUNTRY': rng.choice(COUNTRIES, n_clubs),
+        'LEAGUE': rng.choice(LEAGUES, n_clubs),
+        'FOUNDED_YEAR': rng.integers(1860, 1990, n_clubs),
+        'STADIUM': [f"Stadium {i}" for i in club_ids],
+        'CREATED_AT': pd.Timestamp('2025-10-07')
+    })
+
+    # Player contracts: every player starts at a home club, extra contracts are transfers
+    player_ids = person_ids[is_player]
+    n_extra = max(0, int(n_players * (contracts_per_player - 1)))
+    contract_players = np.concatenate([player_ids, rng.choice(player_ids, n_extra)])
+    contract_clubs = np.concatenate([(player_ids - 1) % n_clubs + 1, rng.choice(club_ids, n_extra)])
+    n_contracts = len(contract_players)
+    start_dates = pd.to_datetime('2015-07-01') + pd.to_timedelta(rng.integers(0, 3650, n_contracts), unit='D')
+    player_contracts = pd.DataFrame({
+        'CONTRACT_ID': np.arange(1, n_contracts + 1),
+        'PERSON_ID': contract_players,
+        'CLUB_ID': contract_clubs,
+        'START_DATE': start_dates,
+        'END_DATE': start_dates + pd.to_timedelta(rng.integers(365, 5 * 365, n_contracts), unit='D'),
+        'CONTRACT_VALUE': rng.integers(1, 100, n_contracts) * 1_000_000,
+        'JERSEY_NUMBER': rng.integers(1, 99, n_contracts),
+        'CREATED_AT': pd.Timestamp('2025-10-07')
+    })
+
+    # Coach contracts: one per coach
+    coach_ids = person_ids[~is_player]
+    coach_contracts = pd.DataFrame({
+        'CONTRACT_ID': np.arange(1, n_clubs + 1),
+        'PERSON_ID': coach_ids,
+        'CLUB_ID': club_ids,
+        'START_DATE': pd.Timestamp('2023-07-01'),
+        'END_DATE': pd.Timestamp('2027-06-30'),
+        'CONTRACT_VALUE': rng.integers(1, 20, n_clubs) * 1_000_000,
+        'CREATED_AT': pd.Timestamp('2025-10-07')
+    })
+
+    # Matches between distinct clubs
+    home = rng.integers(1, n_clubs + 1, n_matches)
+    away = (home + rng.integers(1, n_clubs, n_matches) - 1) % n_clubs + 1
+    match_ids = np.arange(1, n_matches + 1)
+    matches = pd.DataFrame({
+        'MATCH_ID': match_ids,
+        'MATCH_NAME': [f"Club {h} vs Club {a}" for h, a in zip(home, away)],
+        'EVENT_DATE': pd.to_datetime('2015-08-01') + pd.to_timedelta(rng.integers(0, 3650, n_matches), unit='D'),
+        'VENUE': [f"Stadium {h}" for h in home],
+        'HOME_TEAM_ID': home,
+        'AWAY_TEAM_ID': away,
+        'SCORE_HOME': rng.integers(0, 5, n_matches),
+        'SCORE_AWAY': rng.integers(0, 5, n_matches),
+        'COMPETITION': rng.choice(LEAGUES, n_matches),
+        'CREATED_AT': pd.Timestamp('2025-10-07')
+    })
+
+    # Match appearances: each side fields players drawn from its squad
+    squads = player_contracts.sort_values('CLUB_ID', kind='stable')
+    squad_players = squads['PERSON_ID'].to_numpy()
+    squad_sizes = np.bincount(squads['CLUB_ID'].to_numpy(), minlength=n_clubs + 1)
+    squad_starts = np.concatenate(([0], np.cumsum(squad_sizes)[:-1]))
+    sides = np.column_stack([home, away]).ravel()
+    side_matches = np.repeat(match_ids, 2)
+    picks = squad_starts[sides, None] + (rng.random((len(sides), players_per_side)) * squad_sizes[sides, None]).astype(np.int64)
+    n_rows = picks.size
+    match_appearances = pd.DataFrame({
+        'APPEARANCE_ID': np.arange(1, n_rows + 1),
+        'PERSON_ID': squad_players[picks.ravel()],
+        'MATCH_ID': np.repeat(side_matches, players_per_side),
+        'MINUTES_PLAYED': rng.integers(1, 91, n_rows),
+        'GOALS_SCORED': rng.poisson(0.1, n_rows),
+        'ASSISTS': rng.poisson(0.1, n_rows),
+        'YELLOW_CARDS': rng.binomial(1, 0.1, n_rows),
+        'RED_CARDS': rng.binomial(1, 0.01, n_rows),
+        'CREATED_AT': pd.Timestamp('2025-10-07')
+    })
+
+    return {
+        'persons': persons,
+        'clubs': clubs,
+        'matches': matches,
+        'player_contracts': player_contracts,
+        'coach_contracts': coach_contracts,
+        'match_appearances': match_appearances
+    }
+
+
+def write_graph_data(graph_data: dict, data_dir: str, fmt: str = 'json') -> dict:
+    """Write tables as graph_data files (dates as YYYY-MM-DD strings) plus metadata.json.
+
+    Args:
+        graph_data: Tables from generate_tables
+        data_dir: Directory to write into (created if missing)
+        fmt: 'json' for JSON arrays like the checked-in files, 'ndjson' for one record per line
+
+    Returns:
+        Table name -> path of the written file
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    paths = {}
+    for table_name, df in graph_data.items():
+        df = df.copy()
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = df[col].dt.strftime('%Y-%m-%d')
+        stem = os.path.splitext(GRAPH_DATA_FILES[table_name])[0]
+        # A stale file in the other format would take precedence over (or shadow) this one
+        for extension in ['.json', '.ndjson', '.jsonl']:
+            stale = os.path.join(data_dir, stem + extension)
+            if os.path.exists(stale):
+                os.remove(stale)
+        path = os.path.join(data_dir, stem + ('.ndjson' if fmt == 'ndjson' else '.json'))
+        df.to_json(path, orient='records', lines=(fmt == 'ndjson'), force_ascii=False)
+        paths[table_name] = path
+
+    persons = graph_data['persons']
+    metadata = {
+        "last_updated": datetime.datetime.now().isoformat(),
+        "source": "synthetic_data.py",
+        "total_players": int((persons['ROLE'] == 'PLAYER').sum()),
+        "total_coaches": int((persons['ROLE'] == 'COACH').sum()),
+        "total_clubs": len(graph_data['clubs']),
+        "total_matches": len(graph_data['matches']),
+        "total_player_contracts": len(graph_data['player_contracts']),
+        "total_coach_contracts": len(graph_data['coach_contracts']),
+        "total_match_appearances": len(graph_data['match_appearances'])
+    }
+    with open(os.path.join(data_dir, 'metadata.json'), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic graph_data files")
+    parser.add_argument('--appearances', type=int, default=100000, help="Target number of match appearance rows")
+    parser.add_argument('--clubs', type=int, default=100, help="Number of clubs")
+    parser.add_argument('--players-per-club', type=int, default=30, help="Average squad size")
+    parser.add_argument('--contracts-per-player', type=float, default=2.0, help="Average contracts per player")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json', help="Output file format")
+    parser.add_argument('--output', required=True, help="Directory to write the files into")
+    args = parser.parse_args()
+
+    graph_data = generate_tables(args.appearances, n_clubs=args.clubs, players_per_club=args.players_per_club,
+                                 contracts_per_player=args.contracts_per_player, seed=args.seed)
+    for table_name, path in write_graph_data(graph_data, args.output, args.format).items():
+        print(f"{table_name}: {len(graph_data[table_name])} rows -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,691 @@
+#!/usr/bin/env python3
+"""
+Ontology Inference and Constraint Engine
+Evaluates the enabled ONT_RULE inference rules (INVERSE, TRANSITIVE) over typed KG_EDGE edges
+in memory and bulk-writes REL_EDGE_INFERRED, and checks every ONT_RELATION_DEF cardinality and
+referential constraint in one pass, bulk-writing ONT_CONSTRAINT_VIOLATION. The SP_INFER_* and
+SP_CHECK_* procedures in sql/06_inference_procedures.sql import this module from a stage; the
+MCP server runs it over graph_data. LocalSession stands in for a Snowpark session so everything
+runs locally (e.g. in CI):
+
+    python ontology_inference.py graph_data
+    python ontology_inference.py graph_data --as-of 2025-01-01 --fail-on-violations
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+INFERRED_COLUMNS = ['REL_NAME', 'SRC_ID', 'DST_ID', 'INFERENCE_KIND', 'RULE_ID', 'WEIGHT',
+                    'EFFECTIVE_START', 'EFFECTIVE_END']
+
+VIOLATION_COLUMNS = ['VIOLATION_ID', 'CHECK_NAME', 'SCOPE', 'REL_OR_CLASS', 'SRC_ID', 'DST_ID', 'DETAILS',
+                     'OBSERVED_AT']
+
+# CARDINALITY -> the edge endpoints that may have at most one current edge of the relation
+CARDINALITY_SIDES = {'N:1': ['SRC'], '1:N': ['DST'], '1:1': ['SRC', 'DST'], 'N:N': []}
+
+# Evaluation order of rule kinds (as in SP_RUN_ONTOLOGY_INFERENCE); PROPERTY_CHAIN is not implemented
+RULE_ORDER = {'INVERSE': 1, 'TRANSITIVE': 2}
+
+# Relation definitions and rules from sql/08_seed_metadata.sql, for runs without Snowflake
+SEED_RELATIONS = [
+    {"REL_NAME": rel_name, "CARDINALITY": cardinality, "INVERSE_REL_NAME": inverse_name}
+    for rel_name, cardinality, inverse_name in [
+        ('works_for', 'N:1', 'employs'), ('participates_in', 'N:N', 'has_participant'),
+        ('affiliated_with', 'N:N', 'involves'), ('PLAYS_FOR', 'N:1', 'HAS_PLAYER'), ('COACHES', 'N:1', 'HAS_COACH'),
+        ('PLAYED_IN', 'N:N', 'HAS_PLAYER'), ('HOME_TEAM', '1:N', 'HOSTED_BY'), ('AWAY_TEAM', '1:N', 'VISITED_BY')
+    ]
+]
+
+SEED_RULES = [
+    {"RULE_ID": 'RULE_INV_001', "RULE_KIND": 'INVERSE', "TARGET_REL": 'HAS_PLAYER', "SOURCE_REL_1": None,
+     "SOURCE_REL_2": None, "INVERSE_OF": 'PLAYS_FOR'},
+    {"RULE_ID": 'RULE_INV_002', "RULE_KIND": 'INVERSE', "TARGET_REL": 'HAS_COACH', "SOURCE_REL_1": None,
+     "SOURCE_REL_2": None, "INVERSE_OF": 'COACHES'},
+    {"RULE_ID": 'RULE_INV_003', "RULE_KIND": 'INVERSE', "TARGET_REL": 'employs', "SOURCE_REL_1": None,
+     "SOURCE_REL_2": None, "INVERSE_OF": 'works_for'}
+]
+
+# Missing EFFECTIVE_START / EFFECTIVE_END in the int64 nanosecond date arrays (NaT's bit pattern)
+NO_DATE = np.iinfo(np.int64).min
+
+
+def as_dates(values) -> pd.Series:
+    """Dates as datetime64[ns] (graph_data mixes resolutions), NaT where missing"""
+    return pd.to_datetime(values, errors='coerce').astype('datetime64[ns]')
+
+
+def kg_tables_from_graph_data(graph_data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """KG_NODE and KG_EDGE as sql/09_load_data.sql loads them from the graph_data tables"""
+    persons = graph_data['persons']
+    clubs = graph_data['clubs']
+    matches = graph_data['matches']
+    nodes = pd.concat([
+        pd.DataFrame({"NODE_ID": clubs['CLUB_ID'].astype(str), "NODE_TYPE": 'CLUB',
+                      "NAME": clubs['CLUB_NAME'].astype(object)}),
+        pd.DataFrame({"NODE_ID": persons['PERSON_ID'].astype(str),
+                      "NODE_TYPE": persons['ROLE'].astype(str).str.upper(), "NAME": persons['NAME'].astype(object)}),
+        pd.DataFrame({"NODE_ID": matches['MATCH_ID'].astype(str), "NODE_TYPE": 'MATCH',
+                      "NAME": matches['MATCH_NAME'].astype(object)})
+    ], ignore_index=True)
+
+    def contract_edges(contracts, edge_type):
+        return pd.DataFrame({
+            "EDGE_ID": contracts['CONTRACT_ID'].astype(str), "SRC_ID": contracts['PERSON_ID'].astype(str),
+            "DST_ID": contracts['CLUB_ID'].astype(str), "EDGE_TYPE": edge_type,
+            "EFFECTIVE_START": as_dates(contracts['START_DATE']), "EFFECTIVE_END": as_dates(contracts['END_DATE'])
+        })
+
+    def team_edges(prefix, team_column, edge_type):
+        playing = matches[matches[team_column].notna()]
+        return pd.DataFrame({
+            "EDGE_ID": prefix + playing['MATCH_ID'].astype(str),
+            "SRC_ID": playing[team_column].astype('int64').astype(str),
+            "DST_ID": playing['MATCH_ID'].astype(str), "EDGE_TYPE": edge_type,
+            "EFFECTIVE_START": as_dates(playing['EVENT_DATE']), "EFFECTIVE_END": pd.NaT
+        })
+
+    appearances = graph_data['match_appearances']
+    edges = pd.concat([
+        contract_edges(graph_data['player_contracts'], 'PLAYS_FOR'),
+        contract_edges(graph_data['coach_contracts'], 'COACHES'),
+        pd.DataFrame({
+            "EDGE_ID": appearances['APPEARANCE_ID'].astype(str), "SRC_ID": appearances['PERSON_ID'].astype(str),
+            "DST_ID": appearances['MATCH_ID'].astype(str), "EDGE_TYPE": 'PLAYED_IN',
+            "EFFECTIVE_START": pd.NaT, "EFFECTIVE_END": pd.NaT
+        }),
+        team_edges('HT_', 'HOME_TEAM_ID', 'HOME_TEAM'),
+        team_edges('AT_', 'AWAY_TEAM_ID', 'AWAY_TEAM')
+    ], ignore_index=True)
+    edges['WEIGHT'] = 1.0
+    return {"KG_NODE": nodes, "KG_EDGE": edges}
+
+
+def date_ns(values: pd.Series) -> np.ndarray:
+    """Dates as int64 nanoseconds, NO_DATE where missing"""
+    return as_dates(values).to_numpy().view(np.int64)
+
+
+class RelationFacts:
+    """Known edges of one relation as sorted integer keys (src * n_nodes + dst), with the
+    weight and validity dates of each edge"""
+
+    def __init__(self, keys: np.ndarray, weight: np.ndarray, start: np.ndarray, end: np.ndarray):
+        self.keys = keys
+        self.weight = weight
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0, np.int64), np.empty(0), np.empty(0, np.int64), np.empty(0, np.int64))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, keys: np.ndarray, weight: np.ndarray, start: np.ndarray, end: np.ndarray):
+        """Merge new (not yet known) edges, keeping keys sorted"""
+        order = np.argsort(np.concatenate([self.keys, keys]), kind='stable')
+        self.keys = np.concatenate([self.keys, keys])[order]
+        self.weight = np.concatenate([self.weight, weight])[order]
+        self.start = np.concatenate([self.start, start])[order]
+        self.end = np.concatenate([self.end, end])[order]
+
+
+def base_facts(edges: pd.DataFrame, codes: np.ndarray, n_nodes: int) -> Dict[str, RelationFacts]:
+    """RelationFacts per EDGE_TYPE. Parallel edges (e.g. two contracts at one club) collapse into
+    one: highest weight, earliest start, and latest end (none if any is open-ended)"""
+    src_codes, dst_codes = codes[:len(edges)], codes[len(edges):]
+    frame = pd.DataFrame({
+        "EDGE_TYPE": edges['EDGE_TYPE'].to_numpy(),
+        "KEY": src_codes.astype(np.int64) * n_nodes + dst_codes,
+        "WEIGHT": pd.to_numeric(edges['WEIGHT'], errors='coerce').fillna(1.0).to_numpy(),
+        "START": date_ns(edges['EFFECTIVE_START']),
+        "END": date_ns(edges['EFFECTIVE_END'])
+    })
+    # Missing dates sort last, so min() skips a missing START and max() keeps an open-ended END
+    frame['END'] = np.where(frame['END'] == NO_DATE, np.iinfo(np.int64).max, frame['END'])
+    frame['START'] = np.where(frame['START'] == NO_DATE, np.iinfo(np.int64).max, frame['START'])
+    grouped = frame.groupby(['EDGE_TYPE', 'KEY'], sort=True).agg(WEIGHT=('WEIGHT', 'max'), START=('START', 'min'),
+                                                                 END=('END', 'max'))
+    facts = {}
+    for edge_type, group in grouped.groupby(level=0):
+        start = group['START'].to_numpy()
+        end = group['END'].to_numpy()
+        facts[edge_type] = RelationFacts(
+            group.index.get_level_values(1).to_numpy(np.int64), group['WEIGHT'].to_numpy(),
+            np.where(start == np.iinfo(np.int64).max, NO_DATE, start),
+            np.where(end == np.iinfo(np.int64).max, NO_DATE, end)
+        )
+    return facts
+
+
+class KeySet:
+    """Set of int64 keys kept as a few sorted runs, each at least twice the size of the next.
+    Adding a round's keys merges only runs of similar size, so a closure with many rounds
+    does not re-sort everything it has derived so far after each round."""
+
+    def __init__(self, keys: np.ndarray):
+        self.runs = [keys]
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """Membership mask for keys"""
+        found = np.zeros(len(keys), dtype=bool)
+        for run in self.runs:
+            if len(run):
+                positions = np.minimum(np.searchsorted(run, keys), len(run) - 1)
+                found |= run[positions] == keys
+        return found
+
+    def add(self, keys: np.ndarray):
+        """Add sorted keys not already in the set"""
+        self.runs.append(keys)
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            self.runs[-1] = np.sort(np.concatenate([self.runs[-1], last]), kind='mergesort')
+
+
+def transitive_closure(keys: np.ndarray, n_nodes: int) -> tuple:
+    """Pairs reachable in two or more hops, with the hop count of the shortest path.
+
+    Semi-naive evaluation: each round joins only the pairs first derived in the previous round
+    with the base edges (via a CSR index), so no path is enumerated twice, there is no depth
+    cap, and the rounds end when a round derives nothing new. Self-loops are not derived.
+
+    Args:
+        keys: Sorted unique base edges (src * n_nodes + dst)
+        n_nodes: Node count of the integer index
+
+    Returns:
+        (sorted derived keys, hop count per key)
+    """
+    base_src, base_dst = keys // n_nodes, keys % n_nodes
+    indptr = np.searchsorted(base_src, np.arange(n_nodes + 1))
+    known = KeySet(keys)
+    delta_src, delta_dst = base_src, base_dst
+    derived, depths = [], []
+    depth = 1
+    while len(delta_src):
+        depth += 1
+        starts = indptr[delta_dst]
+        counts = indptr[delta_dst + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        next_dst = base_dst[np.repeat(starts, counts) + offsets]
+        candidates = np.unique(np.repeat(delta_src, counts) * n_nodes + next_dst)
+        candidates = candidates[candidates // n_nodes != candidates % n_nodes]
+        new = candidates[~known.contains(candidates)]
+        if not len(new):
+            break
+        derived.append(new)
+        depths.append(np.full(len(new), depth))
+        known.add(new)
+        delta_src, delta_dst = new // n_nodes, new % n_nodes
+    if not derived:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    derived_keys = np.concatenate(derived)
+    order = np.argsort(derived_keys)
+    return derived_keys[order], np.concatenate(depths)[order]
+
+
+def rule_inputs(rule: dict, relations: List[dict]) -> List[str]:
+    """Relations a rule reads: INVERSE_OF (or every relation whose inverse is TARGET_REL, or with
+    neither set every relation with an inverse) for INVERSE; SOURCE_REL_1 or TARGET_REL for TRANSITIVE"""
+    if rule['RULE_KIND'] == 'TRANSITIVE':
+        return [rule.get('SOURCE_REL_1') or rule['TARGET_REL']]
+    if rule.get('INVERSE_OF'):
+        return [rule['INVERSE_OF']]
+    return [relation['REL_NAME'] for relation in relations
+            if relation.get('INVERSE_REL_NAME') and relation['INVERSE_REL_NAME'] == (rule.get('TARGET_REL') or
+                                                                                    relation['INVERSE_REL_NAME'])]
+
+
+def inverse_pairs(rule: dict, relations: List[dict]) -> List[tuple]:
+    """(source relation, inferred relation) pairs of an INVERSE rule"""
+    if rule.get('INVERSE_OF'):
+        return [(rule['INVERSE_OF'], rule['TARGET_REL'])]
+    inverse_of = {relation['REL_NAME']: relation['INVERSE_REL_NAME'] for relation in relations}
+    return [(rel_name, rule.get('TARGET_REL') or inverse_of[rel_name]) for rel_name in rule_inputs(rule, relations)]
+
+
+def infer(edges: pd.DataFrame, rules: List[dict], relations: List[dict]) -> pd.DataFrame:
+    """Evaluate inference rules to a fixpoint and return the REL_EDGE_INFERRED rows.
+
+    Node IDs are mapped to integers once. Rules run in RULE_ORDER and see each other's output
+    (e.g. a transitive rule over an inverse relation); a rule re-runs only when one of its
+    input relations gained edges. An edge already in KG_EDGE, or inferred by an earlier rule,
+    is not inferred again.
+
+    Args:
+        edges: KG_EDGE rows (SRC_ID, DST_ID, EDGE_TYPE, WEIGHT, EFFECTIVE_START, EFFECTIVE_END)
+        rules: ONT_RULE rows (RULE_ID, RULE_KIND, TARGET_REL, SOURCE_REL_1, INVERSE_OF)
+        relations: Active ONT_RELATION_DEF rows (REL_NAME, INVERSE_REL_NAME)
+    """
+    rules = sorted((rule for rule in rules if rule['RULE_KIND'] in RULE_ORDER),
+                   key=lambda rule: RULE_ORDER[rule['RULE_KIND']])
+    codes, node_ids = pd.factorize(pd.concat([edges['SRC_ID'], edges['DST_ID']], ignore_index=True).astype(str))
+    n_nodes = max(len(node_ids), 1)
+    facts = base_facts(edges, codes, n_nodes)
+    # Relation -> number of times it gained edges; rule -> input versions it last ran on
+    versions = {}
+    seen = {}
+    outputs = []
+
+    def input_version(rule):
+        return tuple(versions.get(rel_name, 0) for rel_name in rule_inputs(rule, relations))
+
+    changed = True
+    while changed:
+        changed = False
+        for rule in rules:
+            if seen.get(rule['RULE_ID']) == input_version(rule):
+                continue
+            if rule['RULE_KIND'] == 'INVERSE':
+                derivations = []
+                for source_rel, target_rel in inverse_pairs(rule, relations):
+                    source = facts.get(source_rel, RelationFacts.empty())
+                    swapped = (source.keys % n_nodes) * n_nodes + source.keys // n_nodes
+                    order = np.argsort(swapped)
+                    derivations.append((target_rel, swapped[order], source.weight[order], source.start[order],
+                                        source.end[order]))
+            else:
+                source = facts.get(rule_inputs(rule, relations)[0], RelationFacts.empty())
+                keys, depth = transitive_closure(source.keys, n_nodes)
+                no_dates = np.full(len(keys), NO_DATE)
+                derivations = [(rule['TARGET_REL'], keys, 1.0 / depth, no_dates, no_dates)]
+
+            # Each derivation's keys are sorted and unique
+            for target_rel, keys, weight, start, end in derivations:
+                target = facts.setdefault(target_rel, RelationFacts.empty())
+                fresh = ~np.isin(keys, target.keys, assume_unique=True)
+                if not fresh.any():
+                    continue
+                keys, weight, start, end = keys[fresh], weight[fresh], start[fresh], end[fresh]
+                target.add(keys, weight, start, end)
+                versions[target_rel] = versions.get(target_rel, 0) + 1
+                changed = True
+                outputs.append(pd.DataFrame({
+                    "REL_NAME": target_rel,
+                    "SRC_ID": node_ids[keys // n_nodes],
+                    "DST_ID": node_ids[keys % n_nodes],
+                    "INFERENCE_KIND": rule['RULE_KIND'],
+                    "RULE_ID": rule['RULE_ID'],
+                    "WEIGHT": weight,
+                    "EFFECTIVE_START": start.view('datetime64[ns]'),
+                    "EFFECTIVE_END": end.view('datetime64[ns]')
+                }))
+            seen[rule['RULE_ID']] = input_version(rule)
+
+    if not outputs:
+        return pd.DataFrame(columns=INFERRED_COLUMNS)
+    return pd.concat(outputs, ignore_index=True)[INFERRED_COLUMNS]
+
+
+def sql_list(values) -> str:
+    """Quoted SQL string literals for an IN list"""
+    return ', '.join("'" + str(value).replace("'", "''") + "'" for value in values)
+
+
+def records(frame: pd.DataFrame) -> List[dict]:
+    """DataFrame rows as dicts with None for missing values"""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def read_rules(session, rule_ids: Optional[List[str]] = None) -> List[dict]:
+    """Enabled ONT_RULE rows, optionally only the given rule IDs"""
+    query = ("SELECT RULE_ID, RULE_KIND, TARGET_REL, SOURCE_REL_1, SOURCE_REL_2, INVERSE_OF "
+             "FROM ONT_RULE WHERE IS_ENABLED = TRUE")
+    if rule_ids:
+        query += f" AND RULE_ID IN ({sql_list(rule_ids)})"
+    return records(session.sql(query).to_pandas())
+
+
+def read_relations(session) -> List[dict]:
+    """Active ONT_RELATION_DEF rows that declare an inverse"""
+    return records(session.sql(
+        "SELECT REL_NAME, INVERSE_REL_NAME FROM ONT_RELATION_DEF "
+        "WHERE INVERSE_REL_NAME IS NOT NULL AND STATUS = 'ACTIVE'"
+    ).to_pandas())
+
+
+def read_edges(session, rules: List[dict], relations: List[dict]) -> pd.DataFrame:
+    """The KG_EDGE rows of every relation the rules read or infer, in one query"""
+    edge_types = set()
+    for rule in rules:
+        edge_types.update(rule_inputs(rule, relations))
+        if rule['RULE_KIND'] == 'INVERSE':
+            edge_types.update(target_rel for _, target_rel in inverse_pairs(rule, relations))
+        else:
+            edge_types.add(rule['TARGET_REL'])
+    if not edge_types:
+        return pd.DataFrame(columns=['SRC_ID', 'DST_ID', 'EDGE_TYPE', 'WEIGHT', 'EFFECTIVE_START', 'EFFECTIVE_END'])
+    return session.sql(
+        "SELECT SRC_ID, DST_ID, EDGE_TYPE, WEIGHT, EFFECTIVE_START, EFFECTIVE_END FROM KG_EDGE "
+        f"WHERE EDGE_TYPE IN ({sql_list(sorted(edge_types))})"
+    ).to_pandas()
+
+
+def write_inferred(session, inferred: pd.DataFrame, rule_ids: List[str]):
+    """Replace the REL_EDGE_INFERRED rows of the given rules with one DELETE and one bulk write"""
+    if rule_ids:
+        session.sql(f"DELETE FROM REL_EDGE_INFERRED WHERE RULE_ID IN ({sql_list(rule_ids)})").collect()
+    if len(inferred):
+        inferred = inferred.assign(COMPUTED_AT=pd.Timestamp.now().floor('us'))
+        session.write_pandas(inferred, 'REL_EDGE_INFERRED', auto_create_table=False, overwrite=False,
+                             use_logical_type=True)
+
+
+def run_inference(session, rules: Optional[List[dict]] = None) -> Dict[str, int]:
+    """Read rules, relation definitions and edges once, infer, and bulk-write REL_EDGE_INFERRED.
+
+    Args:
+        session: Snowpark session (or LocalSession)
+        rules: Rules to evaluate; defaults to every enabled ONT_RULE row
+
+    Returns:
+        Inferred edge count per rule ID
+    """
+    rules = read_rules(session) if rules is None else rules
+    relations = read_relations(session)
+    inferred = infer(read_edges(session, rules, relations), rules, relations)
+    write_inferred(session, inferred, [rule['RULE_ID'] for rule in rules])
+    counts = inferred['RULE_ID'].value_counts()
+    return {rule['RULE_ID']: int(counts.get(rule['RULE_ID'], 0)) for rule in rules}
+
+
+def sp_run_ontology_inference(session) -> str:
+    """Handler of SP_RUN_ONTOLOGY_INFERENCE: every enabled rule in one pass"""
+    rules = read_rules(session)
+    counts = run_inference(session, rules)
+    lines = []
+    for rule in rules:
+        if rule['RULE_KIND'] in RULE_ORDER:
+            lines.append(f"{rule['RULE_ID']}: Inferred {counts[rule['RULE_ID']]} {rule['RULE_KIND'].lower()} "
+                         f"edges for {rule['TARGET_REL']}")
+        else:
+            lines.append(f"{rule['RULE_ID']}: skipped, {rule['RULE_KIND']} rules are not supported")
+    return "\n".join(lines)
+
+
+def sp_infer_transitive(session, target_rel: str, rule_id: str) -> str:
+    """Handler of SP_INFER_TRANSITIVE: transitive closure of one relation"""
+    rule = {"RULE_ID": rule_id, "RULE_KIND": 'TRANSITIVE', "TARGET_REL": target_rel, "SOURCE_REL_1": None,
+            "SOURCE_REL_2": None, "INVERSE_OF": None}
+    count = run_inference(session, [rule])[rule_id]
+    return f"Inferred {count} transitive edges for {target_rel}"
+
+
+def sp_infer_inverse(session, rule_id: str) -> str:
+    """Handler of SP_INFER_INVERSE: the ONT_RULE row with this ID, or (for an ID not in ONT_RULE)
+    the inverse of every active relation that declares one"""
+    rules = read_rules(session, [rule_id]) or [
+        {"RULE_ID": rule_id, "RULE_KIND": 'INVERSE', "TARGET_REL": None, "SOURCE_REL_1": None,
+         "SOURCE_REL_2": None, "INVERSE_OF": None}
+    ]
+    count = run_inference(session, rules[:1])[rule_id]
+    return f"Inferred {count} inverse edges"
+
+
+def constraint_checks(relations: List[dict]) -> List[dict]:
+    """One cardinality check per side CARDINALITY restricts and one referential check per relation.
+
+    Args:
+        relations: ONT_RELATION_DEF rows (REL_NAME, CARDINALITY)
+
+    Returns:
+        Checks as {"CHECK_NAME", "KIND" ('CARDINALITY' or 'REFERENTIAL'), "REL_NAME", "SIDES"}
+    """
+    checks = []
+    for relation in relations:
+        rel_name = relation['REL_NAME']
+        sides = CARDINALITY_SIDES.get(str(relation.get('CARDINALITY') or 'N:N').upper(), [])
+        if sides:
+            checks.append({"CHECK_NAME": f"CARDINALITY_{rel_name}", "KIND": 'CARDINALITY', "REL_NAME": rel_name,
+                           "SIDES": sides})
+        checks.append({"CHECK_NAME": f"REFERENTIAL_{rel_name}", "KIND": 'REFERENTIAL', "REL_NAME": rel_name,
+                       "SIDES": ['SRC', 'DST']})
+    return checks
+
+
+def check_constraints(node_ids: pd.Series, edges: pd.DataFrame, checks: List[dict],
+                      as_of: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Evaluate cardinality and referential checks together and return ONT_CONSTRAINT_VIOLATION rows.
+
+    Edge types and endpoints are factorized once. A cardinality check counts the current edges
+    (EFFECTIVE_END missing or on/after as_of) per endpoint of its relation in one grouped count
+    over all relations; a referential check looks every endpoint up in one hash set of node IDs.
+
+    Args:
+        node_ids: KG_NODE.NODE_ID
+        edges: KG_EDGE rows (SRC_ID, DST_ID, EDGE_TYPE, EFFECTIVE_END)
+        checks: Checks from constraint_checks
+        as_of: Date current edges must still be valid on (default today)
+    """
+    as_of = pd.Timestamp.today().normalize() if as_of is None else pd.Timestamp(as_of)
+    type_codes, edge_types = pd.factorize(edges['EDGE_TYPE'].astype(str))
+    type_of = {edge_type: code for code, edge_type in enumerate(edge_types)}
+    endpoints = {"SRC": edges['SRC_ID'].astype(str).to_numpy(), "DST": edges['DST_ID'].astype(str).to_numpy()}
+    end = as_dates(edges['EFFECTIVE_END'])
+    current = (end.isna() | (end >= as_of)).to_numpy()
+    known_nodes = pd.Index(node_ids.astype(str).unique())
+    frames = []
+
+    def violation_frame(check, side, ids, details):
+        return pd.DataFrame({
+            "CHECK_NAME": check['CHECK_NAME'], "REL_OR_CLASS": check['REL_NAME'],
+            "SRC_ID": ids if side == 'SRC' else None, "DST_ID": ids if side == 'DST' else None,
+            "DETAILS": details
+        })
+
+    def checks_on(kind, side):
+        """Edge type code -> check, for the checks of this kind on this endpoint"""
+        return {type_of[check['REL_NAME']]: check for check in checks
+                if check['KIND'] == kind and side in check['SIDES'] and check['REL_NAME'] in type_of}
+
+    for side, label, direction in [('SRC', 'source', 'from'), ('DST', 'destination', 'to')]:
+        cardinality = checks_on('CARDINALITY', side)
+        if cardinality:
+            # Current edges per (edge type, endpoint), for every restricted relation at once
+            rows = np.flatnonzero(current & np.isin(type_codes, list(cardinality)))
+            endpoint_codes, endpoint_ids = pd.factorize(endpoints[side][rows])
+            width = max(len(endpoint_ids), 1)
+            keys, counts = np.unique(type_codes[rows].astype(np.int64) * width + endpoint_codes, return_counts=True)
+            keys, counts = keys[counts > 1], counts[counts > 1]
+            for type_code, check in cardinality.items():
+                mine = keys // width == type_code
+                frames.append(violation_frame(check, side, endpoint_ids[keys[mine] % width],
+                                              [f"Multiple edges {direction} same {label}: {count} edges"
+                                               for count in counts[mine]]))
+
+        referential = checks_on('REFERENTIAL', side)
+        if referential:
+            missing = known_nodes.get_indexer(endpoints[side]) < 0
+            for type_code, check in referential.items():
+                rows = np.flatnonzero(missing & (type_codes == type_code))
+                frames.append(violation_frame(check, side, endpoints[side][rows],
+                                              f"{label.capitalize()} node not found"))
+
+    if not frames:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    found = pd.concat(frames, ignore_index=True)
+    found.insert(0, 'VIOLATION_ID', [str(uuid.uuid4()) for _ in range(len(found))])
+    found.insert(2, 'SCOPE', 'RELATION')
+    found['OBSERVED_AT'] = pd.Timestamp.now().floor('us')
+    return found[VIOLATION_COLUMNS]
+
+
+def read_relation_defs(session, rel_names: Optional[List[str]] = None) -> List[dict]:
+    """Active ONT_RELATION_DEF rows with their cardinality, optionally only the given relations"""
+    query = "SELECT REL_NAME, CARDINALITY FROM ONT_RELATION_DEF WHERE STATUS = 'ACTIVE'"
+    if rel_names:
+        query += f" AND REL_NAME IN ({sql_list(rel_names)})"
+    return records(session.sql(query).to_pandas())
+
+
+def run_constraint_checks(session, checks: Optional[List[dict]] = None,
+                          as_of: Optional[pd.Timestamp] = None) -> Dict[str, int]:
+    """Read KG_NODE IDs and the edges of the checked relations once, check, and append the
+    violations to ONT_CONSTRAINT_VIOLATION in one bulk write.
+
+    Args:
+        session: Snowpark session (or LocalSession)
+        checks: Checks to evaluate; defaults to those of every active ONT_RELATION_DEF row
+        as_of: Date current edges must still be valid on (default today)
+
+    Returns:
+        Violation count per check name
+    """
+    checks = constraint_checks(read_relation_defs(session)) if checks is None else checks
+    if not checks:
+        return {}
+    node_ids = session.sql("SELECT NODE_ID FROM KG_NODE").to_pandas()['NODE_ID']
+    edges = session.sql(
+        "SELECT SRC_ID, DST_ID, EDGE_TYPE, EFFECTIVE_END FROM KG_EDGE "
+        f"WHERE EDGE_TYPE IN ({sql_list(sorted({check['REL_NAME'] for check in checks}))})"
+    ).to_pandas()
+    found = check_constraints(node_ids, edges, checks, as_of)
+    if len(found):
+        session.write_pandas(found, 'ONT_CONSTRAINT_VIOLATION', auto_create_table=False, overwrite=False,
+                             use_logical_type=True)
+    counts = found['CHECK_NAME'].value_counts()
+    return {check['CHECK_NAME']: int(counts.get(check['CHECK_NAME'], 0)) for check in checks}
+
+
+def sp_check_ontology_constraints(session) -> str:
+    """Handler of SP_CHECK_ONTOLOGY_CONSTRAINTS: every cardinality and referential check in one pass"""
+    counts = run_constraint_checks(session)
+    lines = [f"{check_name}: {count} violations" for check_name, count in counts.items()]
+    lines.append(f"Found {sum(counts.values())} violations in {len(counts)} checks")
+    return "\n".join(lines)
+
+
+def sp_check_cardinality_single(session, rel: str, check_name: str) -> str:
+    """Handler of SP_CHECK_CARDINALITY_SINGLE: at most one current edge per source node"""
+    check = {"CHECK_NAME": check_name, "KIND": 'CARDINALITY', "REL_NAME": rel, "SIDES": ['SRC']}
+    count = run_constraint_checks(session, [check])[check_name]
+    return f"Found {count} cardinality violations for {rel}"
+
+
+def sp_check_referential(session, rel: str, check_name: str) -> str:
+    """Handler of SP_CHECK_REFERENTIAL: both endpoints of every edge exist in KG_NODE"""
+    check = {"CHECK_NAME": check_name, "KIND": 'REFERENTIAL', "REL_NAME": rel, "SIDES": ['SRC', 'DST']}
+    count = run_constraint_checks(session, [check])[check_name]
+    return f"Found {count} referential integrity violations for {rel}"
+
+
+class LocalResult:
+    """Result of LocalSession.sql, with the Snowpark DataFrame methods the procedures use"""
+
+    def __init__(self, connection: sqlite3.Connection, query: str):
+        self.connection = connection
+        self.query = query
+
+    def collect(self) -> List[dict]:
+        cursor = self.connection.execute(self.query)
+        self.connection.commit()
+        if cursor.description is None:
+            return []
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def to_pandas(self) -> pd.DataFrame:
+        return pd.read_sql_query(self.query, self.connection)
+
+
+class LocalSession:
+    """Stand-in for a Snowpark session over an in-memory SQLite database.
+
+    Supports what the procedures use: sql(query).collect() / .to_pandas(), table(name) and
+    write_pandas. Queries must be valid in both Snowflake and SQLite.
+
+    Args:
+        tables: Initial tables by name
+    """
+
+    def __init__(self, tables: Optional[Dict[str, pd.DataFrame]] = None):
+        self.connection = sqlite3.connect(':memory:')
+        for table_name, df in (tables or {}).items():
+            self.write_pandas(df, table_name, auto_create_table=True)
+
+    def sql(self, query: str) -> LocalResult:
+        return LocalResult(self.connection, query)
+
+    def table(self, table_name: str) -> LocalResult:
+        if not re.fullmatch(r'\w+', table_name):
+            raise ValueError(f"Invalid table name: {table_name}")
+        return LocalResult(self.connection, f"SELECT * FROM {table_name}")
+
+    def write_pandas(self, df: pd.DataFrame, table_name: str, auto_create_table: bool = False,
+                     overwrite: bool = False, **kwargs):
+        exists = self.connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                         (table_name,)).fetchone()
+        if not exists and not auto_create_table:
+            raise ValueError(f"Table {table_name} does not exist")
+        df.to_sql(table_name, self.connection, if_exists='replace' if overwrite else 'append', index=False)
+
+
+def local_session(graph_data: Dict[str, pd.DataFrame], rules: Optional[List[dict]] = None,
+                  relations: Optional[List[dict]] = None) -> LocalSession:
+    """LocalSession holding KG_NODE and KG_EDGE from graph_data, ONT_RULE / ONT_RELATION_DEF
+    (the seed metadata by default), and empty REL_EDGE_INFERRED and ONT_CONSTRAINT_VIOLATION"""
+    tables = kg_tables_from_graph_data(graph_data)
+    tables['ONT_RULE'] = pd.DataFrame([{**rule, "IS_ENABLED": True} for rule in (rules or SEED_RULES)])
+    tables['ONT_RELATION_DEF'] = pd.DataFrame([{**relation, "STATUS": 'ACTIVE'}
+                                               for relation in (relations or SEED_RELATIONS)])
+    tables['REL_EDGE_INFERRED'] = pd.DataFrame(columns=INFERRED_COLUMNS + ['COMPUTED_AT'])
+    tables['ONT_CONSTRAINT_VIOLATION'] = pd.DataFrame(columns=VIOLATION_COLUMNS)
+    return LocalSession(tables)
+
+
+def read_graph_data(data_dir: str) -> Dict[str, pd.DataFrame]:
+    """graph_data JSON tables as DataFrames"""
+    graph_data = {}
+    for table_name in ['persons', 'clubs', 'matches', 'player_contracts', 'coach_contracts', 'match_appearances']:
+        with open(f"{data_dir}/{table_name}.json") as f:
+            graph_data[table_name] = pd.DataFrame(json.load(f))
+    return graph_data
+
+
+def main():
+    """Run SP_RUN_ONTOLOGY_INFERENCE and SP_CHECK_ONTOLOGY_CONSTRAINTS locally over a graph_data
+    directory with the seed metadata (or ONT_RULE / ONT_RELATION_DEF rows from JSON files)"""
+    parser = argparse.ArgumentParser(description="Run ontology inference and constraint checks over graph_data")
+    parser.add_argument('data_dir', nargs='?', default='graph_data', help="graph_data directory")
+    parser.add_argument('--rules', help="JSON list of ONT_RULE rows (default: seed rules)")
+    parser.add_argument('--relations', help="JSON list of ONT_RELATION_DEF rows (default: seed relations)")
+    parser.add_argument('--as-of', help="Date current edges must still be valid on (default: today)")
+    parser.add_argument('--fail-on-violations', action='store_true', help="Exit with status 1 on any violation")
+    args = parser.parse_args()
+
+    metadata = {}
+    for name in ['rules', 'relations']:
+        if getattr(args, name):
+            with open(getattr(args, name)) as f:
+                metadata[name] = json.load(f)
+    session = local_session(read_graph_data(args.data_dir), metadata.get('rules'), metadata.get('relations'))
+    print(sp_run_ontology_inference(session))
+    print(session.sql("SELECT REL_NAME, INFERENCE_KIND, COUNT(*) AS EDGES FROM REL_EDGE_INFERRED "
+                      "GROUP BY REL_NAME, INFERENCE_KIND ORDER BY REL_NAME").to_pandas().to_string(index=False))
+    counts = run_constraint_checks(session, as_of=args.as_of)
+    for check_name, count in counts.items():
+        print(f"{check_name}: {count} violations")
+    violations = session.sql("SELECT CHECK_NAME, SRC_ID, DST_ID, DETAILS FROM ONT_CONSTRAINT_VIOLATION "
+                             "ORDER BY CHECK_NAME").to_pandas()
+    if len(violations):
+        print(violations.to_string(index=False))
+    if args.fail_on_violations and len(violations):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Ontology Views Generator
+Builds the abstract VW_ONT_* views from ONT_CLASS, ONT_CLASS_MAP, ONT_RELATION_DEF and
+ONT_REL_MAP. The four tables are fetched in one read and the class hierarchy is resolved in
+memory. Each view's DDL is hashed, the hash is kept in the view's COMMENT, and only views whose
+DDL changed (or that do not exist) are re-issued. SP_GENERATE_ONTOLOGY_VIEWS in
+sql/05_ontology_views_generator.sql imports this module from a stage. LocalViewSession runs it
+against the seed metadata without a Snowflake account:
+
+    python ontology_views.py
+    python ontology_views.py --ddl --check
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from ontology_inference import LocalResult, LocalSession, records
+
+ONTOLOGY_NAME = 'SOCCER_V1'
+
+# One read of the four metadata tables; KIND tells the rows apart
+METADATA_SQL = """
+    SELECT 'CLASS' AS KIND, CLASS_NAME AS NAME, PARENT_CLASS_NAME AS REF, IS_ABSTRACT, ONTOLOGY_NAME,
+           NULL AS CONCRETE_VIEW, NULL AS COL_1, NULL AS COL_2, NULL AS COL_3
+    FROM ONT_CLASS
+    UNION ALL
+    SELECT 'CLASS_MAP', CLASS_NAME, NULL, NULL, NULL, CONCRETE_VIEW, ID_COL, NULL, NULL
+    FROM ONT_CLASS_MAP
+    UNION ALL
+    SELECT 'RELATION', REL_NAME, DOMAIN_CLASS, NULL, ONTOLOGY_NAME, NULL, NULL, NULL, NULL
+    FROM ONT_RELATION_DEF
+    UNION ALL
+    SELECT 'REL_MAP', REL_NAME, NULL, NULL, NULL, CONCRETE_VIEW, SRC_COL, DST_COL, PROPS_COL
+    FROM ONT_REL_MAP
+"""
+
+VIEW_STATE_SQL = """
+    SELECT TABLE_NAME, COMMENT
+    FROM INFORMATION_SCHEMA.VIEWS
+    WHERE TABLE_SCHEMA = CURRENT_SCHEMA()
+    AND TABLE_NAME LIKE 'VW_ONT_%'
+"""
+
+HASH_PATTERN = re.compile(r'ddl_sha256=([0-9a-f]{64})')
+
+METADATA_TABLES = ['ONT_CLASS', 'ONT_CLASS_MAP', 'ONT_RELATION_DEF', 'ONT_REL_MAP']
+
+
+def read_metadata(session) -> Dict[str, List[dict]]:
+    """Rows of the four metadata tables by KIND (CLASS, CLASS_MAP, RELATION, REL_MAP)"""
+    metadata = {"CLASS": [], "CLASS_MAP": [], "RELATION": [], "REL_MAP": []}
+    for row in records(session.sql(METADATA_SQL).to_pandas()):
+        metadata[row['KIND']].append(row)
+    return metadata
+
+
+def class_view_parts(class_name: str, metadata: Dict[str, List[dict]], parents: Dict[str, str]) -> List[str]:
+    """SELECTs of an abstract class view: the mappings of the class and of its direct subclasses"""
+    members = {class_name} | {name for name, parent in parents.items() if parent == class_name}
+    mappings = sorted((row for row in metadata['CLASS_MAP'] if row['NAME'] in members and row['NAME'] in parents),
+                      key=lambda row: (row['NAME'], row['CONCRETE_VIEW'], row['COL_1']))
+    return [f"SELECT {row['COL_1']} AS ID, '{row['NAME']}' AS SUBTYPE, '{row['CONCRETE_VIEW']}' AS SRC_VIEW\n"
+            f"FROM {row['CONCRETE_VIEW']}" for row in mappings]
+
+
+def relation_view_parts(rel_name: str, metadata: Dict[str, List[dict]], parents: Dict[str, str]) -> List[str]:
+    """SELECTs of an abstract relationship view: the mappings of the relationship and of every
+    relationship whose domain class is a direct subclass of its domain"""
+    domains = {row['REF'] for row in metadata['RELATION'] if row['NAME'] == rel_name}
+    via = {rel_name} | {row['NAME'] for row in metadata['RELATION']
+                        if row['REF'] in parents and parents[row['REF']] in domains}
+    defined = {row['NAME'] for row in metadata['RELATION']}
+    mappings = sorted((row for row in metadata['REL_MAP'] if row['NAME'] in via and row['NAME'] in defined),
+                      key=lambda row: (row['NAME'], row['CONCRETE_VIEW'], row['COL_1'], row['COL_2']))
+    parts = []
+    for row in mappings:
+        concrete_view, src_col, dst_col = row['CONCRETE_VIEW'], row['COL_1'], row['COL_2']
+        # Determine subject and object classes from the concrete view and column names
+        subject_class = 'Player' if 'PLAYS_FOR' in concrete_view else ('Coach' if 'COACHES' in concrete_view else 'Club')
+        object_class = 'Club' if 'CLUB' in dst_col.upper() else ('Match' if 'MATCH' in dst_col.upper() else 'Organization')
+        parts.append(f"SELECT {src_col} AS SUBJECT_ID, '{subject_class}' AS SUBJECT_CLASS, "
+                     f"{dst_col} AS OBJECT_ID, '{object_class}' AS OBJECT_CLASS, "
+                     f"'{row['NAME']}' AS VIA_REL, '{concrete_view}' AS SRC_VIEW, {row['COL_3'] or 'NULL'} AS PROPS, "
+                     f"EFFECTIVE_START, EFFECTIVE_END, WEIGHT\n"
+                     f"FROM {concrete_view}")
+    return parts
+
+
+def view_definitions(metadata: Dict[str, List[dict]], ontology_name: str = ONTOLOGY_NAME) -> List[dict]:
+    """One entry per abstract class, then per abstract relationship, in name order:
+    {"NAME", "VIEW", "PARTS"} (PARTS empty when nothing maps to it)"""
+    parents = {row['NAME']: row['REF'] for row in metadata['CLASS']}
+    abstract = {row['NAME'] for row in metadata['CLASS'] if row['IS_ABSTRACT']}
+    classes = sorted({row['NAME'] for row in metadata['CLASS']
+                      if row['IS_ABSTRACT'] and row['ONTOLOGY_NAME'] == ontology_name})
+    relations = sorted({row['NAME'] for row in metadata['RELATION']
+                        if row['REF'] in abstract and row['ONTOLOGY_NAME'] == ontology_name})
+    definitions = [{"NAME": name, "VIEW": f"VW_ONT_{name.upper()}", "PARTS": class_view_parts(name, metadata, parents)}
+                   for name in classes]
+    definitions += [{"NAME": name, "VIEW": f"VW_ONT_{name.upper()}",
+                     "PARTS": relation_view_parts(name, metadata, parents)} for name in relations]
+    return definitions
+
+
+def view_ddl(view: str, parts: List[str]) -> tuple:
+    """(CREATE statement, hash) for a view. The hash covers the DDL without its COMMENT, which
+    carries the hash"""
+    query = '\nUNION ALL\n'.join(parts)
+    digest = hashlib.sha256(f"CREATE OR REPLACE VIEW {view} AS\n{query}".encode()).hexdigest()
+    return f"CREATE OR REPLACE VIEW {view} COMMENT = 'Generated from ontology metadata; ddl_sha256={digest}' AS\n{query}", digest
+
+
+def read_view_hashes(session) -> Dict[str, str]:
+    """DDL hash of every existing VW_ONT_* view that has one in its COMMENT"""
+    hashes = {}
+    for row in session.sql(VIEW_STATE_SQL).collect():
+        match = HASH_PATTERN.search(row['COMMENT'] or '')
+        if match:
+            hashes[row['TABLE_NAME']] = match.group(1)
+    return hashes
+
+
+def generate_views(session, ontology_name: str = ONTOLOGY_NAME) -> List[str]:
+    """Create or replace the abstract views whose DDL changed, skipping the rest. Returns one
+    status line per view"""
+    definitions = view_definitions(read_metadata(session), ontology_name)
+    existing = read_view_hashes(session)
+    results = []
+    for definition in definitions:
+        view, parts = definition['VIEW'], definition['PARTS']
+        if not parts:
+            results.append(f"SKIP: {definition['NAME']} - no concrete mappings")
+            continue
+        ddl, digest = view_ddl(view, parts)
+        if existing.get(view.upper()) == digest:
+            results.append(f"UNCHANGED: {view} with {len(parts)} sources skipped")
+            continue
+        session.sql(ddl).collect()
+        results.append(f"OK: {view} created with {len(parts)} sources")
+    return results
+
+
+def sp_generate_ontology_views(session) -> str:
+    """Handler of SP_GENERATE_ONTOLOGY_VIEWS"""
+    results = generate_views(session)
+    skipped = sum(line.startswith('UNCHANGED') for line in results)
+    created = sum(line.startswith('OK') for line in results)
+    return "\n".join(results + [f"{created} views created, {skipped} unchanged"])
+
+
+class LocalViewSession(LocalSession):
+    """LocalSession that also accepts CREATE OR REPLACE VIEW statements. They are recorded in
+    `ddl` and in an INFORMATION_SCHEMA.VIEWS table (TABLE_SCHEMA, TABLE_NAME, COMMENT,
+    VIEW_DEFINITION) that VIEW_STATE_SQL reads back; the views themselves are not created.
+
+    Args:
+        tables: Initial tables by name
+        schema: Value of CURRENT_SCHEMA()
+    """
+
+    def __init__(self, tables: Optional[Dict[str, pd.DataFrame]] = None, schema: str = 'SOCCER_KG'):
+        super().__init__(tables)
+        self.schema = schema
+        self.ddl = []
+        self.connection.create_function('CURRENT_SCHEMA', 0, lambda: self.schema)
+        self.connection.execute("ATTACH DATABASE ':memory:' AS INFORMATION_SCHEMA")
+        self.connection.execute("CREATE TABLE INFORMATION_SCHEMA.VIEWS "
+                                "(TABLE_SCHEMA, TABLE_NAME, COMMENT, VIEW_DEFINITION)")
+
+    def sql(self, query: str) -> LocalResult:
+        match = re.match(r"\s*CREATE OR REPLACE VIEW (\w+)(?: COMMENT = '((?:[^']|'')*)')?", query)
+        if match is None:
+            return super().sql(query)
+        self.ddl.append(query)
+        self.connection.execute("DELETE FROM INFORMATION_SCHEMA.VIEWS WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?",
+                                (self.schema, match.group(1).upper()))
+        self.connection.execute("INSERT INTO INFORMATION_SCHEMA.VIEWS VALUES (?, ?, ?, ?)",
+                                (self.schema, match.group(1).upper(),
+                                 (match.group(2) or '').replace("''", "'") or None, query))
+        return super().sql("SELECT 'Statement executed successfully.' AS STATUS")
+
+
+def seed_view_session(seed_sql: str) -> LocalViewSession:
+    """LocalViewSession holding the metadata tables from the INSERT statements of a seed script
+    (sql/08_seed_metadata.sql)"""
+    session = LocalViewSession()
+    with open(seed_sql) as f:
+        script = f.read()
+    for match in re.finditer(r'^INSERT INTO (\w+) \(([^)]*)\) VALUES.*?;\s*$', script, re.MULTILINE | re.DOTALL):
+        if match.group(1) in METADATA_TABLES:
+            session.connection.execute(f"CREATE TABLE IF NOT EXISTS {match.group(1)} ({match.group(2)})")
+            session.connection.execute(match.group(0))
+    return session
+
+
+def main():
+    """Run SP_GENERATE_ONTOLOGY_VIEWS locally over the seed metadata"""
+    default_seed = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sql', '08_seed_metadata.sql')
+    parser = argparse.ArgumentParser(description="Generate the abstract ontology views from seed metadata")
+    parser.add_argument('--seed-sql', default=default_seed, help="Seed script with the metadata INSERT statements")
+    parser.add_argument('--ddl', action='store_true', help="Print the issued DDL")
+    parser.add_argument('--check', action='store_true',
+                        help="Generate again and exit with status 1 if any view is re-issued")
+    args = parser.parse_args()
+
+    session = seed_view_session(args.seed_sql)
+    print(sp_generate_ontology_views(session))
+    if args.ddl:
+        print(";\n\n".join(session.ddl) + ";")
+    if args.check:
+        issued = len(session.ddl)
+        print(sp_generate_ontology_views(session))
+        if len(session.ddl) > issued:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,695 @@ Soccer Knowledge Graph MCP Server
 Implements MCP protocol server for graph analytics on soccer knowledge graph
 """
 
+import array
 import asyncio
+import base64
+import binascii
+import contextvars
+import copy
+import cProfile
+import functools
+import gc
+import itertools
 import logging
+import math
+import random
+import resource
+import signal
 import sys
+import time
 import os
 from typing import Any, Dict, List, Optional
 import json
 import networkx as nx
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc
 
 # MCP imports - using FastMCP for simpler implementation
 from mcp.server.fastmcp import FastMCP
 
+import ontology_inference
+
 # HTTP server imports for SPCS endpoints
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 import threading
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 
 # Configure logging to stderr (required for MCP STDIO servers)
 logging.basicConfig(level=logging.INFO, stream=sys.stderr)
 logger = logging.getLogger(__name__)
 
+# Static JSON files loaded into SoccerGraphLoader.graph_data
+GRAPH_DATA_FILES = {
+    'persons': 'persons.json',
+    'clubs': 'clubs.json',
+    'matches': 'matches.json',
+    'player_contracts': 'player_contracts.json',
+    'coach_contracts': 'coach_contracts.json',
+    'match_appearances': 'match_appearances.json'
+}
+
+# Newline-delimited alternatives to each GRAPH_DATA_FILES entry (persons.ndjson, ...), preferred when present
+NDJSON_EXTENSIONS = ['.ndjson', '.jsonl']
+
+# Columns converted to datetime64 on load
+DATE_COLUMNS = ['DATE_OF_BIRTH', 'START_DATE', 'END_DATE', 'MATCH_DATE', 'CREATED_AT']
+
+# Declared dtype of each column. 'category' stores low-cardinality strings as codes into one
+# set of interned categories, 'str' keeps an object column of interned strings, and narrow
+# integer dtypes apply when the column has no nulls and every value fits. Columns not listed
+# keep the dtype the loader inferred.
+TABLE_SCHEMAS = {
+    'persons': {
+        'PERSON_ID': 'int32', 'NAME': 'str', 'NATIONALITY': 'category', 'DATE_OF_BIRTH': 'datetime64[ns]',
+        'ROLE': 'category', 'POSITION': 'category', 'CREATED_AT': 'datetime64[ns]'
+    },
+    'clubs': {
+        'CLUB_ID': 'int32', 'CLUB_NAME': 'str', 'COUNTRY': 'category', 'LEAGUE': 'category',
+        'FOUNDED_YEAR': 'int16', 'STADIUM': 'str', 'CREATED_AT': 'datetime64[ns]'
+    },
+    'matches': {
+        'MATCH_ID': 'int32', 'MATCH_NAME': 'str', 'EVENT_DATE': 'datetime64[ns]', 'VENUE': 'category',
+        'HOME_TEAM_ID': 'int32', 'AWAY_TEAM_ID': 'int32', 'SCORE_HOME': 'int8', 'SCORE_AWAY': 'int8',
+        'COMPETITION': 'category', 'CREATED_AT': 'datetime64[ns]'
+    },
+    'player_contracts': {
+        'CONTRACT_ID': 'int32', 'PERSON_ID': 'int32', 'CLUB_ID': 'int32', 'START_DATE': 'datetime64[ns]',
+        'END_DATE': 'datetime64[ns]', 'JERSEY_NUMBER': 'int8', 'CREATED_AT': 'datetime64[ns]'
+    },
+    'coach_contracts': {
+        'CONTRACT_ID': 'int32', 'PERSON_ID': 'int32', 'CLUB_ID': 'int32', 'START_DATE': 'datetime64[ns]',
+        'END_DATE': 'datetime64[ns]', 'CREATED_AT': 'datetime64[ns]'
+    },
+    'match_appearances': {
+        'APPEARANCE_ID': 'int32', 'PERSON_ID': 'int32', 'MATCH_ID': 'int32', 'MINUTES_PLAYED': 'int16',
+        'GOALS_SCORED': 'int8', 'ASSISTS': 'int8', 'YELLOW_CARDS': 'int8', 'RED_CARDS': 'int8',
+        'CREATED_AT': 'datetime64[ns]'
+    }
+}
+
+# Bytes read per step when streaming a JSON array
+JSON_READ_CHUNK = 1 << 20
+
+# Records buffered before they are appended to the column buffers
+RECORD_BATCH_SIZE = 8192
+
+# Binary snapshot written next to the JSON files by `--build-snapshot`
+SNAPSHOT_DIRNAME = 'snapshot'
+SNAPSHOT_FORMAT_VERSION = 2
+SNAPSHOT_GRAPHS = ['player_graph', 'club_graph']
+
+# Edge attribute holding the shared entity behind each relationship type
+EDGE_CONTEXT_ATTRIBUTES = {
+    'teammate': 'club_id',
+    'match_co_participation': 'match_id',
+    'match': 'match_id',
+    'transfer': 'player_id'
+}
+EDGE_RELATIONSHIPS = list(EDGE_CONTEXT_ATTRIBUTES)
+
+# Relationship counts kept per edge by EdgeWeights, usable as `weight_by` in the tools
+WEIGHT_COLUMNS = {
+    'player': ['shared_clubs', 'shared_matches'],
+    'club': ['matches_played', 'shared_players']
+}
+
+# Graph engine for traversal and degree/eigenvector/PageRank: 'networkx' or 'csr' (see CSRGraph)
+GRAPH_ENGINE = os.getenv('GRAPH_ENGINE', 'networkx')
+
+# Highest-degree nodes per graph with a precomputed BFS tree (see SoccerGraphLoader.build_engine)
+PATH_HUB_COUNT = int(os.getenv('PATH_HUB_COUNT', '8'))
+
+# Relationships with validity intervals per graph, in precedence order (see IntervalIndex).
+# 'overlap': both members in the bucket at the same time; 'move': a member joins a second bucket
+TEMPORAL_RELATIONSHIPS = {
+    'player': [('teammate', 'overlap'), ('match_co_participation', 'overlap')],
+    'club': [('match', 'overlap'), ('transfer', 'move')]
+}
+
+# Seasons ("2023/24") run from this month to the month before it in the following year
+SEASON_START_MONTH = 7
+
+# Process-wide graph versions; every build or snapshot load takes the next one
+graph_versions = itertools.count(1)
+
+class ContractIndex:
+    """Contract row positions grouped by an ID column and sorted by start date within each group"""
+    
+    def __init__(self, keys: pd.Series, start_dates: pd.Series):
+        key_values = keys.to_numpy()
+        start_ns = start_dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        order = np.lexsort((start_ns, key_values))
+        
+        self.positions = order
+        self.start_ns = start_ns[order]
+        
+        # Contiguous [lo, hi) slice of the sorted arrays for every key
+        sorted_keys = key_values[order]
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        group_starts = np.concatenate(([0], boundaries)).astype(np.int64)
+        group_ends = np.concatenate((boundaries, [len(order)])).astype(np.int64)
+        self.groups = dict(zip(
+            sorted_keys[group_starts].tolist() if len(order) else [],
+            zip(group_starts.tolist(), group_ends.tolist())
+        ))
+    
+    def lookup(self, key, start_dt=None, end_dt=None) -> np.ndarray:
+        """Row positions for key, optionally limited to start dates in [start_dt, end_dt], in table order"""
+        lo, hi = self.groups.get(key, (0, 0))
+        if start_dt is not None and end_dt is not None:
+            # Binary search the group's sorted start dates (missing dates sort first and never match)
+            window = self.start_ns[lo:hi]
+            lo, hi = (lo + np.searchsorted(window, pd.Timestamp(start_dt).value, 'left'),
+                      lo + np.searchsorted(window, pd.Timestamp(end_dt).value, 'right'))
+        return np.sort(self.positions[lo:hi])
+
+class EdgeWeights:
+    """Relationship totals for every edge of one graph, held as parallel NumPy columns.
+    
+    Where the graph keeps a single first-seen relationship per node pair, this keeps all
+    of them: a count per relationship (e.g. shared clubs and shared matches) and the
+    date span they cover. Rows are sorted by (low, high) node ID for binary search.
+    Dates are int64 nanoseconds with NaT for unknown.
+    """
+    
+    def __init__(self, columns: Dict[str, np.ndarray], count_columns: List[str]):
+        self.columns = columns
+        self.count_columns = count_columns
+    
+    @classmethod
+    def from_pair_totals(cls, totals: Dict[str, tuple]):
+        """Merge per-relationship (low, high, count, first_ns, last_ns) arrays into one row per pair.
+        
+        Input pairs may repeat and be in either orientation; missing first dates are int64 max.
+        """
+        count_columns = list(totals)
+        parts = {name: [] for name in ['low', 'high', 'first_ns', 'last_ns'] + count_columns}
+        for name, (left, right, count, first, last) in totals.items():
+            parts['low'].append(np.minimum(left, right))
+            parts['high'].append(np.maximum(left, right))
+            parts['first_ns'].append(first)
+            parts['last_ns'].append(last)
+            for other in count_columns:
+                parts[other].append(count if other == name else np.zeros(len(count), dtype=np.int32))
+        merged = {name: np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
+                  for name, arrays in parts.items()}
+        
+        order = np.lexsort((merged['high'], merged['low']))
+        low, high = merged['low'][order], merged['high'][order]
+        starts = np.flatnonzero(np.concatenate(([True], (low[1:] != low[:-1]) | (high[1:] != high[:-1]))))
+        if len(order) == 0:
+            starts = np.zeros(0, dtype=np.int64)
+        
+        def reduce(ufunc, values):
+            return ufunc.reduceat(values[order], starts) if len(starts) else values[:0]
+        
+        first_ns = reduce(np.minimum, merged['first_ns'])
+        columns = {
+            'low': low[starts].astype(np.int64),
+            'high': high[starts].astype(np.int64),
+            # The max sentinel means no pair had a date; NaT's int value is int64 min
+            'first_ns': np.where(first_ns == np.iinfo(np.int64).max, np.iinfo(np.int64).min, first_ns),
+            'last_ns': reduce(np.maximum, merged['last_ns'])
+        }
+        for name in count_columns:
+            columns[name] = reduce(np.add, merged[name]).astype(np.int32)
+        return cls(columns, count_columns)
+    
+    def __len__(self):
+        return len(self.columns['low'])
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.columns.values())
+    
+    def find(self, u, v) -> int:
+        """Row of the (u, v) pair, or -1"""
+        low, high = min(u, v), max(u, v)
+        lo = np.searchsorted(self.columns['low'], low, 'left')
+        hi = np.searchsorted(self.columns['low'], low, 'right')
+        row = lo + np.searchsorted(self.columns['high'][lo:hi], high, 'left')
+        return int(row) if row < hi and self.columns['high'][row] == high else -1
+    
+    def edge(self, u, v) -> Optional[dict]:
+        """Counts and date span for one pair as JSON-ready values, or None"""
+        row = self.find(u, v)
+        if row < 0:
+            return None
+        result = {name: int(self.columns[name][row]) for name in self.count_columns}
+        for name in ['first_ns', 'last_ns']:
+            value = pd.Timestamp(int(self.columns[name][row])) if self.columns[name][row] != np.iinfo(np.int64).min else None
+            result[name.replace('_ns', '_date')] = value.strftime('%Y-%m-%d') if value is not None else None
+        return result
+    
+    def strength(self, weight_by: str) -> np.ndarray:
+        """Tie strength per row: one count column, or 'all' for their sum"""
+        if weight_by == 'all':
+            return sum(self.columns[name].astype(np.int64) for name in self.count_columns)
+        return self.columns[weight_by].astype(np.int64)
+    
+    def weighted_graph(self, graph: nx.Graph, weight_by: str) -> nx.Graph:
+        """Copy of graph with 'weight' (tie strength) and 'distance' (1 / strength) on every edge.
+        
+        Edges with none of the chosen relationship get distance n, so paths use them only
+        when no route over stronger ties exists (a path has at most n - 1 hops of length <= 1).
+        """
+        weighted = nx.Graph()
+        weighted.add_nodes_from(graph.nodes(data=True))
+        strength = self.strength(weight_by)
+        no_tie = float(max(len(graph), 1))
+        weighted.add_edges_from(
+            (low, high, {'weight': weight, 'distance': 1.0 / weight if weight else no_tie})
+            for low, high, weight in zip(self.columns['low'].tolist(), self.columns['high'].tolist(),
+                                         strength.tolist())
+        )
+        return weighted
+
+class CSRGraph:
+    """Integer-relabeled CSR adjacency of an undirected graph with vectorized algorithms.
+    
+    Built from a NetworkX graph in its node and adjacency order, so that every algorithm
+    here visits nodes and neighbours in the same order as the NetworkX implementation it
+    replaces and returns the same result (including tie-breaking and float rounding).
+    """
+    
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.nodes = np.asarray(arrays['nodes'])
+        self.indptr = np.asarray(arrays['indptr'])
+        self.indices = np.asarray(arrays['indices']).astype(np.int64)
+        self.degrees = np.diff(self.indptr)
+        # Row of each adjacency entry, for scatter-adds over all edges
+        self.rows = np.repeat(np.arange(len(self.nodes)), self.degrees)
+        self.sorter = np.argsort(self.nodes, kind='stable')
+    
+    @classmethod
+    def from_graph(cls, graph: nx.Graph):
+        return cls(graph_to_csr(graph))
+    
+    def __len__(self):
+        return len(self.nodes)
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in [self.nodes, self.indptr, self.indices, self.degrees,
+                                               self.rows, self.sorter])
+    
+    def position(self, node) -> int:
+        """Integer label of a node ID, or -1"""
+        i = np.searchsorted(self.nodes, node, sorter=self.sorter)
+        if i < len(self.nodes) and self.nodes[self.sorter[i]] == node:
+            return int(self.sorter[i])
+        return -1
+    
+    def expand(self, frontier: np.ndarray) -> tuple:
+        """Neighbours of the frontier nodes in visiting order, with the frontier node each came from"""
+        lengths = self.degrees[frontier]
+        total = int(lengths.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return self.indices[np.repeat(self.indptr[frontier], lengths) + offsets], np.repeat(frontier, lengths)
+    
+    def bfs_distances(self, source: int) -> np.ndarray:
+        """Hop count from the source label to every label (-1 when unreachable), one level at a time"""
+        distances = np.full(len(self.nodes), -1, dtype=np.int64)
+        distances[source] = 0
+        frontier = np.array([source])
+        level = 0
+        while len(frontier):
+            level += 1
+            neighbors, _ = self.expand(frontier)
+            frontier = np.unique(neighbors[distances[neighbors] < 0])
+            distances[frontier] = level
+        return distances
+    
+    def shortest_path(self, source, target, max_depth: int = 0) -> List[Any]:
+        """Same path as bidirectional_path (and nx.shortest_path), with each level expanded in NumPy"""
+        s, t = self.position(source), self.position(target)
+        if s == t:
+            return [source]
+        # Parent label per side: -2 unvisited, -1 for the side's root
+        parents = [np.full(len(self.nodes), -2, dtype=np.int64), np.full(len(self.nodes), -2, dtype=np.int64)]
+        parents[0][s] = -1
+        parents[1][t] = -1
+        fringes = [np.array([s]), np.array([t])]
+        meet = -1
+        depth = 0
+        while len(fringes[0]) and len(fringes[1]):
+            if max_depth and depth >= max_depth:
+                break
+            depth += 1
+            # Like NetworkX, grow the smaller fringe (forward on ties)
+            side = 0 if len(fringes[0]) <= len(fringes[1]) else 1
+            own, other = parents[side], parents[1 - side]
+            neighbors, origins = self.expand(fringes[side])
+            hits = np.flatnonzero(other[neighbors] != -2)
+            if len(hits):
+                # Stop at the first neighbour already reached from the other side
+                neighbors, origins = neighbors[:hits[0] + 1], origins[:hits[0] + 1]
+                meet = int(neighbors[-1])
+            new = own[neighbors] == -2
+            first_seen, first = np.unique(neighbors[new], return_index=True)
+            own[first_seen] = origins[new][first]
+            fringes[side] = neighbors[new][np.sort(first)]
+            if meet >= 0:
+                break
+        if meet < 0:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        
+        path = []
+        node = meet
+        while node != -1:
+            path.append(node)
+            node = parents[0][node]
+        path.reverse()
+        node = parents[1][path[-1]]
+        while node != -1:
+            path.append(node)
+            node = parents[1][node]
+        return self.nodes[path].tolist()
+    
+    def degree_centrality(self) -> Dict[Any, float]:
+        """Same values as nx.degree_centrality"""
+        if len(self.nodes) <= 1:
+            return {node: 1 for node in self.nodes.tolist()}
+        scale = 1.0 / (len(self.nodes) - 1.0)
+        return dict(zip(self.nodes.tolist(), (self.degrees * scale).tolist()))
+    
+    def closeness_centrality(self) -> Dict[Any, float]:
+        """Same values as nx.closeness_centrality, from one vectorized BFS per node"""
+        n = len(self.nodes)
+        closeness = []
+        for source in range(n):
+            distances = self.bfs_distances(source)
+            reached = distances[distances >= 0]
+            total = int(reached.sum())
+            value = 0.0
+            if total > 0.0 and n > 1:
+                value = (len(reached) - 1.0) / total
+                value *= (len(reached) - 1.0) / (n - 1)
+            closeness.append(value)
+        return dict(zip(self.nodes.tolist(), closeness))
+    
+    def eigenvector_centrality(self, max_iter=100, tol=1e-06) -> Dict[Any, float]:
+        """Same values as nx.eigenvector_centrality: power iteration on A + I, L1 convergence.
+        
+        np.add.at applies the per-edge additions in adjacency order, which keeps every
+        float sum in the same order as the NetworkX loop.
+        """
+        n = len(self.nodes)
+        if n == 0:
+            raise nx.NetworkXPointlessConcept("cannot compute centrality for the null graph")
+        x = np.full(n, 1 / n)
+        for _ in range(max_iter):
+            xlast = x
+            x = xlast.copy()
+            np.add.at(x, self.indices, xlast[self.rows])
+            norm = math.hypot(*x.tolist()) or 1
+            x = x / norm
+            if sum(np.abs(x - xlast).tolist()) < n * tol:
+                return dict(zip(self.nodes.tolist(), x.tolist()))
+        raise nx.PowerIterationFailedConvergence(max_iter)
+    
+    def pagerank(self, alpha=0.85, max_iter=100, tol=1e-06) -> Dict[Any, float]:
+        """Same values as pagerank_centrality on the NetworkX graph"""
+        n = len(self.nodes)
+        if n == 0:
+            return {}
+        x = np.full(n, 1.0 / n)
+        linked = self.degrees > 0
+        for _ in range(max_iter):
+            xlast = x
+            dangling = alpha * sum(xlast[~linked].tolist())
+            x = np.full(n, dangling / n + (1 - alpha) / n)
+            share = np.zeros(n)
+            share[linked] = alpha * xlast[linked] / self.degrees[linked]
+            np.add.at(x, self.indices, share[self.rows])
+            if sum(np.abs(x - xlast).tolist()) < n * tol:
+                return dict(zip(self.nodes.tolist(), x.tolist()))
+        raise nx.PowerIterationFailedConvergence(max_iter)
+
+class IntervalIndex:
+    """Membership rows (bucket, member, start, end) of one relationship, sorted by start date.
+    
+    A row says the member (player or club) belonged to the bucket (club, match or player)
+    over [start, end] in int64 nanoseconds; open ends are int64 min/max. Rows active in a
+    window are found with one binary search plus a vectorized filter.
+    """
+    
+    def __init__(self, buckets: np.ndarray, members: np.ndarray, start_ns: np.ndarray, end_ns: np.ndarray):
+        known = (start_ns != np.iinfo(np.int64).min) | (end_ns != np.iinfo(np.int64).max)
+        order = np.argsort(start_ns[known], kind='stable')
+        self.buckets = np.asarray(buckets)[known][order]
+        self.members = np.asarray(members)[known][order]
+        self.start_ns = start_ns[known][order]
+        self.end_ns = end_ns[known][order]
+    
+    def __len__(self):
+        return len(self.start_ns)
+    
+    @property
+    def nbytes(self) -> int:
+        return self.buckets.nbytes + self.members.nbytes + self.start_ns.nbytes + self.end_ns.nbytes
+    
+    def overlapping(self, start: int, end: int) -> np.ndarray:
+        """Rows whose interval intersects [start, end]"""
+        hi = np.searchsorted(self.start_ns, end, 'right')
+        return np.flatnonzero(self.end_ns[:hi] >= start)
+    
+    def starting(self, start: int, end: int) -> np.ndarray:
+        """Rows whose interval starts within [start, end]"""
+        return np.arange(np.searchsorted(self.start_ns, start, 'left'), np.searchsorted(self.start_ns, end, 'right'))
+    
+    def in_buckets(self, buckets: np.ndarray) -> np.ndarray:
+        """All rows of the given buckets"""
+        return np.flatnonzero(np.isin(self.buckets, buckets))
+
+# Distinct-player sketches of ContractCube: HyperLogLog with 2 ** CUBE_SKETCH_PRECISION registers
+# (about 0.8% standard error; small counts use linear counting and are near exact)
+CUBE_SKETCH_PRECISION = 14
+
+# Largest groups x registers byte array ContractCube.rollup merges sketches in (16 MB);
+# rollups over more groups sort the sketch entries instead
+CUBE_DENSE_REGISTERS = 1 << 24
+
+# ContractCube cell dimensions, and the person attributes among them (stored as label codes)
+CUBE_KEYS = ['MONTH', 'CLUB_ID', 'NATIONALITY', 'POSITION']
+CUBE_LABELS = ['NATIONALITY', 'POSITION']
+
+# MONTH of contracts without a start date (sorts before every real month)
+UNKNOWN_MONTH = np.iinfo(np.int32).min
+
+def splitmix64(values: np.ndarray) -> np.ndarray:
+    """Well-mixed 64-bit hashes of integer IDs, the same in every process (unlike hash())"""
+    with np.errstate(over='ignore'):
+        z = values.astype(np.int64).view(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+def sketch_entries(ids: np.ndarray) -> tuple:
+    """(register, rank) HyperLogLog entries of each ID: the top bits of its hash pick the
+    register, and rank is one more than the number of leading zeros in the rest"""
+    hashes = splitmix64(ids)
+    rest_bits = 64 - CUBE_SKETCH_PRECISION
+    registers = (hashes >> np.uint64(rest_bits)).astype(np.uint16)
+    # Exact as float64 (below 2 ** 53); frexp's exponent is the bit length
+    rest = (hashes & np.uint64((1 << rest_bits) - 1)).astype(np.float64)
+    ranks = (rest_bits + 1 - np.frexp(rest)[1]).astype(np.uint8)
+    return registers, ranks
+
+def hll_estimate(present: np.ndarray, harmonic: np.ndarray) -> np.ndarray:
+    """HyperLogLog cardinality estimates from the number of non-zero registers and the sum of
+    2 ** -rank over them, per sketch"""
+    m = 1 << CUBE_SKETCH_PRECISION
+    zeros = m - present
+    raw = 0.7213 / (1 + 1.079 / m) * m * m / (zeros + harmonic)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+def contract_months(contracts_df: pd.DataFrame) -> np.ndarray:
+    """Start month of each contract (year * 12 + month - 1), UNKNOWN_MONTH when undated"""
+    start_dates = pd.to_datetime(contracts_df['START_DATE'], errors='coerce')
+    return (start_dates.dt.year * 12 + start_dates.dt.month - 1).fillna(UNKNOWN_MONTH).to_numpy(dtype=np.int32)
+
+class ContractCube:
+    """Player contracts rolled up by start month, club, nationality and position.
+    
+    Every cell holds a contract count, the summed contract value and a sparse HyperLogLog
+    sketch of its players (one (register, rank) entry per register in use), so distinct
+    players over any set of cells come from merging their sketches. Years and seasons are
+    unions of months; cells are sorted by month, so a time range is one contiguous slice.
+    Cubes are never changed in place: merge returns a new one.
+    
+    Args:
+        cells: CUBE_KEYS columns plus CONTRACTS and CONTRACT_VALUE, one row per distinct key
+        labels: Label list of each CUBE_LABELS column (cells hold codes into it)
+        sketch: CELL, REGISTER and RANK columns, sorted by CELL then REGISTER
+    """
+    
+    def __init__(self, cells: Dict[str, np.ndarray], labels: Dict[str, list], sketch: Dict[str, np.ndarray]):
+        self.cells = cells
+        self.labels = labels
+        self.sketch = sketch
+    
+    def __len__(self):
+        return len(self.cells['MONTH'])
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.cells.values()) + sum(values.nbytes for values in self.sketch.values())
+    
+    @classmethod
+    def aggregate(cls, cells: Dict[str, np.ndarray], labels: Dict[str, list], sketch: Dict[str, np.ndarray]):
+        """Cube from cell rows that may repeat a key: counts and values are summed and the
+        sketch keeps the highest rank per (cell, register)"""
+        n = len(cells['MONTH'])
+        order = np.lexsort([cells[key] for key in reversed(CUBE_KEYS)])
+        sorted_keys = {key: cells[key][order] for key in CUBE_KEYS}
+        same = np.ones(max(n - 1, 0), dtype=bool)
+        for key in CUBE_KEYS:
+            same &= sorted_keys[key][1:] == sorted_keys[key][:-1]
+        first = np.concatenate(([True], ~same))[:n]
+        starts = np.flatnonzero(first)
+        cell_of_row = np.empty(n, dtype=np.int64)
+        cell_of_row[order] = np.cumsum(first) - 1
+        
+        merged = {key: sorted_keys[key][starts] for key in CUBE_KEYS}
+        for column in ['CONTRACTS', 'CONTRACT_VALUE']:
+            merged[column] = (np.add.reduceat(cells[column][order], starts) if n
+                              else np.zeros(0, dtype=cells[column].dtype))
+        # Keep only labels some cell uses (e.g. 'Unknown' once every person row has arrived);
+        # codes keep their order, so cells stay sorted
+        labels = dict(labels)
+        for column in CUBE_LABELS:
+            used = np.unique(merged[column])
+            if len(used) < len(labels[column]):
+                merged[column] = np.searchsorted(used, merged[column]).astype(np.int32)
+                labels[column] = [labels[column][code] for code in used.tolist()]
+        
+        cell = cell_of_row[sketch['CELL']]
+        entry_keys = cell << 16 | sketch['REGISTER'].astype(np.int64)
+        entry_order = np.lexsort((sketch['RANK'], entry_keys))
+        sorted_entries = entry_keys[entry_order]
+        # Highest rank is the last entry of each (cell, register) run
+        last = np.ones(len(sorted_entries), dtype=bool)
+        last[:-1] = sorted_entries[1:] != sorted_entries[:-1]
+        keep = entry_order[last]
+        return cls(merged, labels, {"CELL": cell[keep], "REGISTER": sketch['REGISTER'][keep],
+                                    "RANK": sketch['RANK'][keep]})
+    
+    @classmethod
+    def from_contracts(cls, contracts_df: pd.DataFrame, persons_df: pd.DataFrame):
+        """Cube of player contracts, with nationality and position looked up in persons_df
+        ('Unknown' when missing). Contracts without a start date get UNKNOWN_MONTH."""
+        months = contract_months(contracts_df)
+        person_ids = contracts_df['PERSON_ID'].to_numpy()
+        persons = persons_df.drop_duplicates('PERSON_ID').set_index('PERSON_ID')
+        
+        cells = {"MONTH": months, "CLUB_ID": contracts_df['CLUB_ID'].to_numpy(dtype=np.int64)}
+        labels = {}
+        for column in CUBE_LABELS:
+            values = pd.Series(person_ids).map(persons[column].astype(object))
+            codes, uniques = pd.factorize(values.astype(object).fillna('Unknown'), sort=True)
+            cells[column] = codes.astype(np.int32)
+            labels[column] = [str(label) for label in uniques]
+        cells['CONTRACTS'] = np.ones(len(person_ids), dtype=np.int64)
+        values = pd.to_numeric(contracts_df['CONTRACT_VALUE'], errors='coerce').to_numpy(dtype=np.float64)
+        cells['CONTRACT_VALUE'] = np.nan_to_num(values)
+        
+        registers, ranks = sketch_entries(person_ids)
+        sketch = {"CELL": np.arange(len(person_ids), dtype=np.int64), "REGISTER": registers, "RANK": ranks}
+        return cls.aggregate(cells, labels, sketch)
+    
+    def merge(self, other: 'ContractCube') -> 'ContractCube':
+        """New cube combining this one with another (e.g. built from newly ingested contracts)"""
+        labels = {column: sorted(set(self.labels[column]) | set(other.labels[column])) for column in CUBE_LABELS}
+        parts = []
+        for cube in (self, other):
+            cells = dict(cube.cells)
+            for column in CUBE_LABELS:
+                code_of = {label: code for code, label in enumerate(labels[column])}
+                recode = np.array([code_of[label] for label in cube.labels[column]], dtype=np.int32)
+                cells[column] = recode[cube.cells[column]] if len(recode) else cube.cells[column]
+            parts.append(cells)
+        cells = {column: np.concatenate([part[column] for part in parts]) for column in parts[0]}
+        sketch = {column: np.concatenate([self.sketch[column], other.sketch[column]]) for column in self.sketch}
+        sketch['CELL'] = np.concatenate([self.sketch['CELL'], other.sketch['CELL'] + len(self)])
+        return ContractCube.aggregate(cells, labels, sketch)
+    
+    def without(self, months: np.ndarray, club_ids: np.ndarray) -> 'ContractCube':
+        """New cube without the cells of the given (month, club) pairs"""
+        drop = pd.MultiIndex.from_arrays([self.cells['MONTH'], self.cells['CLUB_ID']]).isin(
+            pd.MultiIndex.from_arrays([months, club_ids]))
+        new_cell = np.cumsum(~drop) - 1
+        kept_entries = ~drop[self.sketch['CELL']]
+        sketch = {column: values[kept_entries] for column, values in self.sketch.items()}
+        sketch['CELL'] = new_cell[sketch['CELL']]
+        return ContractCube({column: values[~drop] for column, values in self.cells.items()}, self.labels, sketch)
+    
+    def refresh_persons(self, contracts_df: pd.DataFrame, persons_df: pd.DataFrame, person_ids) -> 'ContractCube':
+        """New cube with every (month, club) cell holding a contract of person_ids rebuilt from
+        contracts_df, e.g. once person rows arrive for contracts rolled up as 'Unknown'. Sketches
+        cannot drop players, so those cells are recomputed from all of their contracts."""
+        affected = contracts_df['PERSON_ID'].isin(person_ids).to_numpy()
+        if not affected.any():
+            return self
+        months = contract_months(contracts_df)
+        club_ids = contracts_df['CLUB_ID'].to_numpy(dtype=np.int64)
+        pairs = pd.MultiIndex.from_arrays([months[affected], club_ids[affected]]).unique()
+        in_pairs = pd.MultiIndex.from_arrays([months, club_ids]).isin(pairs)
+        return self.without(pairs.get_level_values(0).to_numpy(), pairs.get_level_values(1).to_numpy()).merge(
+            ContractCube.from_contracts(contracts_df[in_pairs], persons_df))
+    
+    def rows(self, months: Optional[tuple] = None, dated: bool = False) -> slice:
+        """Cells with a start month in [first, last] (all cells for None; dated leaves out
+        contracts without a start date)"""
+        month = self.cells['MONTH']
+        if months is None:
+            lo = np.searchsorted(month, UNKNOWN_MONTH, 'right') if dated else 0
+            return slice(int(lo), len(month))
+        return slice(int(np.searchsorted(month, months[0], 'left')), int(np.searchsorted(month, months[1], 'right')))
+    
+    def rollup(self, rows: slice, groups: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+        """Contracts, contract value, distinct clubs (exact) and distinct players (merged
+        sketches) per group, for the cells in rows labeled with group codes 0..n_groups - 1"""
+        lo, hi = np.searchsorted(self.sketch['CELL'], [rows.start, rows.stop])
+        entry_groups = groups[self.sketch['CELL'][lo:hi] - rows.start].astype(np.int64)
+        registers = self.sketch['REGISTER'][lo:hi]
+        ranks = self.sketch['RANK'][lo:hi]
+        m = 1 << CUBE_SKETCH_PRECISION
+        if n_groups * m <= CUBE_DENSE_REGISTERS:
+            # One dense register array per group, merged in a single unbuffered max
+            dense = np.zeros((n_groups, m), dtype=np.uint8)
+            np.maximum.at(dense, (entry_groups, registers), ranks)
+            present = np.count_nonzero(dense, axis=1)
+            harmonic = np.ldexp(1.0, -np.arange(64))[dense].sum(axis=1) - (m - present)
+        else:
+            entry_keys = entry_groups << 16 | registers.astype(np.int64)
+            order = np.lexsort((ranks, entry_keys))
+            sorted_entries = entry_keys[order]
+            last = np.ones(len(order), dtype=bool)
+            last[:-1] = sorted_entries[1:] != sorted_entries[:-1]
+            keep = order[last]
+            present = np.bincount(entry_groups[keep], minlength=n_groups)
+            harmonic = np.bincount(entry_groups[keep], weights=np.ldexp(1.0, -ranks[keep].astype(np.int64)),
+                                   minlength=n_groups)
+        return {
+            "contracts": np.bincount(groups, weights=self.cells['CONTRACTS'][rows], minlength=n_groups),
+            "contract_value": np.bincount(groups, weights=self.cells['CONTRACT_VALUE'][rows], minlength=n_groups),
+            "clubs": distinct_per_group(groups, self.cells['CLUB_ID'][rows], n_groups),
+            "players": np.rint(hll_estimate(present, harmonic))
+        }
+
 class SoccerGraphLoader:
     """Loads and caches soccer knowledge graph data from static JSON files"""
     
@@ -32,64 +701,101 @@ class SoccerGraphLoader:
         self.player_graph = None
         self.club_graph = None
         self.match_graph = None
+        self.data_dir = None
+        # JSON source fingerprint this bundle was built from (see source_fingerprint)
+        self.sources = None
+        # Per-table rows, seconds and peak RSS of the last JSON load
+        self.load_stats = {}
+        # Set on bundles produced by ingest: the version they were derived from and the
+        # graph types whose analytics changed
+        self.parent_version = None
+        self.stale_graphs = {'player', 'club'}
+        # Set from graph_versions whenever the graphs are built; keys derived analytics caches
+        self.version = 0
+        # Lookup indexes built once per load (see build_indexes)
+        self.person_names = {}
+        self.club_names = {}
+        self.match_names = {}
+        self.contract_rows = []
+        self.contracts_by_club = None
+        self.contracts_by_player = None
+        # All relationships per edge (see EdgeWeights)
+        self.player_weights = None
+        self.club_weights = None
+        # CSR copies of the graphs when the 'csr' engine is selected (see CSRGraph)
+        self.engine = GRAPH_ENGINE
+        self.player_csr = None
+        self.club_csr = None
+        # graph_type -> {hub node: BFS parent of every reachable node}
+        self.hub_trees = {}
+        # graph_type -> [(relationship, rule, IntervalIndex)] in TEMPORAL_RELATIONSHIPS order
+        self.temporal_indexes = {}
+        # Player contract rollup behind graph_temporal_analysis (see ContractCube)
+        self.contract_cube = None
+    
+    def resolve_data_dir(self, data_dir='/app/graph_data'):
+        """Return the first existing graph data directory, or None"""
+        # Try multiple possible data directory locations
+        possible_dirs = [
+            data_dir,  # Default SPCS path
+            '/app/graph_data',  # Docker container path
+            os.path.join(os.path.dirname(__file__), 'graph_data'),  # Local development path
+            'graph_data'  # Current directory
+        ]
+        
+        for dir_path in possible_dirs:
+            if os.path.exists(dir_path):
+                logger.info(f"Found graph data directory: {dir_path}")
+                return dir_path
+        
+        logger.error(f"Data directory not found in any of: {possible_dirs}")
+        return None
+    
+    def load(self, data_dir='/app/graph_data'):
+        """Load tables and graphs, preferring a fresh binary snapshot over JSON"""
+        if self.load_from_snapshot(data_dir):
+            return True
+        if not self.load_from_static_files(data_dir):
+            return False
+        return self.build_networks()
     
     def load_from_static_files(self, data_dir='/app/graph_data'):
         """Load graph data from static JSON files"""
         try:
             logger.info(f"Loading graph data from static files in {data_dir}")
             
-            # Try multiple possible data directory locations
-            possible_dirs = [
-                data_dir,  # Default SPCS path
-                '/app/graph_data',  # Docker container path
-                os.path.join(os.path.dirname(__file__), 'graph_data'),  # Local development path
-                'graph_data'  # Current directory
-            ]
-            
-            data_dir_found = None
-            for dir_path in possible_dirs:
-                if os.path.exists(dir_path):
-                    data_dir_found = dir_path
-                    logger.info(f"Found graph data directory: {dir_path}")
-                    break
-            
+            data_dir_found = self.resolve_data_dir(data_dir)
             if not data_dir_found:
-                logger.error(f"Data directory not found in any of: {possible_dirs}")
                 return False
+            self.sources = self.source_fingerprint(data_dir_found)
             
-            # Load all JSON files
-            tables = {
-                'persons': 'persons.json',
-                'clubs': 'clubs.json',
-                'matches': 'matches.json',
-                'player_contracts': 'player_contracts.json',
-                'coach_contracts': 'coach_contracts.json',
-                'match_appearances': 'match_appearances.json'
-            }
-            
+            # Stream each JSON (array or newline-delimited) file into typed columns
             self.graph_data = {}
+            self.load_stats = {}
             
-            for table_name, filename in tables.items():
-                filepath = os.path.join(data_dir_found, filename)
+            for table_name in GRAPH_DATA_FILES:
+                filepath = table_file(data_dir_found, table_name)
                 if not os.path.exists(filepath):
                     logger.error(f"Data file not found: {filepath}")
                     return False
                 
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                
-                # Convert to DataFrame
-                df = pd.DataFrame(data)
-                
-                # Convert date columns back to datetime
-                date_columns = ['DATE_OF_BIRTH', 'START_DATE', 'END_DATE', 'MATCH_DATE', 'CREATED_AT']
-                for col in date_columns:
-                    if col in df.columns:
-                        df[col] = pd.to_datetime(df[col], errors='coerce')
+                # Peak RSS is reset per table where the kernel allows it, so it covers this table's load
+                reset_peak_rss()
+                start = time.perf_counter()
+                df = records_to_table(iter_json_records(filepath), table_name)
                 
                 self.graph_data[table_name] = df
-                logger.info(f"Loaded {len(df)} rows from {filename}")
+                self.load_stats[table_name] = {
+                    "rows": len(df),
+                    "seconds": round(time.perf_counter() - start, 3),
+                    "peak_rss_mb": round(peak_rss_bytes() / 2 ** 20, 1),
+                    "memory_mb": table_memory_mb(df)
+                }
+                logger.info(f"Loaded {len(df)} rows from {os.path.basename(filepath)} "
+                            f"({self.load_stats[table_name]['memory_mb']} MB in memory, "
+                            f"peak RSS {self.load_stats[table_name]['peak_rss_mb']} MB)")
             
+            self.data_dir = data_dir_found
             logger.info("✅ Successfully loaded all graph data from static files")
             return True
             
@@ -97,124 +803,2337 @@ class SoccerGraphLoader:
             logger.error(f"Failed to load graph data from static files: {e}")
             return False
     
-    def build_networks(self):
-        """Build NetworkX graphs from loaded data"""
-        try:
-            # Build player network
-            self.player_graph = nx.Graph()
-            persons_df = self.graph_data['persons']
-            player_contracts_df = self.graph_data['player_contracts']
-            match_appearances_df = self.graph_data['match_appearances']
-            
-            # Add player nodes
-            for _, person in persons_df[persons_df['ROLE'] == 'PLAYER'].iterrows():
-                self.player_graph.add_node(
-                    person['PERSON_ID'],
-                    name=person['NAME'],
-                    nationality=person['NATIONALITY'],
-                    position=person['POSITION']
-                )
-            
-            # Add teammate edges (same club)
-            for _, contract in player_contracts_df.iterrows():
-                club_id = contract['CLUB_ID']
-                player_id = contract['PERSON_ID']
-                
-                # Find other players in same club
-                other_contracts = player_contracts_df[
-                    (player_contracts_df['CLUB_ID'] == club_id) & 
-                    (player_contracts_df['PERSON_ID'] != player_id)
-                ]
-                
-                for _, other_contract in other_contracts.iterrows():
-                    other_player_id = other_contract['PERSON_ID']
-                    if not self.player_graph.has_edge(player_id, other_player_id):
-                        self.player_graph.add_edge(player_id, other_player_id, 
-                                                 relationship='teammate', club_id=club_id)
-            
-            # Add match co-participation edges
-            for _, appearance in match_appearances_df.iterrows():
-                match_id = appearance['MATCH_ID']
-                player_id = appearance['PERSON_ID']
-                
-                # Find other players in same match
-                other_appearances = match_appearances_df[
-                    (match_appearances_df['MATCH_ID'] == match_id) & 
-                    (match_appearances_df['PERSON_ID'] != player_id)
-                ]
-                
-                for _, other_appearance in other_appearances.iterrows():
-                    other_player_id = other_appearance['PERSON_ID']
-                    if not self.player_graph.has_edge(player_id, other_player_id):
-                        self.player_graph.add_edge(player_id, other_player_id, 
-                                                 relationship='match_co_participation', match_id=match_id)
-            
-            # Build club network
-            self.club_graph = nx.Graph()
-            clubs_df = self.graph_data['clubs']
-            matches_df = self.graph_data['matches']
-            
-            # Add club nodes
-            for _, club in clubs_df.iterrows():
-                self.club_graph.add_node(
-                    club['CLUB_ID'],
-                    name=club['CLUB_NAME'],
-                    country=club['COUNTRY'],
-                    founded_year=club['FOUNDED_YEAR']
-                )
-            
-            # Add match edges between clubs
-            for _, match in matches_df.iterrows():
-                home_club = match['HOME_CLUB_ID']
-                away_club = match['AWAY_CLUB_ID']
-                if not self.club_graph.has_edge(home_club, away_club):
-                    self.club_graph.add_edge(home_club, away_club, 
-                                          relationship='match', match_id=match['MATCH_ID'])
-            
-            # Add transfer edges between clubs
-            for _, contract in player_contracts_df.iterrows():
-                club_id = contract['CLUB_ID']
-                player_id = contract['PERSON_ID']
-                
-                # Find other clubs this player has been at
-                other_contracts = player_contracts_df[
-                    (player_contracts_df['PERSON_ID'] == player_id) & 
-                    (player_contracts_df['CLUB_ID'] != club_id)
-                ]
-                
-                for _, other_contract in other_contracts.iterrows():
-                    other_club_id = other_contract['CLUB_ID']
-                    if not self.club_graph.has_edge(club_id, other_club_id):
-                        self.club_graph.add_edge(club_id, other_club_id, 
-                                               relationship='transfer', player_id=player_id)
-            
-            logger.info(f"Built player network with {self.player_graph.number_of_nodes()} nodes and {self.player_graph.number_of_edges()} edges")
-            logger.info(f"Built club network with {self.club_graph.number_of_nodes()} nodes and {self.club_graph.number_of_edges()} edges")
-            
-            return True
-        except Exception as e:
-            logger.error(f"Failed to build networks: {e}")
-            return False
+    def source_fingerprint(self, data_dir):
+        """Size and modification time of each JSON source, used to detect stale snapshots"""
+        fingerprint = {}
+        for table_name in GRAPH_DATA_FILES:
+            filepath = table_file(data_dir, table_name)
+            stat = os.stat(filepath)
+            fingerprint[os.path.basename(filepath)] = [stat.st_size, int(stat.st_mtime)]
+        return fingerprint
+    
+    def save_snapshot(self):
+        """Write loaded tables (Arrow IPC) and graphs (CSR arrays) to the snapshot directory"""
+        try:
+            snapshot_dir = os.path.join(self.data_dir, SNAPSHOT_DIRNAME)
+            os.makedirs(snapshot_dir, exist_ok=True)
+            
+            # Invalidate any previous snapshot before overwriting its files
+            manifest_path = os.path.join(snapshot_dir, 'manifest.json')
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+            
+            for table_name, df in self.graph_data.items():
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                with pa.OSFile(os.path.join(snapshot_dir, f"{table_name}.arrow"), 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+            
+            for graph_name in SNAPSHOT_GRAPHS:
+                for array_name, values in graph_to_csr(getattr(self, graph_name)).items():
+                    np.save(os.path.join(snapshot_dir, f"{graph_name}.{array_name}.npy"), values)
+            
+            for graph_type in WEIGHT_COLUMNS:
+                for column_name, values in getattr(self, f"{graph_type}_weights").columns.items():
+                    np.save(os.path.join(snapshot_dir, f"{graph_type}_weights.{column_name}.npy"), values)
+            
+            manifest = {
+                "format_version": SNAPSHOT_FORMAT_VERSION,
+                "sources": self.source_fingerprint(self.data_dir),
+                "weight_columns": {
+                    graph_type: list(getattr(self, f"{graph_type}_weights").columns)
+                    for graph_type in WEIGHT_COLUMNS
+                }
+            }
+            with open(manifest_path + '.tmp', 'w') as f:
+                json.dump(manifest, f)
+            os.replace(manifest_path + '.tmp', manifest_path)
+            
+            logger.info(f"✅ Wrote graph snapshot to {snapshot_dir}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write graph snapshot: {e}")
+            return False
+    
+    def load_from_snapshot(self, data_dir='/app/graph_data'):
+        """Memory-map tables and graphs from a binary snapshot if it matches the JSON sources"""
+        try:
+            data_dir_found = self.resolve_data_dir(data_dir)
+            if not data_dir_found:
+                return False
+            
+            snapshot_dir = os.path.join(data_dir_found, SNAPSHOT_DIRNAME)
+            manifest_path = os.path.join(snapshot_dir, 'manifest.json')
+            if not os.path.exists(manifest_path):
+                logger.info("No graph snapshot found, loading from JSON")
+                return False
+            
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if (manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION or
+                    manifest.get('sources') != self.source_fingerprint(data_dir_found)):
+                logger.info("Graph snapshot is stale, loading from JSON")
+                return False
+            
+            graph_data = {}
+            for table_name in GRAPH_DATA_FILES:
+                with pa.memory_map(os.path.join(snapshot_dir, f"{table_name}.arrow"), 'r') as source:
+                    graph_data[table_name] = apply_schema(pa.ipc.open_file(source).read_all().to_pandas(), table_name)
+                logger.info(f"Loaded {len(graph_data[table_name])} rows of {table_name} from snapshot "
+                            f"({table_memory_mb(graph_data[table_name])} MB in memory)")
+            
+            def load_arrays(graph_name):
+                return {
+                    array_name: np.load(os.path.join(snapshot_dir, f"{graph_name}.{array_name}.npy"), mmap_mode='r')
+                    for array_name in CSR_ARRAYS
+                }
+            
+            player_graph = csr_to_graph(load_arrays('player_graph'), dict(player_nodes(graph_data['persons'])))
+            club_graph = csr_to_graph(load_arrays('club_graph'), dict(club_nodes(graph_data['clubs'])))
+            
+            self.graph_data = graph_data
+            self.player_graph = player_graph
+            self.club_graph = club_graph
+            self.data_dir = data_dir_found
+            self.sources = manifest['sources']
+            for graph_type, count_columns in WEIGHT_COLUMNS.items():
+                setattr(self, f"{graph_type}_weights", EdgeWeights({
+                    column_name: np.load(os.path.join(snapshot_dir, f"{graph_type}_weights.{column_name}.npy"),
+                                         mmap_mode='r')
+                    for column_name in manifest['weight_columns'][graph_type]
+                }, count_columns))
+            self.build_indexes()
+            self.build_contract_cube()
+            self.build_engine()
+            self.version = next(graph_versions)
+            
+            logger.info(f"Built player network with {self.player_graph.number_of_nodes()} nodes and {self.player_graph.number_of_edges()} edges")
+            logger.info(f"Built club network with {self.club_graph.number_of_nodes()} nodes and {self.club_graph.number_of_edges()} edges")
+            logger.info("✅ Successfully loaded graph data from snapshot")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to load graph snapshot, falling back to JSON: {e}")
+            return False
+    
+    def copy(self):
+        """Copy whose tables and graphs can be changed (e.g. by ingest) without touching this bundle"""
+        clone = copy.copy(self)
+        # DataFrames are replaced on ingest, never mutated, so a new dict is enough
+        clone.graph_data = dict(self.graph_data)
+        clone.player_graph = self.player_graph.copy()
+        clone.club_graph = self.club_graph.copy()
+        return clone
+    
+    def ingest(self, new_rows: Dict[str, Any]) -> set:
+        """Append rows to the loaded tables and update only the affected nodes and edges.
+        
+        The resulting graphs match a full build_networks over the appended tables. Pairs
+        are recomputed only for members (players or clubs) that gained rows, over every
+        bucket (club, match or player) those members appear in.
+        
+        Args:
+            new_rows: Table name -> list of records (JSON shape) or DataFrame to append
+        
+        Returns:
+            Graph types ('player', 'club') whose analytics are now stale
+        """
+        first_new_row = {}
+        for table_name, rows in new_rows.items():
+            if table_name not in GRAPH_DATA_FILES:
+                raise ValueError(f"Unknown table: {table_name}")
+            df = apply_schema(rows, table_name) if isinstance(rows, pd.DataFrame) else records_to_table(rows, table_name)
+            if df.empty:
+                continue
+            first_new_row[table_name] = len(self.graph_data[table_name])
+            self.graph_data[table_name] = append_table(self.graph_data[table_name], df, table_name)
+        
+        stale = set()
+        if 'persons' in first_new_row:
+            persons_df = self.graph_data['persons']
+            new_persons = persons_df.iloc[first_new_row['persons']:]
+            players = player_nodes(new_persons)
+            self.player_graph.add_nodes_from(players)
+            if players:
+                stale.add('player')
+            # Earlier contracts of persons seen for the first time were rolled up as 'Unknown'
+            known = persons_df['PERSON_ID'].iloc[:first_new_row['persons']]
+            arrived = new_persons['PERSON_ID'][~new_persons['PERSON_ID'].isin(known)]
+            earlier_contracts = self.graph_data['player_contracts'].iloc[
+                :first_new_row.get('player_contracts', len(self.graph_data['player_contracts']))]
+            self.contract_cube = self.contract_cube.refresh_persons(earlier_contracts, persons_df, arrived)
+        
+        if 'clubs' in first_new_row:
+            self.club_graph.add_nodes_from(club_nodes(self.graph_data['clubs'].iloc[first_new_row['clubs']:]))
+            stale.add('club')
+        
+        if 'player_contracts' in first_new_row:
+            contracts_df = self.graph_data['player_contracts']
+            start = first_new_row['player_contracts']
+            # Teammate edges outrank co-participation edges, so they may replace them
+            refresh_pair_edges(self.player_graph, contracts_df, 'CLUB_ID', 'PERSON_ID', start,
+                               'teammate', outranked_by=())
+            refresh_pair_edges(self.club_graph, contracts_df, 'PERSON_ID', 'CLUB_ID', start,
+                               'transfer', outranked_by=('match',))
+            # Only the new contracts are rolled up; the cube is replaced, not changed
+            self.contract_cube = self.contract_cube.merge(
+                ContractCube.from_contracts(contracts_df.iloc[start:], self.graph_data['persons']))
+            stale.update(['player', 'club'])
+        
+        if 'match_appearances' in first_new_row:
+            refresh_pair_edges(self.player_graph, self.graph_data['match_appearances'], 'MATCH_ID', 'PERSON_ID',
+                               first_new_row['match_appearances'], 'match_co_participation',
+                               outranked_by=('teammate',))
+            stale.add('player')
+        
+        if 'matches' in first_new_row:
+            matches_df = self.graph_data['matches']
+            home_col = 'HOME_CLUB_ID' if 'HOME_CLUB_ID' in matches_df.columns else 'HOME_TEAM_ID'
+            away_col = 'AWAY_CLUB_ID' if 'AWAY_CLUB_ID' in matches_df.columns else 'AWAY_TEAM_ID'
+            new_matches = matches_df.iloc[first_new_row['matches']:]
+            for home_club, away_club, match_id in zip(new_matches[home_col].tolist(),
+                                                      new_matches[away_col].tolist(),
+                                                      new_matches['MATCH_ID'].tolist()):
+                # Earlier matches win; match edges replace transfer edges
+                if self.club_graph.has_edge(home_club, away_club):
+                    data = self.club_graph.edges[home_club, away_club]
+                    if data.get('relationship') == 'match':
+                        continue
+                    data.clear()
+                self.club_graph.add_edge(home_club, away_club, relationship='match', match_id=match_id)
+            stale.add('club')
+            # Appearances in matches seen for the first time now have a date, which moves their
+            # snapshot intervals and shared_matches date spans
+            known = matches_df['MATCH_ID'].iloc[:first_new_row['matches']]
+            arrived = new_matches['MATCH_ID'][~new_matches['MATCH_ID'].isin(known)]
+            if self.graph_data['match_appearances']['MATCH_ID'].isin(arrived).any():
+                stale.add('player')
+        
+        # Totals are recounted in full: appended rows can add to any existing pair
+        self.build_edge_weights(stale)
+        self.build_indexes()
+        self.build_engine()
+        self.version = next(graph_versions)
+        logger.info(f"Ingested {', '.join(f'{len(new_rows[t])} {t}' for t in first_new_row)}; stale graphs: {sorted(stale)}")
+        return stale
+    
+    def build_engine(self):
+        """Build traversal structures: CSR adjacency for the 'csr' engine and BFS trees from hub nodes"""
+        if self.engine == 'csr':
+            self.player_csr = CSRGraph.from_graph(self.player_graph)
+            self.club_csr = CSRGraph.from_graph(self.club_graph)
+        else:
+            self.player_csr = self.club_csr = None
+        
+        self.hub_trees = {}
+        for graph_type, graph in [('player', self.player_graph), ('club', self.club_graph)]:
+            hubs = sorted(graph.degree, key=lambda item: item[1], reverse=True)[:PATH_HUB_COUNT]
+            self.hub_trees[graph_type] = {hub: bfs_parents(graph, hub) for hub, _ in hubs}
+    
+    def build_indexes(self):
+        """Build immutable ID->name and contract lookup indexes from the loaded tables"""
+        persons_df = self.graph_data['persons'].drop_duplicates('PERSON_ID')
+        clubs_df = self.graph_data['clubs'].drop_duplicates('CLUB_ID')
+        matches_df = self.graph_data['matches'].drop_duplicates('MATCH_ID')
+        contracts_df = self.graph_data['player_contracts']
+        
+        self.person_names = dict(zip(persons_df['PERSON_ID'].tolist(), persons_df['NAME'].tolist()))
+        self.club_names = dict(zip(clubs_df['CLUB_ID'].tolist(), clubs_df['CLUB_NAME'].tolist()))
+        if 'MATCH_NAME' in matches_df.columns:
+            self.match_names = dict(zip(matches_df['MATCH_ID'].tolist(), matches_df['MATCH_NAME'].tolist()))
+        
+        # One pre-formatted (person_id, club_id, start_date, end_date, contract_value) row per contract
+        start_dates = pd.to_datetime(contracts_df['START_DATE'], errors='coerce')
+        end_dates = pd.to_datetime(contracts_df['END_DATE'], errors='coerce')
+        self.contract_rows = list(zip(
+            contracts_df['PERSON_ID'].tolist(),
+            contracts_df['CLUB_ID'].tolist(),
+            [str(d) if pd.notna(d) else None for d in start_dates],
+            [str(d) if pd.notna(d) else None for d in end_dates],
+            [float(v) if pd.notna(v) else 0.0 for v in contracts_df['CONTRACT_VALUE'].tolist()]
+        ))
+        self.contracts_by_club = ContractIndex(contracts_df['CLUB_ID'], start_dates)
+        self.contracts_by_player = ContractIndex(contracts_df['PERSON_ID'], start_dates)
+        self.build_temporal_indexes()
+    
+    def build_contract_cube(self):
+        """Roll up all player contracts (see ContractCube); ingest merges new contracts into it"""
+        self.contract_cube = ContractCube.from_contracts(self.graph_data['player_contracts'],
+                                                         self.graph_data['persons'])
+    
+    def build_temporal_indexes(self):
+        """Interval indexes behind time-windowed snapshot graphs (see temporal_snapshot).
+        
+        Contracts without an end date are open-ended; appearances and matches hold for
+        the match date only and are left out when it is unknown.
+        """
+        contracts_df = self.graph_data['player_contracts']
+        contract_start = date_ns(contracts_df['START_DATE'], np.iinfo(np.int64).min)
+        contract_end = date_ns(contracts_df['END_DATE'], np.iinfo(np.int64).max)
+        matches_df = self.graph_data['matches']
+        dates = match_dates(matches_df)
+        appearances_df = self.graph_data['match_appearances']
+        appearance_dates = date_ns(appearances_df['MATCH_ID'].map(dates), np.iinfo(np.int64).min)
+        home_col = 'HOME_CLUB_ID' if 'HOME_CLUB_ID' in matches_df.columns else 'HOME_TEAM_ID'
+        away_col = 'AWAY_CLUB_ID' if 'AWAY_CLUB_ID' in matches_df.columns else 'AWAY_TEAM_ID'
+        fixture_dates = date_ns(matches_df['MATCH_ID'].map(dates), np.iinfo(np.int64).min)
+        dated = appearance_dates != np.iinfo(np.int64).min
+        fixtures_dated = fixture_dates != np.iinfo(np.int64).min
+        
+        indexes = {
+            'teammate': IntervalIndex(contracts_df['CLUB_ID'].to_numpy(), contracts_df['PERSON_ID'].to_numpy(),
+                                      contract_start, contract_end),
+            'match_co_participation': IntervalIndex(
+                appearances_df['MATCH_ID'].to_numpy()[dated], appearances_df['PERSON_ID'].to_numpy()[dated],
+                appearance_dates[dated], appearance_dates[dated]),
+            # One row per side of every match
+            'match': IntervalIndex(
+                np.tile(matches_df['MATCH_ID'].to_numpy()[fixtures_dated], 2),
+                np.concatenate([matches_df[home_col].to_numpy()[fixtures_dated],
+                                matches_df[away_col].to_numpy()[fixtures_dated]]),
+                np.tile(fixture_dates[fixtures_dated], 2), np.tile(fixture_dates[fixtures_dated], 2)),
+            'transfer': IntervalIndex(contracts_df['PERSON_ID'].to_numpy(), contracts_df['CLUB_ID'].to_numpy(),
+                                      contract_start, contract_end)
+        }
+        self.temporal_indexes = {
+            graph_type: [(relationship, rule, indexes[relationship]) for relationship, rule in relationships]
+            for graph_type, relationships in TEMPORAL_RELATIONSHIPS.items()
+        }
+    
+    def build_edge_weights(self, graph_types=('player', 'club')):
+        """Count every shared club, match and player per node pair, with the dates they span"""
+        contracts_df = self.graph_data['player_contracts']
+        contract_start = date_ns(contracts_df['START_DATE'], np.iinfo(np.int64).max)
+        contract_end = date_ns(contracts_df['END_DATE'], np.iinfo(np.int64).min)
+        matches_df = self.graph_data['matches']
+        dates = match_dates(matches_df)
+        
+        if 'player' in graph_types:
+            appearances_df = self.graph_data['match_appearances']
+            appearance_dates = appearances_df['MATCH_ID'].map(dates)
+            self.player_weights = EdgeWeights.from_pair_totals({
+                # Teammates: span of the overlap of the two contracts at each shared club
+                'shared_clubs': bucket_pair_totals(contracts_df, 'CLUB_ID', 'PERSON_ID',
+                                                   contract_start, contract_end, 'overlap'),
+                'shared_matches': bucket_pair_totals(
+                    appearances_df, 'MATCH_ID', 'PERSON_ID',
+                    date_ns(appearance_dates, np.iinfo(np.int64).max),
+                    date_ns(appearance_dates, np.iinfo(np.int64).min), 'overlap')
+            })
+        
+        if 'club' in graph_types:
+            home_col = 'HOME_CLUB_ID' if 'HOME_CLUB_ID' in matches_df.columns else 'HOME_TEAM_ID'
+            away_col = 'AWAY_CLUB_ID' if 'AWAY_CLUB_ID' in matches_df.columns else 'AWAY_TEAM_ID'
+            fixtures = matches_df[[home_col, away_col, 'MATCH_ID']].dropna(subset=[home_col, away_col])
+            fixture_dates = fixtures['MATCH_ID'].map(dates)
+            self.club_weights = EdgeWeights.from_pair_totals({
+                'matches_played': (
+                    fixtures[home_col].to_numpy(dtype=np.int64),
+                    fixtures[away_col].to_numpy(dtype=np.int64),
+                    np.ones(len(fixtures), dtype=np.int32),
+                    date_ns(fixture_dates, np.iinfo(np.int64).max),
+                    date_ns(fixture_dates, np.iinfo(np.int64).min)
+                ),
+                # Transfers: from the earlier to the later contract start of the shared player
+                'shared_players': bucket_pair_totals(contracts_df, 'PERSON_ID', 'CLUB_ID',
+                                                     contract_start, np.where(contract_start == np.iinfo(np.int64).max,
+                                                                              np.iinfo(np.int64).min, contract_start),
+                                                     'range')
+            })
+    
+    def build_networks(self):
+        """Build NetworkX graphs from loaded data"""
+        try:
+            # Build player network
+            self.player_graph = nx.Graph()
+            persons_df = self.graph_data['persons']
+            player_contracts_df = self.graph_data['player_contracts']
+            match_appearances_df = self.graph_data['match_appearances']
+            
+            # Add player nodes
+            self.player_graph.add_nodes_from(player_nodes(persons_df))
+            
+            # Add teammate edges (same club)
+            teammates = shared_bucket_pairs(player_contracts_df, 'CLUB_ID', 'PERSON_ID')
+            self.player_graph.add_edges_from(
+                (player_id, other_player_id, {'relationship': 'teammate', 'club_id': club_id})
+                for player_id, other_player_id, club_id in teammates
+            )
+            
+            # Add match co-participation edges (teammate edges take precedence)
+            co_participants = shared_bucket_pairs(match_appearances_df, 'MATCH_ID', 'PERSON_ID')
+            self.player_graph.add_edges_from(
+                (player_id, other_player_id, {'relationship': 'match_co_participation', 'match_id': match_id})
+                for player_id, other_player_id, match_id in co_participants
+                if not self.player_graph.has_edge(player_id, other_player_id)
+            )
+            
+            # Build club network
+            self.club_graph = nx.Graph()
+            clubs_df = self.graph_data['clubs']
+            matches_df = self.graph_data['matches']
+            
+            # Add club nodes
+            self.club_graph.add_nodes_from(club_nodes(clubs_df))
+            
+            # Add match edges between clubs (first match per club pair wins)
+            home_col = 'HOME_CLUB_ID' if 'HOME_CLUB_ID' in matches_df.columns else 'HOME_TEAM_ID'
+            away_col = 'AWAY_CLUB_ID' if 'AWAY_CLUB_ID' in matches_df.columns else 'AWAY_TEAM_ID'
+            fixtures = matches_df[[home_col, away_col, 'MATCH_ID']]
+            fixture_keys = pd.DataFrame({
+                'low': fixtures[[home_col, away_col]].min(axis=1),
+                'high': fixtures[[home_col, away_col]].max(axis=1)
+            })
+            fixtures = fixtures[~fixture_keys.duplicated()]
+            self.club_graph.add_edges_from(
+                (home_club, away_club, {'relationship': 'match', 'match_id': match_id})
+                for home_club, away_club, match_id in zip(
+                    fixtures[home_col].tolist(),
+                    fixtures[away_col].tolist(),
+                    fixtures['MATCH_ID'].tolist()
+                )
+            )
+            
+            # Add transfer edges between clubs (clubs that share a player)
+            transfers = shared_bucket_pairs(player_contracts_df, 'PERSON_ID', 'CLUB_ID')
+            self.club_graph.add_edges_from(
+                (club_id, other_club_id, {'relationship': 'transfer', 'player_id': player_id})
+                for club_id, other_club_id, player_id in transfers
+                if not self.club_graph.has_edge(club_id, other_club_id)
+            )
+            
+            logger.info(f"Built player network with {self.player_graph.number_of_nodes()} nodes and {self.player_graph.number_of_edges()} edges")
+            logger.info(f"Built club network with {self.club_graph.number_of_nodes()} nodes and {self.club_graph.number_of_edges()} edges")
+            
+            self.build_edge_weights()
+            self.build_indexes()
+            self.build_contract_cube()
+            self.build_engine()
+            self.version = next(graph_versions)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to build networks: {e}")
+            return False
+
+def table_file(data_dir: str, table_name: str) -> str:
+    """Path of a table's source file: a newline-delimited variant if present, else the JSON file"""
+    stem = os.path.splitext(GRAPH_DATA_FILES[table_name])[0]
+    for extension in NDJSON_EXTENSIONS:
+        path = os.path.join(data_dir, stem + extension)
+        if os.path.exists(path):
+            return path
+    return os.path.join(data_dir, GRAPH_DATA_FILES[table_name])
+
+def iter_json_records(path: str):
+    """Yield records one at a time from a JSON array file or a newline-delimited JSON file.
+    
+    Arrays are decoded object by object from a sliding buffer, so memory stays at about
+    one read chunk plus the record being decoded, whatever the file size.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(JSON_READ_CHUNK)
+        stripped = buffer.lstrip()
+        if not stripped.startswith('['):
+            # Newline-delimited: one record per non-blank line
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield decoder.decode(line)
+            return
+        
+        buffer = stripped[1:]
+        position = 0
+        eof = False
+        while True:
+            # Skip separators between records
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) and buffer[position] == ']':
+                return
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+                yield record
+                continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # Record cut off at the end of the buffer: keep the tail and read more
+            chunk = f.read(JSON_READ_CHUNK)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+class ColumnBuilder:
+    """Accumulates one column's values in typed buffers while records stream in.
+    
+    Integers and floats go into array.array buffers, strings into a value -> code
+    dictionary plus int32 codes, so no per-row Python objects are kept. A column is
+    widened when a value does not fit (int -> float on a null or float, anything ->
+    object on mixed types), matching what pd.DataFrame would infer.
+    """
+    
+    def __init__(self, name: str, leading_nulls: int = 0):
+        self.name = name
+        self.kind = None
+        self.leading_nulls = leading_nulls
+        self.values = None
+        self.codes = None
+    
+    def widen(self, kind: str):
+        """Convert the buffered values to a wider kind"""
+        if kind == 'float':
+            self.values = array.array('d', self.values) if self.values is not None else array.array('d')
+        else:
+            self.values = self.to_list()
+            self.codes = None
+        self.kind = kind
+    
+    def to_list(self) -> list:
+        if self.kind == 'string':
+            categories = list(self.values)
+            return [categories[code] if code >= 0 else None for code in self.codes]
+        if self.kind in ('int', 'float'):
+            return list(self.values)
+        return list(self.values or [])
+    
+    def append(self, value):
+        kind = self.kind
+        if kind is None:
+            if value is None:
+                self.leading_nulls += 1
+                return
+            # First value decides the kind; earlier rows were null
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                self.kind, self.values = 'object', [None] * self.leading_nulls
+            elif isinstance(value, int):
+                if self.leading_nulls:
+                    self.kind, self.values = 'float', array.array('d', [math.nan] * self.leading_nulls)
+                else:
+                    self.kind, self.values = 'int', array.array('q')
+            elif isinstance(value, float):
+                self.kind, self.values = 'float', array.array('d', [math.nan] * self.leading_nulls)
+            else:
+                self.kind, self.values = 'string', {}
+                self.codes = array.array('i', [-1] * self.leading_nulls)
+            kind = self.kind
+        
+        if kind == 'int':
+            if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+                self.values.append(value)
+                return
+            self.widen('float' if value is None or type(value) is float else 'object')
+            kind = self.kind
+        if kind == 'float':
+            if value is None:
+                self.values.append(math.nan)
+                return
+            if type(value) in (int, float):
+                self.values.append(value)
+                return
+            self.widen('object')
+        elif kind == 'string':
+            if value is None:
+                self.codes.append(-1)
+                return
+            if type(value) is str:
+                code = self.values.get(value)
+                if code is None:
+                    code = self.values[value] = len(self.values)
+                self.codes.append(code)
+                return
+            self.widen('object')
+        self.values.append(value)
+    
+    def extend(self, values: list):
+        """Append a batch of values, in bulk while they all fit the current kind"""
+        start = 0
+        while self.kind is None and start < len(values):
+            self.append(values[start])
+            start += 1
+        values = values[start:]
+        if self.kind in ('int', 'float'):
+            size = len(self.values)
+            try:
+                self.values.extend(values)
+                return
+            except (TypeError, OverflowError):
+                # A null, float or string in the batch: undo and widen value by value
+                del self.values[size:]
+        elif self.kind == 'string':
+            codes, uniques = pd.factorize(np.array(values, dtype=object))
+            if all(type(value) is str for value in uniques):
+                lookup = self.values
+                mapping = np.array([lookup.setdefault(value, len(lookup)) for value in uniques] + [-1], dtype=np.int32)
+                self.codes.frombytes(mapping[codes].tobytes())
+                return
+        for value in values:
+            self.append(value)
+    
+    def finish(self):
+        """The column as a NumPy array or pandas Categorical/Series"""
+        if self.kind is None:
+            return np.full(self.leading_nulls, None, dtype=object)
+        if self.kind == 'int':
+            values = np.frombuffer(self.values, dtype=np.int64)
+            # IDs fit in 32 bits; other integer columns keep pandas' int64
+            if self.name.endswith('_ID') and (len(values) == 0 or (values.min() >= -2 ** 31 and values.max() < 2 ** 31)):
+                values = values.astype(np.int32)
+            return values
+        if self.kind == 'float':
+            return np.frombuffer(self.values, dtype=np.float64)
+        if self.kind == 'string':
+            codes = np.frombuffer(self.codes, dtype=np.int32)
+            categories = list(self.values)
+            if self.name in DATE_COLUMNS:
+                # Parse each distinct date string once
+                dates = pd.to_datetime(pd.Index(categories, dtype=object), errors='coerce').to_numpy(dtype='datetime64[ns]')
+                return np.where(codes >= 0, dates[np.maximum(codes, 0)] if len(dates) else np.datetime64('NaT'),
+                                np.datetime64('NaT'))
+            if len(categories) * 2 <= len(codes):
+                return pd.Categorical.from_codes(codes, categories)
+            # Mostly-unique strings: an object array sharing one str per distinct value
+            values = np.array(categories + [None], dtype=object)
+            return values[codes]
+        return np.array(self.values, dtype=object) if self.values else np.zeros(0, dtype=object)
+
+def records_to_table(records, table_name: str = None) -> pd.DataFrame:
+    """DataFrame from an iterable of JSON records, built column by column in typed buffers.
+    
+    Columns appear in first-seen order; records missing a column get a null. IDs are
+    int32, repetitive strings categorical and DATE_COLUMNS datetime64, then the table's
+    TABLE_SCHEMAS dtypes are applied.
+    
+    Args:
+        records: Iterable of dicts
+        table_name: GRAPH_DATA_FILES table the records belong to, if any
+    """
+    builders = {}
+    n_rows = 0
+    batch = []
+    for record in itertools.chain(records, [None]):
+        if record is not None:
+            batch.append(record)
+            if len(batch) < RECORD_BATCH_SIZE:
+                continue
+        for row in batch:
+            for name in row:
+                if name not in builders:
+                    # Rows from earlier batches lack this column
+                    builders[name] = ColumnBuilder(name, leading_nulls=n_rows)
+        for name, builder in builders.items():
+            builder.extend([row.get(name) for row in batch])
+        n_rows += len(batch)
+        batch = []
+    
+    df = pd.DataFrame({name: builder.finish() for name, builder in builders.items()})
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    return apply_schema(df, table_name)
+
+def intern_strings(values) -> list:
+    """Values with every string replaced by its interned copy"""
+    return [sys.intern(value) if type(value) is str else value for value in values]
+
+def cast_column(series: pd.Series, dtype: str) -> pd.Series:
+    """Cast one column to a TABLE_SCHEMAS dtype, leaving it unchanged where the dtype cannot hold it"""
+    if dtype == 'category':
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype('category')
+        if series.cat.categories.dtype == object:
+            series = series.cat.rename_categories(pd.Index(intern_strings(series.cat.categories), dtype=object))
+        return series
+    if dtype == 'str':
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(object)
+        return pd.Series(intern_strings(series.tolist()), index=series.index, dtype=object, name=series.name)
+    if dtype.startswith('datetime64'):
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        return pd.to_datetime(series, errors='coerce')
+    
+    # Narrow integers: only when there are no nulls and every value fits
+    if series.dtype == dtype or not pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series
+    info = np.iinfo(dtype)
+    if len(series) and (series.min() < info.min or series.max() > info.max):
+        return series
+    return series.astype(dtype)
+
+def apply_schema(df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """Table with its columns cast to the dtypes declared in TABLE_SCHEMAS"""
+    schema = TABLE_SCHEMAS.get(table_name)
+    if not schema:
+        return df
+    # Shallow copy so a caller's DataFrame is never modified
+    df = df.copy(deep=False)
+    for col, dtype in schema.items():
+        if col in df.columns:
+            df[col] = cast_column(df[col], dtype)
+    return df
+
+def append_table(df: pd.DataFrame, new_df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """Rows of df followed by new_df (both already through apply_schema).
+    
+    Categorical columns get the union of both category sets first, with new categories
+    appended, so the result stays categorical and existing codes keep their meaning.
+    """
+    df = df.copy(deep=False)
+    new_df = new_df.copy(deep=False)
+    for col, dtype in TABLE_SCHEMAS.get(table_name, {}).items():
+        if dtype != 'category' or col not in df.columns or col not in new_df.columns:
+            continue
+        if not isinstance(df[col].dtype, pd.CategoricalDtype) or not isinstance(new_df[col].dtype, pd.CategoricalDtype):
+            continue
+        existing = df[col].cat.categories
+        categories = existing.append(new_df[col].cat.categories.difference(existing, sort=False))
+        df[col] = df[col].cat.set_categories(categories)
+        new_df[col] = new_df[col].cat.set_categories(categories)
+    return pd.concat([df, new_df], ignore_index=True)
+
+def table_memory_mb(df: pd.DataFrame) -> float:
+    """Memory held by a table, including the strings its object columns point to"""
+    return round(df.memory_usage(deep=True).sum() / 2 ** 20, 3)
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter (Linux) so peak_rss_bytes covers what follows"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process now (Linux; 0 where /proc is unavailable)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process (since the last reset_peak_rss where supported)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def refresh_pair_edges(graph: nx.Graph, df: pd.DataFrame, bucket_col: str, member_col: str,
+                       first_new_row: int, relationship: str, outranked_by: tuple):
+    """Recompute first-seen pair edges for members that have rows at or after first_new_row.
+    
+    Every bucket such a member appears in is rescanned, so each affected pair gets the same
+    bucket a full shared_bucket_pairs pass would give it. Pairs between members without new
+    rows are unchanged and skipped.
+    
+    Args:
+        graph: Graph to update in place
+        df: Full table, including the appended rows
+        bucket_col: Column that groups rows (e.g. CLUB_ID)
+        member_col: Column holding the connected entities (e.g. PERSON_ID)
+        first_new_row: Position of the first appended row
+        relationship: Relationship name for the edges
+        outranked_by: Existing relationships that take precedence and are left alone
+    """
+    context_attr = EDGE_CONTEXT_ATTRIBUTES[relationship]
+    new_members = df[member_col].iloc[first_new_row:].dropna().unique()
+    new_member_set = set(new_members.tolist())
+    affected_buckets = df.loc[df[member_col].isin(new_members), bucket_col].unique()
+    affected_rows = df[df[bucket_col].isin(affected_buckets)]
+    
+    for member, other_member, bucket in shared_bucket_pairs(affected_rows, bucket_col, member_col):
+        if member not in new_member_set and other_member not in new_member_set:
+            continue
+        if graph.has_edge(member, other_member):
+            data = graph.edges[member, other_member]
+            if data.get('relationship') in outranked_by:
+                continue
+            if data.get('relationship') == relationship and data.get(context_attr) == bucket:
+                continue
+            data.clear()
+        graph.add_edge(member, other_member, **{'relationship': relationship, context_attr: bucket})
+
+def player_nodes(persons_df: pd.DataFrame) -> List[tuple]:
+    """(person_id, attributes) for every player node"""
+    players_df = persons_df[persons_df['ROLE'] == 'PLAYER']
+    return [
+        (person_id, {'name': name, 'nationality': nationality, 'position': position})
+        for person_id, name, nationality, position in zip(
+            players_df['PERSON_ID'].tolist(),
+            players_df['NAME'].tolist(),
+            players_df['NATIONALITY'].tolist(),
+            players_df['POSITION'].tolist()
+        )
+    ]
+
+def club_nodes(clubs_df: pd.DataFrame) -> List[tuple]:
+    """(club_id, attributes) for every club node"""
+    return [
+        (club_id, {'name': name, 'country': country, 'founded_year': founded_year})
+        for club_id, name, country, founded_year in zip(
+            clubs_df['CLUB_ID'].tolist(),
+            clubs_df['CLUB_NAME'].tolist(),
+            clubs_df['COUNTRY'].tolist(),
+            clubs_df['FOUNDED_YEAR'].tolist()
+        )
+    ]
+
+# Arrays describing one graph in a snapshot
+CSR_ARRAYS = ['nodes', 'indptr', 'indices', 'relationship', 'context']
+
+def graph_to_csr(graph: nx.Graph) -> Dict[str, np.ndarray]:
+    """Encode a graph as CSR adjacency arrays plus per-entry edge attributes.
+    
+    Row i of the CSR lists the neighbours of nodes[i] in adjacency order; `relationship`
+    indexes EDGE_RELATIONSHIPS and `context` holds that relationship's ID attribute.
+    """
+    nodes = list(graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    indices, relationships, contexts = [], [], []
+    for i, node in enumerate(nodes):
+        for neighbor, attrs in graph.adj[node].items():
+            relationship = attrs.get('relationship')
+            indices.append(index[neighbor])
+            relationships.append(EDGE_RELATIONSHIPS.index(relationship))
+            contexts.append(attrs.get(EDGE_CONTEXT_ATTRIBUTES[relationship]))
+        indptr[i + 1] = len(indices)
+    return {
+        'nodes': np.asarray(nodes, dtype=np.int64),
+        'indptr': indptr,
+        'indices': np.asarray(indices, dtype=np.int32),
+        'relationship': np.asarray(relationships, dtype=np.int8),
+        'context': np.asarray(contexts, dtype=np.int64)
+    }
+
+def csr_to_graph(arrays: Dict[str, np.ndarray], node_attributes: Dict[Any, dict]) -> nx.Graph:
+    """Rebuild a NetworkX graph from arrays produced by graph_to_csr.
+    
+    Each node's adjacency dict is filled in CSR row order, so neighbours come back in the
+    order of the original graph and algorithms that depend on it (BFS, Louvain, tie-breaks)
+    return the same results as on a graph built from JSON.
+    """
+    graph = nx.Graph()
+    nodes = arrays['nodes'].tolist()
+    graph.add_nodes_from((node, node_attributes.get(node, {})) for node in nodes)
+    
+    indptr = np.asarray(arrays['indptr']).tolist()
+    indices = np.asarray(arrays['indices']).tolist()
+    relationships = np.asarray(arrays['relationship']).tolist()
+    contexts = np.asarray(arrays['context']).tolist()
+    adj = graph._adj
+    for row, node in enumerate(nodes):
+        neighbors = adj[node]
+        for entry in range(indptr[row], indptr[row + 1]):
+            col = indices[entry]
+            if col < row:
+                # Each undirected edge appears twice in the CSR; both rows share one attribute dict
+                neighbors[nodes[col]] = adj[nodes[col]][node]
+            else:
+                relationship = EDGE_RELATIONSHIPS[relationships[entry]]
+                neighbors[nodes[col]] = {'relationship': relationship,
+                                         EDGE_CONTEXT_ATTRIBUTES[relationship]: contexts[entry]}
+    return graph
+
+# Upper bound on candidate pairs materialized at once by shared_bucket_pairs
+PAIR_CHUNK_SIZE = 4_000_000
+
+def shared_bucket_pairs(df: pd.DataFrame, bucket_col: str, member_col: str) -> List[tuple]:
+    """Return one (member, other_member, bucket) edge per member pair sharing a bucket.
+    
+    Pairs are generated per bucket with NumPy instead of a per-row scan. Each pair is
+    attributed to the bucket in which it is first seen when walking rows in order, and
+    the result is returned in that discovery order, so graphs built from it match the
+    original row-by-row construction.
+    
+    Args:
+        df: Source table (e.g. player contracts or match appearances)
+        bucket_col: Column that groups rows (e.g. CLUB_ID or MATCH_ID)
+        member_col: Column holding the connected entities (e.g. PERSON_ID)
+    """
+    rows = df[[bucket_col, member_col]].reset_index(drop=True)
+    rows['_pos'] = np.arange(len(rows), dtype=np.int64)
+    rows = rows.dropna().drop_duplicates([bucket_col, member_col])
+    if rows.empty:
+        return []
+    
+    member_codes, members = pd.factorize(rows[member_col])
+    bucket_codes, buckets = pd.factorize(rows[bucket_col])
+    positions = rows['_pos'].to_numpy()
+    
+    # Lay rows out bucket by bucket, earliest row first within each bucket
+    order = np.lexsort((positions, bucket_codes))
+    member_codes = member_codes[order]
+    bucket_codes = bucket_codes[order]
+    positions = positions[order]
+    bucket_sizes = np.bincount(bucket_codes)
+    bucket_starts = np.concatenate(([0], np.cumsum(bucket_sizes)[:-1]))
+    
+    n_members = np.int64(len(members))
+    n_rows = np.int64(len(df))
+    pair_keys, first_seen, lefts, rights = [], [], [], []
+    
+    def keep_first(keys, seen, *columns):
+        # Keep the earliest-seen occurrence of every pair key
+        by_seen = np.argsort(seen, kind='stable')
+        _, first = np.unique(keys[by_seen], return_index=True)
+        keep = by_seen[first]
+        return (keys[keep], seen[keep]) + tuple(column[keep] for column in columns)
+    
+    for size in np.unique(bucket_sizes[bucket_sizes > 1]):
+        starts = bucket_starts[bucket_sizes == size]
+        upper_i, upper_j = np.triu_indices(size, 1)
+        step = max(1, PAIR_CHUNK_SIZE // len(upper_i))
+        for chunk in range(0, len(starts), step):
+            slots = starts[chunk:chunk + step, None] + np.arange(size)
+            left = slots[:, upper_i].ravel()
+            right = slots[:, upper_j].ravel()
+            low = np.minimum(member_codes[left], member_codes[right]).astype(np.int64)
+            high = np.maximum(member_codes[left], member_codes[right]).astype(np.int64)
+            keys, seen, left, right = keep_first(
+                low * n_members + high, positions[left] * n_rows + positions[right], left, right
+            )
+            pair_keys.append(keys)
+            first_seen.append(seen)
+            lefts.append(left)
+            rights.append(right)
+    
+    if not pair_keys:
+        return []
+    
+    _, seen, left, right = keep_first(
+        np.concatenate(pair_keys), np.concatenate(first_seen),
+        np.concatenate(lefts), np.concatenate(rights)
+    )
+    discovery = np.argsort(seen, kind='stable')
+    left = left[discovery]
+    right = right[discovery]
+    return list(zip(
+        members.take(member_codes[left]).tolist(),
+        members.take(member_codes[right]).tolist(),
+        buckets.take(bucket_codes[left]).tolist()
+    ))
+
+def date_ns(dates, missing: int) -> np.ndarray:
+    """Dates as int64 nanoseconds, with `missing` in place of NaT"""
+    values = pd.to_datetime(pd.Series(dates), errors='coerce').to_numpy(dtype='datetime64[ns]').view(np.int64)
+    return np.where(values == np.iinfo(np.int64).min, missing, values)
+
+def match_dates(matches_df: pd.DataFrame) -> pd.Series:
+    """Match date by MATCH_ID (MATCH_DATE, or EVENT_DATE in the static files)"""
+    date_col = 'MATCH_DATE' if 'MATCH_DATE' in matches_df.columns else 'EVENT_DATE'
+    if date_col not in matches_df.columns:
+        return pd.Series(pd.NaT, index=matches_df['MATCH_ID'].drop_duplicates())
+    dates = pd.to_datetime(matches_df[date_col], errors='coerce')
+    return pd.Series(dates.to_numpy(), index=matches_df['MATCH_ID'].to_numpy()).groupby(level=0).first()
+
+def reduce_pair_totals(keys: np.ndarray, counts: np.ndarray, first: np.ndarray, last: np.ndarray) -> tuple:
+    """Sum counts and take the earliest first / latest last date per pair key"""
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return (keys[starts], np.add.reduceat(counts[order], starts),
+            np.minimum.reduceat(first[order], starts), np.maximum.reduceat(last[order], starts))
+
+def bucket_pair_totals(df: pd.DataFrame, bucket_col: str, member_col: str,
+                       start_ns: np.ndarray, end_ns: np.ndarray, span: str) -> tuple:
+    """Count the buckets every member pair shares, with the date span of those shared buckets.
+    
+    Each (bucket, member) is reduced to its earliest start and latest end first. For a
+    shared bucket, 'overlap' spans the time both members were there (none if they never
+    overlapped), 'range' spans from the earlier to the later date (e.g. a transfer).
+    Candidate pairs are generated per bucket size in chunks of PAIR_CHUNK_SIZE and
+    reduced as they go, so memory follows the number of distinct pairs.
+    
+    Args:
+        df: Source table (e.g. player contracts or match appearances)
+        bucket_col: Column that groups rows (e.g. CLUB_ID or MATCH_ID)
+        member_col: Column holding the connected entities (e.g. PERSON_ID)
+        start_ns: Per-row start dates as int64 ns, int64 max where unknown
+        end_ns: Per-row end dates as int64 ns, int64 min where unknown
+        span: 'overlap' or 'range'
+    
+    Returns:
+        (member, other_member, shared_count, first_ns, last_ns) arrays, one entry per pair
+    """
+    rows = pd.DataFrame({
+        'bucket': df[bucket_col].to_numpy(),
+        'member': df[member_col].to_numpy(),
+        'start': start_ns,
+        'end': end_ns
+    }).dropna(subset=['bucket', 'member'])
+    rows = rows.groupby(['bucket', 'member'], sort=False).agg(start=('start', 'min'), end=('end', 'max')).reset_index()
+    empty = (np.zeros(0, dtype=np.int64),) * 2 + (np.zeros(0, dtype=np.int32),) + (np.zeros(0, dtype=np.int64),) * 2
+    if rows.empty:
+        return empty
+    
+    member_codes, members = pd.factorize(rows['member'])
+    bucket_codes = pd.factorize(rows['bucket'])[0]
+    order = np.argsort(bucket_codes, kind='stable')
+    member_codes = member_codes[order].astype(np.int64)
+    starts_ns = rows['start'].to_numpy(dtype=np.int64)[order]
+    ends_ns = rows['end'].to_numpy(dtype=np.int64)[order]
+    bucket_sizes = np.bincount(bucket_codes)
+    bucket_starts = np.concatenate(([0], np.cumsum(bucket_sizes)[:-1]))
+    combine_start, combine_end = (np.maximum, np.minimum) if span == 'overlap' else (np.minimum, np.maximum)
+    
+    n_members = np.int64(len(members))
+    totals = []
+    for size in np.unique(bucket_sizes[bucket_sizes > 1]):
+        starts = bucket_starts[bucket_sizes == size]
+        upper_i, upper_j = np.triu_indices(size, 1)
+        step = max(1, PAIR_CHUNK_SIZE // len(upper_i))
+        for chunk in range(0, len(starts), step):
+            slots = starts[chunk:chunk + step, None] + np.arange(size)
+            left = slots[:, upper_i].ravel()
+            right = slots[:, upper_j].ravel()
+            low = np.minimum(member_codes[left], member_codes[right])
+            high = np.maximum(member_codes[left], member_codes[right])
+            first = combine_start(starts_ns[left], starts_ns[right])
+            last = combine_end(ends_ns[left], ends_ns[right])
+            if span == 'overlap':
+                # Members of the same bucket at different times still count, but add no dates
+                apart = first > last
+                first = np.where(apart, np.iinfo(np.int64).max, first)
+                last = np.where(apart, np.iinfo(np.int64).min, last)
+            totals.append(reduce_pair_totals(
+                low * n_members + high, np.ones(len(left), dtype=np.int32), first, last
+            ))
+    
+    if not totals:
+        return empty
+    keys, counts, first, last = reduce_pair_totals(*(np.concatenate(column) for column in zip(*totals)))
+    member_ids = np.asarray(members, dtype=np.int64)
+    return member_ids[keys // n_members], member_ids[keys % n_members], counts, first, last
+
+def bidirectional_path(graph: nx.Graph, source, target, max_depth: int = 0) -> List[Any]:
+    """Same path as nx.shortest_path (unweighted), giving up after max_depth hops (0 = no limit).
+    
+    Follows NetworkX's bidirectional BFS: grow the smaller fringe one level at a time
+    and stop at the first node reached from both sides.
+    """
+    if source == target:
+        return [source]
+    pred, succ = {source: None}, {target: None}
+    forward_fringe, reverse_fringe = [source], [target]
+    depth = 0
+    meet = None
+    while forward_fringe and reverse_fringe and meet is None:
+        if max_depth and depth >= max_depth:
+            break
+        depth += 1
+        if len(forward_fringe) <= len(reverse_fringe):
+            this_level, forward_fringe = forward_fringe, []
+            own, other, fringe = pred, succ, forward_fringe
+        else:
+            this_level, reverse_fringe = reverse_fringe, []
+            own, other, fringe = succ, pred, reverse_fringe
+        for v in this_level:
+            for w in graph.adj[v]:
+                if w not in own:
+                    fringe.append(w)
+                    own[w] = v
+                if w in other:
+                    meet = w
+                    break
+            if meet is not None:
+                break
+    if meet is None:
+        raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+    
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = pred[node]
+    path.reverse()
+    node = succ[path[-1]]
+    while node is not None:
+        path.append(node)
+        node = succ[node]
+    return path
+
+def all_shortest_paths(graph: nx.Graph, source, target, max_depth: int = 0):
+    """Same paths in the same order as nx.all_shortest_paths (unweighted), giving up after
+    max_depth hops (0 = no limit).
+    
+    Builds NetworkX's BFS predecessor lists, but stops after the level that reaches target
+    (every shortest path is complete by then) or after max_depth levels, instead of
+    searching the whole graph.
+    """
+    pred = {source: []}
+    level_of = {source: 0}
+    frontier = [source]
+    level = 0
+    while frontier and target not in pred:
+        if max_depth and level >= max_depth:
+            break
+        level += 1
+        next_frontier = []
+        for v in frontier:
+            for w in graph.adj[v]:
+                if w not in level_of:
+                    level_of[w] = level
+                    pred[w] = [v]
+                    next_frontier.append(w)
+                elif level_of[w] == level:
+                    pred[w].append(v)
+        frontier = next_frontier
+    if target not in pred:
+        raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+    
+    # Depth-first over predecessors from target, in list order, as NetworkX does
+    stack = [(target, iter(pred[target]))]
+    while stack:
+        node, parents = stack[-1]
+        if node == source:
+            yield [n for n, _ in reversed(stack)]
+            stack.pop()
+            continue
+        parent = next(parents, None)
+        if parent is None:
+            stack.pop()
+        else:
+            stack.append((parent, iter(pred[parent])))
+
+def bfs_parents(graph: nx.Graph, root) -> Dict[Any, Any]:
+    """BFS parent of every node reachable from root (root maps to None)"""
+    parents = {root: None}
+    frontier = [root]
+    while frontier:
+        next_frontier = []
+        for v in frontier:
+            for w in graph.adj[v]:
+                if w not in parents:
+                    parents[w] = v
+                    next_frontier.append(w)
+        frontier = next_frontier
+    return parents
+
+def hub_tree_path(hub_trees: Dict[Any, dict], source, target) -> Optional[List[Any]]:
+    """A shortest path read off a hub's BFS tree when source or target is a hub, else None.
+    
+    Raises NetworkXNoPath when the hub's tree does not reach the other node.
+    """
+    for root, other, reverse in [(source, target, True), (target, source, False)]:
+        parents = hub_trees.get(root)
+        if parents is None:
+            continue
+        if other not in parents:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        path = []
+        node = other
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        return path[::-1] if reverse else path
+    return None
+
+def parse_time_period(as_of: str = '', window: str = '') -> Optional[tuple]:
+    """(start_ns, end_ns) for an as_of date or a window, or None when neither is given.
+    
+    Args:
+        as_of: A single date (YYYY-MM-DD)
+        window: 'YYYY-MM-DD:YYYY-MM-DD', a span of whole years ('2020-2024' or '2020:2024'),
+            a season ('2023/24', '2023-24' or '2023/2024') or a year ('2023')
+    
+    Raises:
+        ValueError: If both are given or a value cannot be parsed
+    """
+    if as_of and window:
+        raise ValueError("Pass either as_of or window, not both")
+    if as_of:
+        day = pd.Timestamp(as_of).normalize()
+        return (day.value, (day + pd.Timedelta(days=1)).value - 1)
+    if not window:
+        return None
+    
+    window = window.strip()
+    compact = window.replace(' ', '')
+    first, separator, last = compact[:4], compact[4:5], compact[5:]
+    if len(compact) == 9 and separator in '-:' and first.isdigit() and last.isdigit():
+        # Span of whole years, as graph_temporal_analysis reads time ranges
+        start = pd.Timestamp(year=int(first), month=1, day=1)
+        end = pd.Timestamp(year=int(last) + 1, month=1, day=1)
+    elif ':' in window:
+        start, end = window.split(':', 1)
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    elif len(compact) in (7, 9) and separator in '/-' and first.isdigit() and last.isdigit():
+        # Season: starts in SEASON_START_MONTH of the first year and ends in the next one
+        if int(last) != (int(first) + 1) % 10 ** len(last):
+            raise ValueError(f"Season '{window}' must end the year after it starts")
+        start = pd.Timestamp(year=int(first), month=SEASON_START_MONTH, day=1)
+        end = start + pd.DateOffset(years=1)
+    elif len(window) == 4 and window.isdigit():
+        start = pd.Timestamp(year=int(window), month=1, day=1)
+        end = start + pd.DateOffset(years=1)
+    else:
+        raise ValueError(f"Unrecognized window '{window}' "
+                         f"(expected YYYY-MM-DD:YYYY-MM-DD, YYYY-YYYY, YYYY/YY or YYYY)")
+    if end <= start:
+        raise ValueError(f"Window '{window}' ends before it starts")
+    return (start.value, end.value - 1)
+
+def parse_time_range(time_range: str) -> Optional[tuple]:
+    """(first_month, last_month) of a time_range as year * 12 + month - 1, or None for all time.
+    
+    Args:
+        time_range: '' or 'all', or any window parse_time_period accepts (dates, span of years,
+            season, year); dates round out to whole months
+    
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    text = (time_range or '').strip()
+    if text.lower() in ('', 'all'):
+        return None
+    start_ns, end_ns = parse_time_period(window=text)
+    start, end = pd.Timestamp(start_ns), pd.Timestamp(end_ns)
+    return (start.year * 12 + start.month - 1, end.year * 12 + end.month - 1)
+
+def format_month(month: int) -> str:
+    """'YYYY-MM' for a month number (year * 12 + month - 1)"""
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+def bucket_row_pairs(buckets: np.ndarray) -> tuple:
+    """(left, right) positions of every pair of rows sharing a bucket value, left before right"""
+    codes = pd.factorize(buckets)[0]
+    order = np.argsort(codes, kind='stable')
+    sizes = np.bincount(codes) if len(codes) else np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1])) if len(sizes) else sizes
+    lefts, rights = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for size in np.unique(sizes[sizes > 1]):
+        upper_i, upper_j = np.triu_indices(size, 1)
+        slots = starts[sizes == size, None] + np.arange(size)
+        lefts.append(order[slots[:, upper_i].ravel()])
+        rights.append(order[slots[:, upper_j].ravel()])
+    return np.concatenate(lefts), np.concatenate(rights)
+
+def temporal_snapshot(graph: nx.Graph, indexes: List[tuple], start: int, end: int) -> nx.Graph:
+    """Graph of the relationships valid in [start, end], built from interval indexes.
+    
+    Nodes are the graph's nodes that were active (had a membership row) in the window,
+    with their attributes. A pair is connected when both members were in the same bucket
+    at the same time within the window ('overlap'), or when one of them joined the shared
+    bucket within the window ('move'). Like build_networks, each pair keeps one edge: the
+    highest-precedence relationship, and within it the one that began first.
+    
+    Args:
+        graph: Full graph supplying nodes and node attributes
+        indexes: (relationship, rule, IntervalIndex) in precedence order
+        start: Window start (int64 ns)
+        end: Window end (int64 ns)
+    """
+    active = []
+    edge_parts = []
+    for rank, (relationship, rule, index) in enumerate(indexes):
+        overlapping = index.overlapping(start, end)
+        active.append(index.members[overlapping])
+        rows = overlapping if rule == 'overlap' else index.in_buckets(index.buckets[index.starting(start, end)])
+        left, right = bucket_row_pairs(index.buckets[rows])
+        left, right = rows[left], rows[right]
+        began = np.maximum(index.start_ns[left], index.start_ns[right])
+        if rule == 'overlap':
+            valid = (began <= np.minimum(index.end_ns[left], index.end_ns[right])) & (began <= end)
+            valid &= np.minimum(index.end_ns[left], index.end_ns[right]) >= start
+        else:
+            valid = (began >= start) & (began <= end)
+        valid &= index.members[left] != index.members[right]
+        left, right, began = left[valid], right[valid], began[valid]
+        edge_parts.append(pd.DataFrame({
+            'rank': rank,
+            'began': began,
+            'low': np.minimum(index.members[left], index.members[right]),
+            'high': np.maximum(index.members[left], index.members[right]),
+            'context': index.buckets[left]
+        }))
+    
+    edges = pd.concat(edge_parts, ignore_index=True).sort_values(['rank', 'began', 'context'], kind='stable')
+    edges = edges.drop_duplicates(['low', 'high'])
+    active = set(np.concatenate(active).tolist()) if active else set()
+    
+    snapshot = nx.Graph()
+    snapshot.add_nodes_from((node, attrs) for node, attrs in graph.nodes(data=True) if node in active)
+    relationships = [relationship for relationship, _, _ in indexes]
+    snapshot.add_edges_from(
+        (low, high, {'relationship': relationships[rank], EDGE_CONTEXT_ATTRIBUTES[relationships[rank]]: context})
+        for rank, low, high, context in zip(edges['rank'].tolist(), edges['low'].tolist(),
+                                            edges['high'].tolist(), edges['context'].tolist())
+        if low in snapshot and high in snapshot
+    )
+    return snapshot
+
+# Initialize FastMCP server
+mcp = FastMCP("soccer-graph-analytics")
+
+# Constants
+SERVICE_NAME = "soccer-graph-analytics"
+
+class GraphStore:
+    """Publishes the current fully built graph bundle and loads it with single-flight semantics.
+    
+    A bundle is a SoccerGraphLoader whose tables, graphs and indexes are complete; it is
+    never mutated after publication. Callers read `bundle` once per request and use that
+    reference throughout, so they never observe a half-built graph.
+    """
+    
+    def __init__(self, data_dir='/app/graph_data'):
+        self.data_dir = data_dir
+        self.bundle = None
+        # empty -> loading -> ready, or failed (the next caller retries)
+        self.state = 'empty'
+        self.error = None
+        # Held while any bundle (initial or reload) is being built
+        self.load_lock = threading.Lock()
+        self.reloading = False
+        # Callbacks run with each newly published bundle (e.g. to drop stale caches)
+        self.on_publish = []
+    
+    def publish(self, bundle):
+        """Swap in a fully built bundle; requests already holding the old one keep using it"""
+        self.bundle = bundle
+        self.state = 'ready'
+        self.error = None
+        for callback in self.on_publish:
+            callback(bundle)
+    
+    @property
+    def ready(self):
+        return self.bundle is not None
+    
+    def ensure_loaded(self):
+        """Load the bundle if needed; concurrent callers wait for the one load in progress"""
+        if self.bundle is not None:
+            return True
+        with self.load_lock:
+            if self.bundle is not None:
+                return True
+            self.state = 'loading'
+            logger.info("Loading graph data...")
+            staging = SoccerGraphLoader()
+            try:
+                loaded = staging.load(self.data_dir)
+            except Exception as e:
+                logger.error(f"Failed to load graph data: {e}")
+                loaded = False
+            if not loaded:
+                self.state = 'failed'
+                self.error = "Failed to load graph data"
+                return False
+            # Atomic swap: readers see either no bundle or the complete one
+            self.publish(staging)
+            return True
+    
+    def reload(self):
+        """Build a new bundle on a background thread while the current one keeps serving.
+        
+        Returns False if a load or reload is already in progress.
+        """
+        if not self.load_lock.acquire(blocking=False):
+            return False
+        self.reloading = True
+        
+        def build_and_swap():
+            try:
+                logger.info("Reloading graph data in the background...")
+                staging = SoccerGraphLoader()
+                if staging.load(self.data_dir):
+                    self.publish(staging)
+                    logger.info(f"✅ Reloaded graph data (version {staging.version})")
+                else:
+                    self.error = "Failed to reload graph data; still serving the previous version"
+                    logger.error(self.error)
+            except Exception as e:
+                self.error = f"Failed to reload graph data: {e}"
+                logger.error(self.error)
+            finally:
+                self.reloading = False
+                self.load_lock.release()
+        
+        threading.Thread(target=build_and_swap, name='graph-reloader', daemon=True).start()
+        return True
+    
+    def ingest(self, new_rows: Dict[str, Any]) -> dict:
+        """Apply new rows to a copy of the current bundle and publish it (copy-on-write).
+        
+        Requests in flight keep the bundle they started with. Cached analytics for graphs
+        the new rows did not touch carry over to the new version.
+        """
+        if not self.ensure_loaded():
+            raise RuntimeError("Graph data not available")
+        with self.load_lock:
+            current = self.bundle
+            staging = current.copy()
+            stale = staging.ingest(new_rows)
+            staging.parent_version = current.version
+            staging.stale_graphs = stale
+            self.publish(staging)
+        return {"graph_version": staging.version, "stale_graphs": sorted(stale)}
+    
+    def start_watcher(self, interval: float):
+        """Poll the data directory and reload whenever a JSON source changes"""
+        def watch():
+            while True:
+                time.sleep(interval)
+                bundle = self.bundle
+                if bundle is None or self.reloading:
+                    continue
+                try:
+                    changed = bundle.source_fingerprint(bundle.data_dir) != bundle.sources
+                except OSError:
+                    # A file is being replaced; check again next interval
+                    continue
+                if changed:
+                    logger.info(f"Detected changes in {bundle.data_dir}")
+                    self.reload()
+        
+        threading.Thread(target=watch, name='graph-data-watcher', daemon=True).start()
+        logger.info(f"Watching graph data for changes every {interval}s")
+    
+    def start_background_load(self):
+        """Begin loading on a background thread unless a load already ran or is running"""
+        if self.state == 'empty' and not self.load_lock.locked():
+            threading.Thread(target=self.ensure_loaded, name='graph-loader', daemon=True).start()
+    
+    def health(self):
+        """Readiness report and HTTP status for /health (503 until a bundle is published)"""
+        if not self.ready:
+            self.start_background_load()
+        bundle = self.bundle
+        body = {
+            "status": "healthy" if bundle is not None else self.state,
+            "service": "soccer-mcp-server",
+            "ready": bundle is not None,
+            "graph_version": bundle.version if bundle is not None else None,
+            "reloading": self.reloading
+        }
+        if self.error:
+            body["error"] = self.error
+        return body, 200 if bundle is not None else 503
+
+# Global graph store (current graph bundle)
+graph_store = GraphStore()
+
+# Pre-fork HTTP worker processes sharing the parent's graph bundle (1 = serve in this process)
+HTTP_WORKERS = int(os.getenv('HTTP_WORKERS', '1'))
+
+# Set in pre-fork workers: pid of the parent process that owns the graph bundle (see WorkerPool)
+worker_parent_pid = None
+
+WORKER_INGEST_ERROR = ("Ingest is not available with HTTP_WORKERS > 1, as each worker would hold "
+                       "different rows; update graph_data/ and POST /admin/reload instead")
+
+def request_reload() -> bool:
+    """Start a background reload; in a pre-fork worker, ask the parent to reload and replace the workers"""
+    if worker_parent_pid is not None:
+        os.kill(worker_parent_pid, signal.SIGHUP)
+        return True
+    return graph_store.reload()
+
+# Histogram bucket upper bounds: latencies in seconds, batch sizes in rows
+LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+BATCH_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+# Opt-in profiling: tool calls slower than PROFILE_SLOW_MS (0 = off) are dumped as cProfile
+# stats to PROFILE_DIR, keeping the newest PROFILE_MAX_FILES dumps
+PROFILE_SLOW_MS = float(os.getenv('PROFILE_SLOW_MS', '0'))
+PROFILE_DIR = os.getenv('PROFILE_DIR', '/tmp/soccer_mcp_profiles')
+PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', '100'))
+
+class MetricsRegistry:
+    """In-process counters, histograms and gauges, rendered in the Prometheus text format.
+    
+    Counters and histograms are updated as requests run; gauges are read from collector
+    callbacks when /metrics is scraped.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        # name -> (type, help text, histogram buckets)
+        self.families = {}
+        # (name, sorted label tuple) -> value, or [bucket counts, sum, count] for histograms
+        self.values = {}
+        # Callables returning [(name, labels, value)] for gauges and externally kept counters
+        self.collectors = []
+    
+    def describe(self, name: str, kind: str, help_text: str, buckets: Optional[List[float]] = None):
+        """Declare a metric family ('counter', 'gauge' or 'histogram')"""
+        self.families[name] = (kind, help_text, buckets)
+    
+    def inc(self, name: str, labels: Optional[Dict[str, Any]] = None, value: float = 1):
+        """Add to a counter"""
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+    
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None):
+        """Record one observation in a histogram"""
+        buckets = self.families[name][2]
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        samples = {}
+        with self.lock:
+            for (name, labels), value in self.values.items():
+                samples.setdefault(name, []).append((labels, copy.deepcopy(value)))
+        for collector in self.collectors:
+            try:
+                for name, labels, value in collector():
+                    samples.setdefault(name, []).append((tuple(sorted(labels.items())), value))
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+        
+        lines = []
+        for name in sorted(samples):
+            kind, help_text, buckets = self.families.get(name, ('untyped', '', None))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples[name], key=lambda sample: sample[0]):
+                if kind != 'histogram':
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+                    continue
+                counts, total, count = value
+                for bound, bucket_count in zip(buckets, counts):
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {bucket_count}")
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{format_labels(labels)} {total}")
+                lines.append(f"{name}_count{format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+def format_labels(labels: tuple) -> str:
+    """Prometheus label set: {name="value",...} with quotes, backslashes and newlines escaped"""
+    if not labels:
+        return ''
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in labels) + '}'
+
+metrics = MetricsRegistry()
+metrics.describe('soccer_mcp_tool_calls_total', 'counter', 'MCP tool calls (including Service Function rows)')
+metrics.describe('soccer_mcp_tool_errors_total', 'counter', 'MCP tool calls that raised or returned an error')
+metrics.describe('soccer_mcp_tool_seconds', 'histogram', 'MCP tool call latency', LATENCY_BUCKETS)
+metrics.describe('soccer_mcp_phase_seconds', 'histogram',
+                 'Time spent per phase (load, graph, algorithm, serialize, parse, tools) of a tool or route',
+                 LATENCY_BUCKETS)
+metrics.describe('soccer_mcp_requests_total', 'counter', 'HTTP requests by route and status code')
+metrics.describe('soccer_mcp_request_seconds', 'histogram', 'HTTP request latency', LATENCY_BUCKETS)
+metrics.describe('soccer_mcp_batch_rows', 'histogram', 'Rows per Service Function batch', BATCH_BUCKETS)
+metrics.describe('soccer_mcp_batch_unique_calls', 'histogram',
+                 'Distinct tool calls per Service Function batch (after deduplication)', BATCH_BUCKETS)
+metrics.describe('soccer_mcp_batch_invalid_rows_total', 'counter',
+                 'Service Function rows whose arguments could not be parsed (answered with an error)')
+metrics.describe('soccer_mcp_cache_hits_total', 'counter', 'Analytics and path cache hits')
+metrics.describe('soccer_mcp_cache_misses_total', 'counter', 'Analytics and path cache misses')
+metrics.describe('soccer_mcp_cache_entries', 'gauge', 'Entries held by each cache')
+metrics.describe('soccer_mcp_graph_nodes', 'gauge', 'Nodes in the published graphs')
+metrics.describe('soccer_mcp_graph_edges', 'gauge', 'Edges in the published graphs')
+metrics.describe('soccer_mcp_graph_version', 'gauge', 'Version of the published graph bundle')
+metrics.describe('soccer_mcp_resident_memory_bytes', 'gauge', 'Resident set size of the server process')
+metrics.describe('soccer_mcp_peak_resident_memory_bytes', 'gauge', 'Peak resident set size of the server process')
+metrics.describe('soccer_mcp_slow_profiles_total', 'counter', 'cProfile dumps written for slow tool calls')
+
+# Tool or route that spans are attributed to in the current request
+current_operation = contextvars.ContextVar('current_operation', default='none')
+
+@contextmanager
+def span(phase: str, operation: Optional[str] = None):
+    """Time a block as one phase of the current tool call or HTTP route"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe('soccer_mcp_phase_seconds', time.perf_counter() - start,
+                        {'operation': operation or current_operation.get(), 'phase': phase})
+
+def to_json(result: Any) -> str:
+    """json.dumps timed as the 'serialize' phase"""
+    with span('serialize'):
+        return json.dumps(result)
+
+def is_error_result(result: Any) -> bool:
+    """Whether a tool's return value is a JSON error object"""
+    return isinstance(result, str) and result.startswith('{"error"')
+
+def save_profile(profiler: cProfile.Profile, name: str, seconds: float):
+    """Write a slow call's cProfile stats to PROFILE_DIR, pruning the oldest dumps"""
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{name}-{int(time.time() * 1000)}-{int(seconds * 1000)}ms.prof")
+        profiler.dump_stats(path)
+        metrics.inc('soccer_mcp_slow_profiles_total', {'tool': name})
+        logger.info(f"Slow call {name} took {seconds * 1000:.0f} ms; profile written to {path}")
+        dumps = sorted((os.path.join(PROFILE_DIR, f) for f in os.listdir(PROFILE_DIR) if f.endswith('.prof')),
+                       key=os.path.getmtime)
+        for stale in dumps[:max(0, len(dumps) - PROFILE_MAX_FILES)]:
+            os.remove(stale)
+    except OSError as e:
+        logger.warning(f"Could not write profile for {name}: {e}")
+
+def instrumented_tool(tool):
+    """Count, time and (when PROFILE_SLOW_MS is set) profile every call of an async tool"""
+    name = tool.__name__
+    
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        token = current_operation.set(name)
+        profiler = cProfile.Profile() if PROFILE_SLOW_MS > 0 else None
+        start = time.perf_counter()
+        result = None
+        try:
+            if profiler is not None:
+                profiler.enable()
+            result = await tool(*args, **kwargs)
+            return result
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            seconds = time.perf_counter() - start
+            current_operation.reset(token)
+            metrics.inc('soccer_mcp_tool_calls_total', {'tool': name})
+            metrics.observe('soccer_mcp_tool_seconds', seconds, {'tool': name})
+            if result is None or is_error_result(result):
+                metrics.inc('soccer_mcp_tool_errors_total', {'tool': name})
+            if profiler is not None and seconds * 1000 >= PROFILE_SLOW_MS:
+                save_profile(profiler, name, seconds)
+    
+    return wrapper
+
+def record_batch(route: str, calls: list, unique_args: list):
+    """Count the rows and distinct calls of one Service Function batch"""
+    metrics.observe('soccer_mcp_batch_rows', len(calls), {'route': route})
+    metrics.observe('soccer_mcp_batch_unique_calls', len(unique_args), {'route': route})
+    invalid = sum(isinstance(args, InvalidRow) for _, args in calls)
+    if invalid:
+        metrics.inc('soccer_mcp_batch_invalid_rows_total', {'route': route}, invalid)
+
+def record_request(route: str, status_code: int, seconds: float):
+    """Count and time one HTTP request"""
+    metrics.inc('soccer_mcp_requests_total', {'route': route, 'status': status_code})
+    metrics.observe('soccer_mcp_request_seconds', seconds, {'route': route})
+
+class AnalyticsCache:
+    """Bounded LRU cache for whole-graph analytics results, keyed by graph version"""
+    
+    def __init__(self, max_entries=32, name='analytics'):
+        self.max_entries = max_entries
+        self.name = name
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Version of the published graph bundle; results for other versions are not stored
+        self.current_version = None
+    
+    def get_or_compute(self, key, compute, phase='algorithm'):
+        """Return the cached value for key, computing (timed as `phase`) and storing it on a miss"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+        
+        # Compute outside the lock so other analyses are not blocked
+        with span(phase):
+            value = compute()
+        
+        with self.lock:
+            # Requests still running on a replaced bundle get their result but don't cache it
+            if self.current_version is None or key[0] == self.current_version:
+                self.entries[key] = value
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return value
+    
+    def clear(self):
+        """Drop all cached results"""
+        with self.lock:
+            self.entries.clear()
+    
+    def carry_forward(self, old_version, new_version, graph_types):
+        """Re-key results for the given graph types from old_version to new_version"""
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == old_version and key[1] in graph_types]:
+                self.entries[(new_version,) + key[1:]] = self.entries.pop(key)
+    
+    def retain_version(self, version):
+        """Drop results computed for any other graph version (keys start with the version)"""
+        with self.lock:
+            self.current_version = version
+            for key in [key for key in self.entries if key[0] != version]:
+                del self.entries[key]
+
+# Whole-graph analytics results (centrality rankings, communities)
+analytics_cache = AnalyticsCache(int(os.getenv('ANALYTICS_CACHE_SIZE', '32')))
+
+# Shortest path query results, keyed by (graph version, graph type, source, target, options)
+path_cache = AnalyticsCache(int(os.getenv('PATH_CACHE_SIZE', '4096')), name='path')
+
+def refresh_analytics_cache(bundle):
+    """Keep cached analytics still valid for a newly published bundle and drop the rest"""
+    for cache in [analytics_cache, path_cache]:
+        if bundle.parent_version is not None:
+            unchanged = {'player', 'club'} - bundle.stale_graphs
+            cache.carry_forward(bundle.parent_version, bundle.version, unchanged)
+        cache.retain_version(bundle.version)
+
+graph_store.on_publish.append(refresh_analytics_cache)
+
+def collect_runtime_metrics() -> list:
+    """Gauges and cache counters read at scrape time"""
+    samples = []
+    for cache in [analytics_cache, path_cache]:
+        labels = {'cache': cache.name}
+        samples += [('soccer_mcp_cache_hits_total', labels, cache.hits),
+                    ('soccer_mcp_cache_misses_total', labels, cache.misses),
+                    ('soccer_mcp_cache_entries', labels, len(cache.entries))]
+    bundle = graph_store.bundle
+    if bundle is not None:
+        samples.append(('soccer_mcp_graph_version', {}, bundle.version))
+        for graph_type, graph in [('player', bundle.player_graph), ('club', bundle.club_graph)]:
+            if graph is not None:
+                samples += [('soccer_mcp_graph_nodes', {'graph': graph_type}, graph.number_of_nodes()),
+                            ('soccer_mcp_graph_edges', {'graph': graph_type}, graph.number_of_edges())]
+    samples += [('soccer_mcp_resident_memory_bytes', {}, current_rss_bytes()),
+                ('soccer_mcp_peak_resident_memory_bytes', {}, peak_rss_bytes())]
+    return samples
+
+metrics.collectors.append(collect_runtime_metrics)
+
+def pagerank_centrality(graph: nx.Graph, alpha=0.85, max_iter=100, tol=1e-06, weight: Optional[str] = None) -> Dict[Any, float]:
+    """PageRank by power iteration with uniform teleport; dangling nodes spread their rank evenly.
+    
+    Pure Python so it needs no SciPy (unlike nx.pagerank); CSRGraph.pagerank is the
+    vectorized equivalent.
+    """
+    n = len(graph)
+    if n == 0:
+        return {}
+    strength = dict(graph.degree(weight=weight))
+    x = dict.fromkeys(graph, 1.0 / n)
+    for _ in range(max_iter):
+        xlast = x
+        dangling = alpha * sum([xlast[node] for node in graph if not strength[node]])
+        x = dict.fromkeys(graph, dangling / n + (1 - alpha) / n)
+        for node in graph:
+            if not strength[node]:
+                continue
+            share = alpha * xlast[node] / strength[node]
+            for neighbor, attrs in graph.adj[node].items():
+                x[neighbor] += share * attrs.get(weight, 1) if weight else share
+        if sum([abs(x[node] - xlast[node]) for node in x]) < n * tol:
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+CENTRALITY_ALGORITHMS = {
+    'betweenness': nx.betweenness_centrality,
+    'closeness': nx.closeness_centrality,
+    'degree': nx.degree_centrality,
+    'eigenvector': nx.eigenvector_centrality,
+    'pagerank': pagerank_centrality
+}
+
+# Unweighted analyses the 'csr' engine runs on CSRGraph instead of NetworkX
+CSR_ALGORITHMS = {
+    'closeness': CSRGraph.closeness_centrality,
+    'degree': CSRGraph.degree_centrality,
+    'eigenvector': CSRGraph.eigenvector_centrality,
+    'pagerank': CSRGraph.pagerank
+}
+
+# Fixed seed so sampled betweenness picks the same pivots on every call and worker
+BETWEENNESS_SEED = 42
+BETWEENNESS_CONFIDENCE = 0.95
+
+# Graph and edge attribute held by each betweenness / component worker process (set once by the pool initializer)
+worker_graph = None
+worker_weight = None
+
+def init_graph_worker(graph, weight=None):
+    """Process pool initializer: keep the graph so tasks only ship node lists"""
+    global worker_graph, worker_weight
+    worker_graph = graph
+    worker_weight = weight
+
+def betweenness_from_sources(sources: list) -> Dict[Any, float]:
+    """Unnormalized betweenness contributions of shortest paths starting at the given sources"""
+    return nx.betweenness_centrality_subset(worker_graph, sources, list(worker_graph), normalized=False,
+                                            weight=worker_weight)
+
+def betweenness_error_bound(total_nodes: int, sample_size: int, confidence: float = BETWEENNESS_CONFIDENCE) -> float:
+    """Max absolute error on every node's normalized betweenness when sampling pivots.
+    
+    Hoeffding bound with a union bound over all nodes: with probability `confidence`,
+    no estimate is further than this from the exact value.
+    """
+    if sample_size >= total_nodes:
+        return 0.0
+    return math.sqrt(math.log(2 * total_nodes / (1 - confidence)) / (2 * sample_size))
+
+def betweenness_centrality(graph: nx.Graph, sample_size: int = 0, workers: int = 1,
+                           weight: Optional[str] = None) -> Dict[Any, float]:
+    """Normalized betweenness, optionally from k sampled pivots and/or split across processes.
+    
+    Args:
+        graph: Graph to analyze
+        sample_size: Number of pivot (source) nodes to sample; 0 or >= node count is exact
+        workers: Number of processes to split the source nodes across
+        weight: Edge attribute used as path length (None counts hops)
+    """
+    n = graph.number_of_nodes()
+    sampled = 0 < sample_size < n
+    if not sampled and workers <= 1:
+        return nx.betweenness_centrality(graph, weight=weight)
+    
+    nodes = list(graph)
+    sources = random.Random(BETWEENNESS_SEED).sample(nodes, sample_size) if sampled else nodes
+    if workers <= 1:
+        init_graph_worker(graph, weight)
+        partials = [betweenness_from_sources(sources)]
+    else:
+        chunks = [sources[i::workers * 4] for i in range(workers * 4)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_graph_worker,
+                                 initargs=(graph, weight)) as pool:
+            partials = list(pool.map(betweenness_from_sources, [chunk for chunk in chunks if chunk]))
+    
+    # Merge partial sums, then normalize (scaling sampled sums up to all n sources)
+    betweenness = dict.fromkeys(nodes, 0.0)
+    for partial in partials:
+        for node, value in partial.items():
+            betweenness[node] += value
+    if n > 2:
+        scale = 2 / ((n - 1) * (n - 2)) * (n / len(sources))
+        for node in betweenness:
+            betweenness[node] *= scale
+    return betweenness
+
+def get_graph(bundle: SoccerGraphLoader, graph_type: str):
+    """Return the bundle's player graph for 'player' and its club graph otherwise"""
+    return bundle.player_graph if graph_type == 'player' else bundle.club_graph
+
+def get_csr(bundle: SoccerGraphLoader, graph_type: str) -> Optional[CSRGraph]:
+    """The bundle's CSR graph for graph_type, or None on the 'networkx' engine"""
+    return bundle.player_csr if graph_type == 'player' else bundle.club_csr
+
+def period_or_error(weight_by: str, as_of: str, window: str) -> tuple:
+    """(period, None) from the tools' as_of/window arguments, or (None, error message)"""
+    try:
+        period = parse_time_period(as_of, window)
+    except ValueError as e:
+        return None, str(e)
+    if period is not None and weight_by != 'none':
+        return None, "weight_by cannot be combined with as_of or window (weights cover all time)"
+    return period, None
+
+def weight_by_error(graph_type: str, weight_by: str) -> Optional[str]:
+    """Error message if weight_by is not 'none', 'all' or a count kept for this graph type"""
+    options = ['none', 'all'] + WEIGHT_COLUMNS['player' if graph_type == 'player' else 'club']
+    if weight_by not in options:
+        return f"Invalid weight_by '{weight_by}' for {graph_type} graph (expected one of: {', '.join(options)})"
+    return None
+
+def snapshot_graph(bundle: SoccerGraphLoader, graph_type: str, period: tuple) -> nx.Graph:
+    """Snapshot of the relationships valid in period (start_ns, end_ns), cached per graph version"""
+    graph_type = 'player' if graph_type == 'player' else 'club'
+    
+    def compute():
+        return temporal_snapshot(get_graph(bundle, graph_type), bundle.temporal_indexes[graph_type], *period)
+    
+    key = (bundle.version, graph_type, 'snapshot') + tuple(period)
+    return analytics_cache.get_or_compute(key, compute, phase='graph')
+
+def weighted_graph(bundle: SoccerGraphLoader, graph_type: str, weight_by: str,
+                   period: Optional[tuple] = None) -> nx.Graph:
+    """The graph to analyze: the time snapshot for a period, unweighted for 'none', else a
+    cached copy with weight/distance edges (weights cover all time, so not with a period)"""
+    if period is not None:
+        return snapshot_graph(bundle, graph_type, period)
+    if weight_by == 'none':
+        return get_graph(bundle, graph_type)
+    weights = bundle.player_weights if graph_type == 'player' else bundle.club_weights
+    
+    def compute():
+        return weights.weighted_graph(get_graph(bundle, graph_type), weight_by)
+    
+    key = (bundle.version, graph_type, 'weighted_graph', weight_by)
+    return analytics_cache.get_or_compute(key, compute, phase='graph')
+
+# Processes that per-component closeness and Louvain are split across (1 = in this process);
+# results are the same for any number
+COMPONENT_WORKERS = int(os.getenv('COMPONENT_WORKERS', '1'))
+
+# Fixed seed so Louvain finds the same communities on every call and worker
+LOUVAIN_SEED = 42
+LOUVAIN_THRESHOLD = 1e-07
+
+def connected_components(graph: nx.Graph) -> tuple:
+    """Connected components as tuples of nodes in graph order, largest first (equal sizes in
+    order of their first node)"""
+    position = {node: i for i, node in enumerate(graph)}
+    components = [sorted(component, key=position.__getitem__) for component in nx.connected_components(graph)]
+    components.sort(key=lambda component: (-len(component), position[component[0]]))
+    return tuple(tuple(component) for component in components)
+
+def graph_components(bundle: SoccerGraphLoader, graph_type: str, period: Optional[tuple] = None) -> tuple:
+    """Connected components of the graph, or of its snapshot for a period, computed once per
+    graph version. Weighted copies have the same edges, so they share the result."""
+    graph_type = 'player' if graph_type == 'player' else 'club'
+    
+    def compute():
+        graph = snapshot_graph(bundle, graph_type, period) if period is not None else get_graph(bundle, graph_type)
+        return connected_components(graph)
+    
+    key = (bundle.version, graph_type, 'components', period)
+    return analytics_cache.get_or_compute(key, compute, phase='graph')
+
+def run_on_worker_graph(task: tuple):
+    """Process pool task: (function, chunk) -> function(worker graph, chunk, worker weight)"""
+    function, chunk = task
+    return function(worker_graph, chunk, worker_weight)
+
+def map_component_chunks(graph: nx.Graph, weight: Optional[str], function, chunks: list, workers: int) -> list:
+    """function(graph, chunk, weight) for each chunk, in chunk order, in this process or across
+    a process pool whose workers each hold the graph"""
+    if workers <= 1 or len(chunks) <= 1:
+        return [function(graph, chunk, weight) for chunk in chunks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=init_graph_worker,
+                             initargs=(graph, weight)) as pool:
+        return list(pool.map(run_on_worker_graph, [(function, chunk) for chunk in chunks]))
+
+def closeness_chunk(graph: nx.Graph, chunk: list, distance: Optional[str] = None) -> list:
+    """Closeness of each (sources, component size) piece in chunk, as lists of values.
+    
+    Same arithmetic as nx.closeness_centrality: (size - 1) / total distance from the source
+    within its component, scaled by (size - 1) / (n - 1).
+    """
+    if distance is None:
+        path_length = nx.single_source_shortest_path_length
+    else:
+        path_length = functools.partial(nx.single_source_dijkstra_path_length, weight=distance)
+    n = len(graph)
+    values = []
+    for sources, size in chunk:
+        piece = []
+        for source in sources:
+            total = sum(path_length(graph, source).values())
+            value = 0.0
+            if total > 0.0 and n > 1:
+                value = (size - 1.0) / total
+                value *= (size - 1.0) / (n - 1)
+            piece.append(value)
+        values.append(piece)
+    return values
+
+def component_closeness(graph: nx.Graph, components: tuple, distance: Optional[str] = None,
+                        workers: int = 1) -> Dict[Any, float]:
+    """nx.closeness_centrality computed per connected component.
+    
+    Components of 2+ nodes are cut into about workers * 4 chunks of similar node counts
+    (large components split by source, small ones packed together); isolated nodes score 0.
+    
+    Args:
+        graph: Graph to analyze
+        components: Its connected_components
+        distance: Edge attribute used as path length (None counts hops)
+        workers: Number of processes to split the chunks across
+    """
+    nodes = sum(len(component) for component in components if len(component) > 1)
+    chunk_size = max(1, -(-nodes // (workers * 4)))
+    chunks, current, filled = [], [], 0
+    for component in components:
+        start = 0
+        while len(component) > 1 and start < len(component):
+            piece = component[start:start + chunk_size - filled]
+            current.append((piece, len(component)))
+            filled += len(piece)
+            start += len(piece)
+            if filled == chunk_size:
+                chunks.append(current)
+                current, filled = [], 0
+    if current:
+        chunks.append(current)
+    
+    # Graph order, so ties rank as they do with nx.closeness_centrality
+    closeness = dict.fromkeys(graph, 0.0)
+    for chunk, values in zip(chunks, map_component_chunks(graph, distance, closeness_chunk, chunks, workers)):
+        for (sources, _), piece in zip(chunk, values):
+            closeness.update(zip(sources, piece))
+    return closeness
+
+def louvain_chunk(graph: nx.Graph, chunk: list, weight: Optional[str] = 'weight') -> list:
+    """Seeded Louvain communities of each (component, total graph edge weight) in chunk.
+    
+    Each component is optimized on its own with the resolution and threshold rescaled by its
+    share of the graph's edge weight, which keeps the modularity gains of whole-graph Louvain.
+    Components whose edges all weigh 0 leave every node on its own, as whole-graph Louvain does.
+    """
+    results = []
+    for nodes, total_weight in chunk:
+        component = graph.subgraph(nodes)
+        component_weight = component.size(weight=weight)
+        if not component_weight:
+            results.append([{node} for node in nodes])
+            continue
+        share = component_weight / total_weight
+        results.append(nx.community.louvain_communities(component, weight=weight, resolution=share,
+                                                        threshold=LOUVAIN_THRESHOLD / share, seed=LOUVAIN_SEED))
+    return results
+
+def component_louvain(graph: nx.Graph, components: tuple, workers: int = 1) -> tuple:
+    """Louvain communities found per connected component, as tuples of nodes in graph order,
+    largest first (equal sizes in order of their first node)"""
+    # Unweighted graphs carry no 'weight' attribute, so every edge counts as 1
+    total_weight = graph.size(weight='weight')
+    # With no edge weight at all there is nothing to optimize: every node is its own community
+    large = [(component, total_weight) for component in components if len(component) > 1 and total_weight]
+    # Components are largest first, so dealing them out balances the chunks
+    n_chunks = min(len(large), workers * 4)
+    chunks = [large[i::n_chunks] for i in range(n_chunks)]
+    communities = [component for component in components if len(component) == 1]
+    if not total_weight:
+        communities = [(node,) for component in components for node in component]
+    position = {node: i for i, node in enumerate(graph)}
+    for results in map_component_chunks(graph, 'weight', louvain_chunk, chunks, workers):
+        for found in results:
+            communities.extend(tuple(sorted(community, key=position.__getitem__)) for community in found)
+    communities.sort(key=lambda community: (-len(community), position[community[0]]))
+    return tuple(communities)
+
+# Path search modes of graph_shortest_path and the cap on paths returned by the multi-path modes
+PATH_MODES = ['shortest', 'all_shortest', 'k_shortest']
+MAX_PATHS = 50
+
+def find_paths(bundle: SoccerGraphLoader, graph_type: str, source, target, mode: str = 'shortest',
+               k: int = 3, max_depth: int = 0, weight_by: str = 'none', period: Optional[tuple] = None) -> tuple:
+    """Paths from source to target as tuples of node IDs (empty when none), cached per graph version.
+    
+    Args:
+        mode: 'shortest' (one path), 'all_shortest' (every path of minimum length, up to
+            MAX_PATHS) or 'k_shortest' (the k shortest simple paths)
+        k: Number of paths for 'k_shortest'
+        max_depth: Ignore paths with more hops than this (0 = no limit)
+        weight_by: Edge weighting (see weighted_graph); paths then minimize 1 / weight
+        period: (start_ns, end_ns) to search the snapshot of that period (see snapshot_graph)
+    """
+    k = max(1, min(k, MAX_PATHS))
+    
+    def within_depth(path):
+        return not max_depth or len(path) - 1 <= max_depth
+    
+    def compute():
+        graph = weighted_graph(bundle, graph_type, weight_by, period)
+        weight = 'distance' if weight_by != 'none' else None
+        try:
+            if mode == 'shortest' and weight is None:
+                # Hub trees and CSR copies describe the full graph, not snapshots
+                path = hub_tree_path(bundle.hub_trees.get(graph_type, {}) if period is None else {}, source, target)
+                if path is None:
+                    csr = get_csr(bundle, graph_type) if period is None else None
+                    if csr is not None:
+                        path = csr.shortest_path(source, target, max_depth)
+                    else:
+                        path = bidirectional_path(graph, source, target, max_depth)
+                paths = [path]
+            elif mode == 'shortest':
+                paths = [nx.shortest_path(graph, source, target, weight=weight)]
+            elif mode == 'all_shortest' and weight is None:
+                # Stops searching at max_depth, like the single-path search
+                paths = itertools.islice(all_shortest_paths(graph, source, target, max_depth), MAX_PATHS)
+            elif mode == 'all_shortest':
+                paths = itertools.islice(nx.all_shortest_paths(graph, source, target, weight=weight), MAX_PATHS)
+            else:
+                # Yields paths in order of increasing length, so unweighted searches can stop early
+                paths = nx.shortest_simple_paths(graph, source, target, weight=weight)
+                if weight is None:
+                    paths = itertools.takewhile(within_depth, paths)
+                paths = itertools.islice(paths, k)
+            return tuple(tuple(path) for path in paths if within_depth(path))
+        except nx.NetworkXNoPath:
+            return ()
+    
+    key = (bundle.version, graph_type, source, target, mode, k if mode == 'k_shortest' else 0, max_depth, weight_by, period)
+    return path_cache.get_or_compute(key, compute)
+
+def describe_hop(bundle: SoccerGraphLoader, graph: nx.Graph, u, v) -> str:
+    """'relationship: shared entity' for the graph edge between u and v"""
+    attrs = graph.edges[u, v]
+    relationship = attrs.get('relationship', 'connected')
+    context_attr = EDGE_CONTEXT_ATTRIBUTES.get(relationship)
+    context = attrs.get(context_attr) if context_attr else None
+    if context is None:
+        return relationship
+    names = {'club_id': bundle.club_names, 'match_id': bundle.match_names, 'player_id': bundle.person_names}
+    return f"{relationship}: {names[context_attr].get(context, context)}"
+
+def weighted_degree_centrality(graph: nx.Graph) -> Dict[Any, float]:
+    """Sum of edge weights per node, normalized by n - 1 like nx.degree_centrality"""
+    scale = 1 / (len(graph) - 1) if len(graph) > 1 else 1
+    return {node: strength * scale for node, strength in graph.degree(weight='weight')}
+
+def centrality_ranking(bundle: SoccerGraphLoader, graph_type: str, analysis_type: str,
+                       sample_size: int = 0, workers: int = 1, weight_by: str = 'none',
+                       period: Optional[tuple] = None) -> tuple:
+    """Every node's (node_id, score), highest first, computed once per graph version.
+    
+    sample_size and workers only apply to betweenness; see betweenness_centrality. With
+    weight_by, path-based measures treat stronger ties as shorter (distance = 1 / weight)
+    and degree/eigenvector sum the weights. With period, the snapshot of that period is
+    ranked instead of the full graph.
+    """
+    graph = weighted_graph(bundle, graph_type, weight_by, period)
+    if analysis_type != 'betweenness' or sample_size >= graph.number_of_nodes():
+        sample_size = 0
+    weighted = weight_by != 'none'
+    
+    csr = get_csr(bundle, graph_type) if period is None else None
+    
+    def compute():
+        if analysis_type == 'betweenness':
+            centrality = betweenness_centrality(graph, sample_size, workers, 'distance' if weighted else None)
+        elif not weighted and csr is not None and analysis_type in CSR_ALGORITHMS:
+            centrality = CSR_ALGORITHMS[analysis_type](csr)
+        elif analysis_type == 'closeness':
+            centrality = component_closeness(graph, graph_components(bundle, graph_type, period),
+                                             'distance' if weighted else None, COMPONENT_WORKERS)
+        elif not weighted:
+            centrality = CENTRALITY_ALGORITHMS[analysis_type](graph)
+        elif analysis_type == 'degree':
+            centrality = weighted_degree_centrality(graph)
+        elif analysis_type == 'pagerank':
+            centrality = pagerank_centrality(graph, weight='weight')
+        else:
+            centrality = nx.eigenvector_centrality(graph, weight='weight')
+        return tuple(sorted(centrality.items(), key=lambda x: x[1], reverse=True))
+    
+    key = (bundle.version, graph_type, analysis_type, sample_size, weight_by, period)
+    return analytics_cache.get_or_compute(key, compute)
+
+def louvain_communities(bundle: SoccerGraphLoader, graph_type: str, weight_by: str = 'none',
+                        period: Optional[tuple] = None) -> tuple:
+    """Louvain communities as tuples of node IDs, largest first, computed once per graph version.
+    
+    The position of a community in the result is its community_id. Each connected component
+    is detected separately with a fixed seed (see component_louvain), so repeated calls and
+    any COMPONENT_WORKERS setting return the same communities.
+    """
+    graph = weighted_graph(bundle, graph_type, weight_by, period)
+    
+    def compute():
+        return component_louvain(graph, graph_components(bundle, graph_type, period), COMPONENT_WORKERS)
+    
+    key = (bundle.version, graph_type, 'louvain', weight_by, period)
+    return analytics_cache.get_or_compute(key, compute)
 
-# Initialize FastMCP server
-mcp = FastMCP("soccer-graph-analytics")
+def inferred_edges(bundle: SoccerGraphLoader) -> pd.DataFrame:
+    """REL_EDGE_INFERRED rows for the bundle's graph_data under the seed ONT_RULE rules
+    (the rows SP_RUN_ONTOLOGY_INFERENCE writes), computed once per graph version"""
+    def compute():
+        edges = ontology_inference.kg_tables_from_graph_data(bundle.graph_data)['KG_EDGE']
+        return ontology_inference.infer(edges, ontology_inference.SEED_RULES, ontology_inference.SEED_RELATIONS)
+    
+    return analytics_cache.get_or_compute((bundle.version, 'inferred_edges'), compute)
 
-# Constants
-SERVICE_NAME = "soccer-graph-analytics"
+def encode_cursor(state: dict) -> str:
+    """Opaque continuation token for a paginated result"""
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode()
+
+def decode_cursor(cursor: str) -> Optional[dict]:
+    """State encoded by encode_cursor, or None if the token is malformed"""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error):
+        return None
+    return state if isinstance(state, dict) else None
+
+def community_records(graph: nx.Graph, graph_type: str, communities: tuple, start: int, stop: int,
+                      max_members: int = 0):
+    """Yield result entries for communities[start:stop], listing at most max_members members each (0 = all)"""
+    for community_id in range(start, stop):
+        community = communities[community_id]
+        members = community[:max_members] if max_members > 0 else community
+        record = {
+            "community_id": community_id,
+            "size": len(community),
+            "members": [
+                {"id": node_id, "name": graph.nodes[node_id].get('name', f"Node {node_id}"), "type": graph_type}
+                for node_id in members
+            ]
+        }
+        if max_members > 0:
+            record["members_truncated"] = len(community) > max_members
+        yield record
+
+def community_page(bundle: SoccerGraphLoader, graph_type: str, weight_by: str = 'none', as_of: str = '',
+                   window: str = '', top_k: int = 0, max_members: int = 0, cursor: str = '') -> tuple:
+    """One page of community detection results: ((summary, records), None) or (None, error).
+    
+    Args:
+        bundle: Graph bundle to read
+        graph_type, weight_by, as_of, window: As for graph_community_detection
+        top_k: Communities per page, largest first (0 = all remaining)
+        max_members: Members listed per community (0 = all)
+        cursor: next_cursor of the previous page, '' for the first page
+    
+    `summary` holds the result fields other than the communities; `records` is a zero-argument
+    callable returning a fresh iterator over the page's community entries, so callers can
+    stream them without building the whole page.
+    """
+    graph = get_graph(bundle, graph_type)
+    if not graph:
+        return None, "Graph not available"
+    error = weight_by_error(graph_type, weight_by)
+    if error:
+        return None, error
+    period, error = period_or_error(weight_by, as_of, window)
+    if error:
+        return None, error
+    if top_k < 0 or max_members < 0:
+        return None, "top_k and max_members must be 0 (no limit) or positive"
+    
+    communities = louvain_communities(bundle, graph_type, weight_by, period)
+    # Detects a different Louvain result (reload, or recomputation after cache eviction)
+    checksum = hash(communities)
+    query = {"graph_type": graph_type, "weight_by": weight_by, "period": as_of or window}
+    start = 0
+    if cursor:
+        state = decode_cursor(cursor)
+        if state is None or not isinstance(state.get('offset'), int):
+            return None, "Invalid cursor"
+        if any(state.get(field) != value for field, value in query.items()):
+            return None, "Cursor was issued for a different graph_type, weight_by or period"
+        if state.get('checksum') != checksum:
+            return None, "Cursor has expired because the communities were recomputed; start again without a cursor"
+        start = state['offset']
+    stop = min(start + top_k, len(communities)) if top_k > 0 else len(communities)
+    
+    summary = {"graph_type": graph_type, "total_communities": len(communities)}
+    if period is not None:
+        summary["period"] = as_of or window
+    if start > 0:
+        summary["offset"] = start
+    if stop < len(communities):
+        summary["next_cursor"] = encode_cursor({**query, "offset": stop, "checksum": checksum})
+    return (summary, functools.partial(community_records, graph, graph_type, communities, start, stop,
+                                       max_members)), None
+
+def distinct_per_group(group_codes: np.ndarray, ids: np.ndarray, n_groups: int) -> np.ndarray:
+    """Number of distinct ids in each group, from one np.unique over packed (group, id) keys"""
+    ids = ids.astype(np.int64)
+    offset = ids.min() if len(ids) else 0
+    keys = np.unique(group_codes.astype(np.int64) << 32 | (ids - offset))
+    return np.bincount(keys >> 32, minlength=n_groups)
 
-# Global graph loader instance
-graph_loader = SoccerGraphLoader()
+def yearly_contract_stats(contracts_df: pd.DataFrame) -> pd.DataFrame:
+    """Distinct players, distinct clubs and total contract value per contract start year"""
+    years = pd.to_datetime(contracts_df['START_DATE']).dt.year.to_numpy(dtype=np.float64)
+    known = ~np.isnan(years)
+    year_values, year_codes = np.unique(years[known].astype(np.int64), return_inverse=True)
+    values = pd.to_numeric(contracts_df['CONTRACT_VALUE'], errors='coerce').to_numpy(dtype=np.float64)[known]
+    return pd.DataFrame({
+        'YEAR': year_values,
+        'PERSON_ID': distinct_per_group(year_codes, contracts_df['PERSON_ID'].to_numpy()[known], len(year_values)),
+        'CLUB_ID': distinct_per_group(year_codes, contracts_df['CLUB_ID'].to_numpy()[known], len(year_values)),
+        'CONTRACT_VALUE': np.bincount(year_codes, weights=np.nan_to_num(values), minlength=len(year_values))
+    })
+
+# Person attributes graph_temporal_analysis can break evolution down by
+TEMPORAL_GROUPS = ['nationality', 'position']
+
+def contract_evolution(cube: ContractCube, months: Optional[tuple] = None, group_by: str = '') -> List[dict]:
+    """Contracts, distinct players and clubs and total contract value per contract start year
+    (and per nationality or position with group_by), for contracts starting in months"""
+    rows = cube.rows(months, dated=True)
+    years = cube.cells['MONTH'][rows] // 12
+    if not len(years):
+        return []
+    # Cells are sorted by month, so the first and last cells hold the year span
+    first_year = int(years[0])
+    n_labels = len(cube.labels[group_by.upper()]) if group_by else 1
+    groups = (years - first_year).astype(np.int64) * n_labels
+    if group_by:
+        groups += cube.cells[group_by.upper()][rows]
+    stats = cube.rollup(rows, groups, (int(years[-1]) - first_year + 1) * n_labels)
+    evolution_data = []
+    for i in np.flatnonzero(stats['contracts']).tolist():
+        entry = {"year": first_year + i // n_labels}
+        if group_by:
+            entry[group_by] = cube.labels[group_by.upper()][i % n_labels]
+        entry.update({
+            "contracts": int(stats['contracts'][i]),
+            "unique_players": int(stats['players'][i]),
+            "unique_clubs": int(stats['clubs'][i]),
+            "total_contract_value": float(stats['contract_value'][i])
+        })
+        evolution_data.append(entry)
+    return evolution_data
+
+def contract_trends(cube: ContractCube, club_names: Dict[Any, str], months: Optional[tuple] = None,
+                    top_n: int = 10) -> List[dict]:
+    """Clubs with the most contracts starting in months (all contracts for None), most first
+    (equal counts by club ID), with their total contract value"""
+    rows = cube.rows(months)
+    club_ids, groups = np.unique(cube.cells['CLUB_ID'][rows], return_inverse=True)
+    contracts = np.bincount(groups, weights=cube.cells['CONTRACTS'][rows], minlength=len(club_ids))
+    values = np.bincount(groups, weights=cube.cells['CONTRACT_VALUE'][rows], minlength=len(club_ids))
+    trends_data = []
+    for i in np.lexsort((club_ids, -contracts)).tolist():
+        club_id = int(club_ids[i])
+        if club_id not in club_names:
+            continue
+        trends_data.append({
+            "club_id": club_id,
+            "club_name": club_names[club_id],
+            "transfer_count": int(contracts[i]),
+            "total_contract_value": float(values[i])
+        })
+        if len(trends_data) == top_n:
+            break
+    return trends_data
+
+def warm_analytics_cache(bundle: SoccerGraphLoader, analyses: List[str]):
+    """Precompute the given analyses (centrality types and/or 'louvain') for both graphs"""
+    for graph_type in ['player', 'club']:
+        if not get_graph(bundle, graph_type):
+            continue
+        for analysis in analyses:
+            try:
+                if analysis == 'louvain':
+                    louvain_communities(bundle, graph_type)
+                elif analysis in CENTRALITY_ALGORITHMS:
+                    centrality_ranking(bundle, graph_type, analysis)
+                else:
+                    logger.warning(f"Unknown analysis '{analysis}' in WARM_ANALYTICS_CACHE")
+                    continue
+                logger.info(f"Warmed {analysis} cache for {graph_type} graph")
+            except Exception as e:
+                logger.warning(f"Could not warm {analysis} cache for {graph_type} graph: {e}")
 
 # Helper functions
 async def ensure_data_loaded():
-    """Ensure graph data is loaded before processing"""
-    if not graph_loader.graph_data:
-        logger.info("Loading graph data from static files...")
-        if not graph_loader.load_from_static_files():
-            return False
-        if not graph_loader.build_networks():
-            return False
-    return True
+    """Ensure graph data is loaded before processing (single-flight, see GraphStore)"""
+    with span('load'):
+        return graph_store.ensure_loaded()
 
 def format_centrality_results(results: list, analysis_type: str) -> str:
     """Format centrality analysis results as readable string"""
@@ -237,86 +3156,146 @@ def format_community_results(communities: list, graph_type: str) -> str:
     
 # FastMCP Tools - using decorators for automatic tool registration
 @mcp.tool()
-async def graph_shortest_path(source_id: int, target_id: int, graph_type: str = 'player') -> str:
+@instrumented_tool
+async def graph_shortest_path(source_id: int, target_id: int, graph_type: str = 'player',
+                              weight_by: str = 'none', mode: str = 'shortest', k: int = 3,
+                              max_depth: int = 0, as_of: str = '', window: str = '') -> str:
     """Find shortest path between entities in the soccer knowledge graph.
     
     Args:
         source_id: Source entity ID
         target_id: Target entity ID  
         graph_type: Type of graph to analyze (player or club)
+        weight_by: Prefer strong ties: 'none' (fewest hops), 'all', or one relationship count
+            (player: shared_clubs, shared_matches; club: matches_played, shared_players)
+        mode: 'shortest' (one path), 'all_shortest' (every minimum-length path) or 'k_shortest'
+        k: Number of paths to return in 'k_shortest' mode
+        max_depth: Maximum number of hops to search (0 = no limit)
+        as_of: Only use relationships valid on this date (YYYY-MM-DD)
+        window: Only use relationships valid in this period: 'YYYY-MM-DD:YYYY-MM-DD', a span of
+            years ('2020-2024'), a season ('2023/24') or a year ('2023')
     """
     # Ensure data is loaded
     if not await ensure_data_loaded():
-        return "Failed to load graph data from static files."
+        return json.dumps({"error": "Failed to load graph data from static files."})
+    bundle = graph_store.bundle
     
     if graph_type == 'player':
-        graph = graph_loader.player_graph
+        graph = bundle.player_graph
     else:
-        graph = graph_loader.club_graph
+        graph = bundle.club_graph
     
     if not graph:
-        return "Graph not available. Please ensure data is loaded."
+        return json.dumps({"error": "Graph not available. Please ensure data is loaded."})
     
     if not graph.has_node(source_id) or not graph.has_node(target_id):
-        return "Invalid source or target ID. Please check the entity IDs."
+        return json.dumps({"error": "Invalid source or target ID. Please check the entity IDs."})
     
-    try:
-        path = nx.shortest_path(graph, source_id, target_id)
-        path_details = []
-        for node_id in path:
-            node_data = graph.nodes[node_id]
-            path_details.append({
-                "id": node_id,
-                "name": node_data.get('name', f"Node {node_id}"),
-                "type": graph_type
-            })
-        
-        # Format the result as a readable string
-        path_names = [node["name"] for node in path_details]
+    error = weight_by_error(graph_type, weight_by)
+    if error:
+        return json.dumps({"error": error})
+    if mode not in PATH_MODES:
+        return json.dumps({"error": f"Invalid mode '{mode}' (expected one of: {', '.join(PATH_MODES)})"})
+    period, error = period_or_error(weight_by, as_of, window)
+    if error:
+        return json.dumps({"error": error})
+    if period is not None:
+        snapshot = snapshot_graph(bundle, graph_type, period)
+        if not snapshot.has_node(source_id) or not snapshot.has_node(target_id):
+            return json.dumps({"error": "Source or target has no relationships in the requested period."})
+    
+    paths = find_paths(bundle, graph_type, source_id, target_id, mode, k, max_depth, weight_by, period)
+    if not paths:
+        if max_depth:
+            return json.dumps({"error": f"No path found within {max_depth} steps between the specified entities."})
+        return json.dumps({"error": "No path found between the specified entities."})
+    
+    def name(node_id):
+        return graph.nodes[node_id].get('name', f"Node {node_id}")
+    
+    # Snapshot edges carry the relationship and club or match valid in the period
+    hop_graph = snapshot if period is not None else graph
+    
+    def hop_lines(path):
+        return "".join(f"  {name(u)} -[{describe_hop(bundle, hop_graph, u, v)}]- {name(v)}\n"
+                       for u, v in zip(path, path[1:]))
+    
+    # Format the result as a readable string
+    if mode == 'shortest':
+        path = paths[0]
+        path_names = [name(node_id) for node_id in path]
         result = f"Shortest path from {path_names[0]} to {path_names[-1]}:\n"
         result += f"Path: {' -> '.join(path_names)}\n"
         result += f"Distance: {len(path) - 1} steps\n"
         result += f"Graph Type: {graph_type.title()}"
-        
+        if weight_by != 'none':
+            result += f"\nWeighted By: {weight_by}"
+        if period is not None:
+            result += f"\nPeriod: {as_of or window}"
+        if len(path) > 1:
+            result += f"\nHops:\n{hop_lines(path).rstrip()}"
         return result
-    except nx.NetworkXNoPath:
-        return "No path found between the specified entities."
+    
+    kind = 'shortest' if mode == 'all_shortest' else 'shortest simple'
+    result = f"Found {len(paths)} {kind} path(s) from {name(source_id)} to {name(target_id)}:\n"
+    for i, path in enumerate(paths, 1):
+        result += f"Path {i} ({len(path) - 1} steps): {' -> '.join(name(node_id) for node_id in path)}\n"
+        result += hop_lines(path)
+    result += f"Graph Type: {graph_type.title()}"
+    if weight_by != 'none':
+        result += f"\nWeighted By: {weight_by}"
+    if period is not None:
+        result += f"\nPeriod: {as_of or window}"
+    return result
 
 @mcp.tool()
-async def graph_centrality_analysis(graph_type: str = 'player', analysis_type: str = 'betweenness', top_n: int = 10) -> str:
+@instrumented_tool
+async def graph_centrality_analysis(graph_type: str = 'player', analysis_type: str = 'betweenness', top_n: int = 10,
+                                    sample_size: int = 0, workers: int = 1, weight_by: str = 'none',
+                                    as_of: str = '', window: str = '') -> str:
     """Analyze centrality measures for entities in the soccer knowledge graph.
     
     Args:
         graph_type: Type of graph to analyze (player or club)
-        analysis_type: Type of centrality analysis (betweenness, closeness, degree, eigenvector)
+        analysis_type: Type of centrality analysis (betweenness, closeness, degree, eigenvector, pagerank)
         top_n: Number of top results to return
+        sample_size: Betweenness only - number of sampled pivot nodes for an approximate result (0 = exact)
+        workers: Betweenness only - number of processes to split source nodes across
+        weight_by: Edge weighting: 'none', 'all', or one relationship count
+            (player: shared_clubs, shared_matches; club: matches_played, shared_players)
+        as_of: Analyze the graph of relationships valid on this date (YYYY-MM-DD)
+        window: Analyze the graph of relationships valid in this period: 'YYYY-MM-DD:YYYY-MM-DD',
+            a span of years ('2020-2024'), a season ('2023/24') or a year ('2023')
     """
     # Ensure data is loaded
     if not await ensure_data_loaded():
         return json.dumps({"error": "Failed to load graph data from static files."})
+    bundle = graph_store.bundle
     
     if graph_type == 'player':
-        graph = graph_loader.player_graph
+        graph = bundle.player_graph
     else:
-        graph = graph_loader.club_graph
+        graph = bundle.club_graph
     
     if not graph:
         return json.dumps({"error": "Graph not available"})
     
     try:
-        if analysis_type == 'betweenness':
-            centrality = nx.betweenness_centrality(graph)
-        elif analysis_type == 'closeness':
-            centrality = nx.closeness_centrality(graph)
-        elif analysis_type == 'degree':
-            centrality = nx.degree_centrality(graph)
-        elif analysis_type == 'eigenvector':
-            centrality = nx.eigenvector_centrality(graph)
-        else:
+        if analysis_type not in CENTRALITY_ALGORITHMS:
             return json.dumps({"error": "Invalid analysis type"})
+        error = weight_by_error(graph_type, weight_by)
+        if error:
+            return json.dumps({"error": error})
+        period, error = period_or_error(weight_by, as_of, window)
+        if error:
+            return json.dumps({"error": error})
+        if period is not None:
+            graph = snapshot_graph(bundle, graph_type, period)
         
-        # Sort by centrality score
-        sorted_centrality = sorted(centrality.items(), key=lambda x: x[1], reverse=True)
+        # Full ranking is cached per graph version; top_n only slices it
+        workers = max(1, min(workers, os.cpu_count() or 1))
+        sorted_centrality = centrality_ranking(bundle, graph_type, analysis_type, sample_size, workers, weight_by,
+                                               period)
         top_results = []
         
         for node_id, score in sorted_centrality[:top_n]:
@@ -333,60 +3312,57 @@ async def graph_centrality_analysis(graph_type: str = 'player', analysis_type: s
             "graph_type": graph_type,
             "top_results": top_results
         }
-        return json.dumps(result)
+        if weight_by != 'none':
+            result["weight_by"] = weight_by
+        if period is not None:
+            result["period"] = as_of or window
+        if analysis_type == 'betweenness':
+            total_nodes = graph.number_of_nodes()
+            pivots = sample_size if 0 < sample_size < total_nodes else total_nodes
+            result["sample_size"] = pivots
+            result["total_nodes"] = total_nodes
+            result["error_bound"] = betweenness_error_bound(total_nodes, pivots)
+            result["confidence"] = BETWEENNESS_CONFIDENCE
+        return to_json(result)
     except Exception as e:
         return json.dumps({"error": f"Centrality analysis failed: {str(e)}"})
 
 @mcp.tool()
-async def graph_community_detection(graph_type: str = 'player') -> str:
-    """Detect communities in the soccer knowledge graph.
+@instrumented_tool
+async def graph_community_detection(graph_type: str = 'player', weight_by: str = 'none',
+                                    as_of: str = '', window: str = '', top_k: int = 0,
+                                    max_members: int = 0, cursor: str = '') -> str:
+    """Detect communities in the soccer knowledge graph, largest first.
     
     Args:
         graph_type: Type of graph to analyze (player or club)
+        weight_by: Edge weighting: 'none', 'all', or one relationship count
+            (player: shared_clubs, shared_matches; club: matches_played, shared_players)
+        as_of: Detect communities among relationships valid on this date (YYYY-MM-DD)
+        window: Detect communities among relationships valid in this period: 'YYYY-MM-DD:YYYY-MM-DD',
+            a span of years ('2020-2024'), a season ('2023/24') or a year ('2023')
+        top_k: Return at most this many communities (0 = all); the result's next_cursor fetches the next ones
+        max_members: List at most this many members per community (0 = all); size is always the full count
+        cursor: next_cursor from a previous call with the same graph_type, weight_by and period
     """
     # Ensure data is loaded
     if not await ensure_data_loaded():
         return json.dumps({"error": "Failed to load graph data from static files."})
-    
-    if graph_type == 'player':
-        graph = graph_loader.player_graph
-    else:
-        graph = graph_loader.club_graph
-    
-    if not graph:
-        return json.dumps({"error": "Graph not available"})
+    bundle = graph_store.bundle
     
     try:
-        # Use Louvain community detection
-        communities = nx.community.louvain_communities(graph)
-        community_results = []
-        
-        for i, community in enumerate(communities):
-            community_members = []
-            for node_id in community:
-                node_data = graph.nodes[node_id]
-                community_members.append({
-                    "id": node_id,
-                    "name": node_data.get('name', f"Node {node_id}"),
-                    "type": graph_type
-                })
-            
-            community_results.append({
-                "community_id": i,
-                "size": len(community),
-                "members": community_members
-            })
-        
-        result = {
-            "graph_type": graph_type,
-            "communities": community_results,
-            "total_communities": len(communities)
-        }
-        return json.dumps(result)
+        # Use Louvain community detection (cached per graph version)
+        page, error = community_page(bundle, graph_type, weight_by, as_of, window, top_k, max_members, cursor)
+        if error:
+            return json.dumps({"error": error})
+        summary, records = page
+        result = {"graph_type": graph_type, "communities": list(records()), **summary}
+        return to_json(result)
     except Exception as e:
         return json.dumps({"error": f"Community detection failed: {str(e)}"})
 
 @mcp.tool()
+@instrumented_tool
 async def graph_transfer_network_analysis(club_id: int = None, player_id: int = None, start_date: str = None, end_date: str = None) -> str:
     """Analyze transfer networks in the soccer knowledge graph.
     
@@ -399,41 +3375,33 @@ async def graph_transfer_network_analysis(club_id: int = None, player_id: int =
     # Ensure data is loaded
     if not await ensure_data_loaded():
         return json.dumps({"error": "Failed to load graph data from static files."})
+    bundle = graph_store.bundle
     
-    if not graph_loader.graph_data:
+    if not bundle.graph_data:
         return json.dumps({"error": "Graph data not available"})
     
     try:
-        player_contracts_df = graph_loader.graph_data['player_contracts']
-        persons_df = graph_loader.graph_data['persons']
-        clubs_df = graph_loader.graph_data['clubs']
-        
         # Filter by date range if provided
+        start_dt = end_dt = None
         if start_date and end_date:
             start_dt = pd.to_datetime(start_date)
             end_dt = pd.to_datetime(end_date)
-            # Convert START_DATE column to datetime if it's not already
-            player_contracts_df['START_DATE'] = pd.to_datetime(player_contracts_df['START_DATE'])
-            player_contracts_df = player_contracts_df[
-                (player_contracts_df['START_DATE'] >= start_dt) & 
-                (player_contracts_df['START_DATE'] <= end_dt)
-            ]
         
         # Analyze transfers for specific club
         if club_id:
-            club_contracts = player_contracts_df[player_contracts_df['CLUB_ID'] == club_id]
             transfers = []
             
-            for _, contract in club_contracts.iterrows():
-                person_id = contract['PERSON_ID']
-                person_data = persons_df[persons_df['PERSON_ID'] == person_id]
-                if not person_data.empty:
+            with span('algorithm'):
+                positions = bundle.contracts_by_club.lookup(club_id, start_dt, end_dt)
+            for position in positions:
+                person_id, _, contract_start, contract_end, contract_value = bundle.contract_rows[position]
+                if person_id in bundle.person_names:
                     transfers.append({
                         "player_id": person_id,
-                        "player_name": person_data.iloc[0]['NAME'],
-                        "start_date": str(contract['START_DATE']) if pd.notna(contract['START_DATE']) else None,
-                        "end_date": str(contract['END_DATE']) if pd.notna(contract['END_DATE']) else None,
-                        "contract_value": float(contract['CONTRACT_VALUE']) if pd.notna(contract['CONTRACT_VALUE']) else 0.0
+                        "player_name": bundle.person_names[person_id],
+                        "start_date": contract_start,
+                        "end_date": contract_end,
+                        "contract_value": contract_value
                     })
             
             result = {
@@ -441,23 +3409,23 @@ async def graph_transfer_network_analysis(club_id: int = None, player_id: int =
                 "transfers": transfers,
                 "total_transfers": len(transfers)
             }
-            return json.dumps(result)
+            return to_json(result)
         
         # Analyze transfers for specific player
         elif player_id:
-            player_contracts = player_contracts_df[player_contracts_df['PERSON_ID'] == player_id]
             transfer_history = []
             
-            for _, contract in player_contracts.iterrows():
-                club_id = contract['CLUB_ID']
-                club_data = clubs_df[clubs_df['CLUB_ID'] == club_id]
-                if not club_data.empty:
+            with span('algorithm'):
+                positions = bundle.contracts_by_player.lookup(player_id, start_dt, end_dt)
+            for position in positions:
+                _, club_id, contract_start, contract_end, contract_value = bundle.contract_rows[position]
+                if club_id in bundle.club_names:
                     transfer_history.append({
                         "club_id": club_id,
-                        "club_name": club_data.iloc[0]['CLUB_NAME'],
-                        "start_date": str(contract['START_DATE']) if pd.notna(contract['START_DATE']) else None,
-                        "end_date": str(contract['END_DATE']) if pd.notna(contract['END_DATE']) else None,
-                        "contract_value": float(contract['CONTRACT_VALUE']) if pd.notna(contract['CONTRACT_VALUE']) else 0.0
+                        "club_name": bundle.club_names[club_id],
+                        "start_date": contract_start,
+                        "end_date": contract_end,
+                        "contract_value": contract_value
                     })
             
             result = {
@@ -465,7 +3433,7 @@ async def graph_transfer_network_analysis(club_id: int = None, player_id: int =
                 "transfer_history": transfer_history,
                 "total_clubs": len(transfer_history)
             }
-            return json.dumps(result)
+            return to_json(result)
         
         else:
             return json.dumps({"error": "Either club_id or player_id must be provided"})
@@ -474,111 +3442,298 @@ async def graph_transfer_network_analysis(club_id: int = None, player_id: int =
         return json.dumps({"error": f"Transfer network analysis failed: {str(e)}"})
 
 @mcp.tool()
-async def graph_temporal_analysis(time_range: str, analysis_type: str = 'evolution') -> str:
+@instrumented_tool
+async def graph_temporal_analysis(time_range: str = '', analysis_type: str = 'evolution', group_by: str = '') -> str:
     """Perform temporal analysis on the soccer knowledge graph.
     
     Args:
-        time_range: Time range for analysis
-        analysis_type: Type of temporal analysis (evolution, trends, patterns)
+        time_range: Contracts starting in this period: a year ('2024'), a span of years
+            ('2020-2024'), a season ('2023/24'), 'YYYY-MM-DD:YYYY-MM-DD' (whole months), or '' for all time
+        analysis_type: Type of temporal analysis (evolution, trends)
+        group_by: Evolution only - also break each year down by 'nationality' or 'position'
     """
     # Ensure data is loaded
     if not await ensure_data_loaded():
         return json.dumps({"error": "Failed to load graph data from static files."})
+    bundle = graph_store.bundle
     
-    if not graph_loader.graph_data:
+    if not bundle.graph_data or bundle.contract_cube is None:
         return json.dumps({"error": "Graph data not available"})
     
     try:
+        try:
+            months = parse_time_range(time_range)
+        except ValueError as e:
+            return json.dumps({"error": str(e)})
+        if group_by and (group_by not in TEMPORAL_GROUPS or analysis_type != 'evolution'):
+            return json.dumps({"error": f"group_by must be one of: {', '.join(TEMPORAL_GROUPS)} "
+                                        "(evolution only)"})
+        
+        # Both modes read the contract cube built at load time
         if analysis_type == 'evolution':
-            # Analyze network evolution over time
-            player_contracts_df = graph_loader.graph_data['player_contracts']
-            
-            # Group by year to see evolution
-            player_contracts_df['YEAR'] = pd.to_datetime(player_contracts_df['START_DATE']).dt.year
-            yearly_stats = player_contracts_df.groupby('YEAR').agg({
-                'PERSON_ID': 'nunique',
-                'CLUB_ID': 'nunique',
-                'CONTRACT_VALUE': 'sum'
-            }).reset_index()
-            
-            evolution_data = []
-            for _, row in yearly_stats.iterrows():
-                evolution_data.append({
-                    "year": int(row['YEAR']),
-                    "unique_players": int(row['PERSON_ID']),
-                    "unique_clubs": int(row['CLUB_ID']),
-                    "total_contract_value": float(row['CONTRACT_VALUE']) if pd.notna(row['CONTRACT_VALUE']) else 0
-                })
-            
+            with span('algorithm'):
+                evolution_data = contract_evolution(bundle.contract_cube, months, group_by)
             result = {
                 "analysis_type": "evolution",
                 "time_range": time_range,
                 "evolution_data": evolution_data
             }
-            return json.dumps(result)
-        
+            if group_by:
+                result["group_by"] = group_by
         elif analysis_type == 'trends':
-            # Analyze transfer trends
-            player_contracts_df = graph_loader.graph_data['player_contracts']
-            clubs_df = graph_loader.graph_data['clubs']
-            
-            # Top clubs by number of transfers
-            club_transfers = player_contracts_df.groupby('CLUB_ID').size().reset_index(name='transfer_count')
-            club_transfers = club_transfers.merge(clubs_df[['CLUB_ID', 'CLUB_NAME']], on='CLUB_ID')
-            top_clubs = club_transfers.nlargest(10, 'transfer_count')
-            
-            trends_data = []
-            for _, row in top_clubs.iterrows():
-                trends_data.append({
-                    "club_id": int(row['CLUB_ID']),
-                    "club_name": row['CLUB_NAME'],
-                    "transfer_count": int(row['transfer_count'])
-                })
-            
+            with span('algorithm'):
+                trends_data = contract_trends(bundle.contract_cube, bundle.club_names, months)
             result = {
                 "analysis_type": "trends",
                 "time_range": time_range,
                 "trends_data": trends_data
             }
-            return json.dumps(result)
-        
         else:
             return json.dumps({"error": "Invalid analysis type"})
+        if months is not None:
+            result["period"] = {"from": format_month(months[0]), "to": format_month(months[1])}
+        return to_json(result)
             
     except Exception as e:
         return json.dumps({"error": f"Temporal analysis failed: {str(e)}"})
     
+@mcp.tool()
+@instrumented_tool
+async def graph_inferred_relations(rel_name: str = '', node_id: str = '', limit: int = 50) -> str:
+    """List relationships derived by the ontology inference rules (e.g. HAS_PLAYER from PLAYS_FOR).
+    
+    Args:
+        rel_name: Only this inferred relationship type (all when empty)
+        node_id: Only edges from this KG node ID (all when empty)
+        limit: Maximum number of edges returned (0 for all)
+    """
+    # Ensure data is loaded
+    if not await ensure_data_loaded():
+        return json.dumps({"error": "Failed to load graph data from static files."})
+    bundle = graph_store.bundle
+    
+    if not bundle.graph_data:
+        return json.dumps({"error": "Graph data not available"})
+    
+    try:
+        inferred = inferred_edges(bundle)
+        if rel_name:
+            inferred = inferred[inferred['REL_NAME'] == rel_name]
+        if node_id:
+            inferred = inferred[inferred['SRC_ID'] == str(node_id)]
+        rule_counts = inferred['RULE_ID'].value_counts()
+        
+        edges = []
+        for row in (inferred.head(limit) if limit > 0 else inferred).itertuples(index=False):
+            edges.append({
+                "rel_name": row.REL_NAME,
+                "src_id": row.SRC_ID,
+                "dst_id": row.DST_ID,
+                "inference_kind": row.INFERENCE_KIND,
+                "rule_id": row.RULE_ID,
+                "weight": float(row.WEIGHT),
+                "effective_start": row.EFFECTIVE_START.date().isoformat() if pd.notna(row.EFFECTIVE_START) else None,
+                "effective_end": row.EFFECTIVE_END.date().isoformat() if pd.notna(row.EFFECTIVE_END) else None
+            })
+        
+        result = {
+            "rules": {rule_id: int(count) for rule_id, count in rule_counts.items()},
+            "total_inferred": len(inferred),
+            "edges": edges
+        }
+        return to_json(result)
+        
+    except Exception as e:
+        return json.dumps({"error": f"Inferred relations lookup failed: {str(e)}"})
+
 # HTTP endpoints for SPCS stored procedures
 flask_app = Flask(__name__)
 
+# Content type of the Prometheus text exposition format
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+@flask_app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@flask_app.after_request
+def record_flask_request(response):
+    """Count and time every request by its route pattern (unknown paths share one label)"""
+    start = getattr(g, 'request_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        record_request(route, response.status_code, time.perf_counter() - start)
+    return response
+
+class InvalidRow:
+    """Stands in for the arguments of a Service Function row that could not be parsed"""
+    
+    def __init__(self, error: Exception):
+        self.message = f"Invalid arguments: {error}"
+    
+    @property
+    def result(self) -> str:
+        return json.dumps({"error": self.message})
+
+def parse_batch_row(row, parse_row):
+    """The tool's argument tuple for one row, or InvalidRow when an argument is missing, NULL
+    where required, or cannot be cast"""
+    try:
+        return parse_row(row)
+    except (TypeError, ValueError, IndexError) as e:
+        return InvalidRow(e)
+
+def parse_batch(payload: dict, parse_row) -> tuple:
+    """Split a Service Function payload into per-row calls and the distinct argument tuples.
+    
+    Service Functions send {"data": [[row_number, arg1, arg2, ...], ...]} and expect
+    {"data": [[row_number, result], ...]} with one entry per input row, in order. A row
+    whose arguments do not parse gets an error result of its own; the rest of the batch
+    still runs.
+    
+    Args:
+        payload: Decoded request body
+        parse_row: Maps a raw row to the tool's positional argument tuple
+    """
+    calls = [(row[0], parse_batch_row(row, parse_row)) for row in payload['data']]
+    
+    # Dedupe identical argument tuples within the batch
+    unique_args = list(dict.fromkeys(args for _, args in calls if not isinstance(args, InvalidRow)))
+    return calls, unique_args
+
+def batch_response(calls: list, results: dict) -> dict:
+    """Service Function response body with one [row_number, result] per input row"""
+    return {"data": [[row_number, args.result if isinstance(args, InvalidRow) else results[args]]
+                     for row_number, args in calls]}
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+def wants_ndjson(accept: Optional[str], format_arg: Optional[str]) -> bool:
+    """Whether a request asked for a streamed NDJSON response (?format=ndjson or the Accept header)"""
+    return format_arg == 'ndjson' or NDJSON_CONTENT_TYPE in (accept or '')
+
+def load_community_page(args: tuple) -> tuple:
+    """community_page for parsed Service Function arguments, loading the bundle first"""
+    if not graph_store.ensure_loaded():
+        return None, "Failed to load graph data from static files."
+    try:
+        return community_page(graph_store.bundle, *args)
+    except Exception as e:
+        return None, f"Community detection failed: {str(e)}"
+
+# Endpoints that can stream NDJSON: path -> loader of one (page, error) per argument tuple
+NDJSON_PAGE_LOADERS = {
+    '/community-detect': load_community_page
+}
+
+def page_ndjson_lines(calls: list, pages: dict):
+    """Yield NDJSON lines for a batch of paged results.
+    
+    Per input row: one line with the summary fields, then one line per entry, each carrying
+    the row number; a row that failed gets a single error line instead. Entries are encoded
+    one at a time, so memory does not grow with the number of entries.
+    """
+    for row_number, args in calls:
+        page, error = (None, args.message) if isinstance(args, InvalidRow) else pages[args]
+        if error:
+            yield json.dumps({"row": row_number, "error": error}) + '\n'
+            continue
+        summary, records = page
+        yield json.dumps({"row": row_number, **summary}) + '\n'
+        for record in records():
+            yield json.dumps({"row": row_number, **record}) + '\n'
+
+def stream_service_function_batch(parse_row, load_page):
+    """Run a Service Function batch and stream the results as NDJSON (Flask)"""
+    route = request.path
+    with span('parse', route):
+        calls, unique_args = parse_batch(request.get_json() or {}, parse_row)
+    record_batch(route, calls, unique_args)
+    with span('tools', route):
+        pages = {args: load_page(args) for args in unique_args}
+    return Response(page_ndjson_lines(calls, pages), content_type=NDJSON_CONTENT_TYPE)
+
+def run_service_function_batch(parse_row, tool):
+    """Run a tool for every row of a Snowflake Service Function batch (Flask).
+    
+    Rows with identical arguments are computed once, and all calls share one event loop.
+    
+    Args:
+        parse_row: Maps a raw row to the tool's positional argument tuple
+        tool: Async graph analytics tool to call
+    """
+    route = request.path
+    with span('parse', route):
+        calls, unique_args = parse_batch(request.get_json() or {}, parse_row)
+    record_batch(route, calls, unique_args)
+    
+    async def run_unique():
+        return {args: await tool(*args) for args in unique_args}
+    
+    with span('tools', route):
+        results = asyncio.run(run_unique())
+    with span('serialize', route):
+        return jsonify(batch_response(calls, results))
+
+def optional_weight_by(row, position):
+    """weight_by from an optional trailing argument ('none' when absent or NULL)"""
+    return str(row[position]) if len(row) > position and row[position] else 'none'
+
+def optional_text(row, position):
+    """String from an optional trailing argument ('' when absent or NULL)"""
+    return str(row[position]) if len(row) > position and row[position] else ''
+
+def parse_shortest_path_row(row):
+    """[row_number, source_id, target_id, graph_type(, weight_by(, mode(, k(, max_depth(, as_of(, window))))))]"""
+    mode = str(row[5]) if len(row) > 5 and row[5] else 'shortest'
+    k = int(row[6]) if len(row) > 6 and row[6] else 3
+    max_depth = int(row[7]) if len(row) > 7 and row[7] else 0
+    return (int(row[1]), int(row[2]), str(row[3]), optional_weight_by(row, 4), mode, k, max_depth,
+            optional_text(row, 8), optional_text(row, 9))
+
+def parse_community_row(row):
+    """[row_number, graph_type(, weight_by(, as_of(, window(, top_k(, max_members(, cursor))))))]"""
+    top_k = int(row[5]) if len(row) > 5 and row[5] else 0
+    max_members = int(row[6]) if len(row) > 6 and row[6] else 0
+    return (str(row[1]), optional_weight_by(row, 2), optional_text(row, 3), optional_text(row, 4),
+            top_k, max_members, optional_text(row, 7))
+
+def parse_centrality_row(row):
+    """[row_number, graph_type, analysis_type, top_n(, sample_size(, weight_by(, as_of(, window))))]"""
+    sample_size = int(row[4]) if len(row) > 4 and row[4] else 0
+    return (str(row[1]), str(row[2]), int(row[3]), sample_size, 1, optional_weight_by(row, 5),
+            optional_text(row, 6), optional_text(row, 7))
+
+def parse_transfer_row(row):
+    """[row_number, club_id, player_id, start_date, end_date] (0 means 'not filtered')"""
+    club_id = row[1] if row[1] not in [None, 0] else None
+    player_id = row[2] if row[2] not in [None, 0] else None
+    start_date = row[3]
+    end_date = row[4]
+    return (
+        int(club_id) if club_id is not None else None,
+        int(player_id) if player_id is not None else None,
+        str(start_date) if start_date else None,
+        str(end_date) if end_date else None
+    )
+
+def parse_temporal_row(row):
+    """[row_number, time_range, analysis_type(, group_by)]"""
+    return (str(row[1]), str(row[2]), optional_text(row, 3))
+
+def parse_inferred_row(row):
+    """[row_number(, rel_name(, node_id(, limit)))]"""
+    limit = int(row[3]) if len(row) > 3 and row[3] is not None else 50
+    return (optional_text(row, 1), optional_text(row, 2), limit)
+
 @flask_app.route('/shortest-path', methods=['POST'])
 def shortest_path_endpoint():
     """HTTP endpoint for shortest path analysis (Snowflake Service Function format)"""
     try:
-        payload = request.get_json() or {}
-        
-        # Service Functions send: {"data": [[row_number, source_id, target_id, graph_type]]}
-        # Process the first row (Service Functions can send batches)
-        row = payload['data'][0]
-        
-        # Extract arguments by position
-        row_number = row[0]  # Snowflake row index
-        source_id = row[1]   # First argument
-        target_id = row[2]   # Second argument
-        graph_type = row[3]  # Third argument
-        
-        # Call the graph analytics logic
-        result = asyncio.run(graph_shortest_path(int(source_id), int(target_id), str(graph_type)))
-        
-        # Service Functions expect: {"data": [[row_number, result]]}
-        response_data = {
-            "data": [
-                [row_number, result]
-            ]
-        }
-        return jsonify(response_data)
+        # Service Functions send: {"data": [[row_number, source_id, target_id, graph_type], ...]}
+        return run_service_function_batch(parse_shortest_path_row, graph_shortest_path)
         
-    except (KeyError, IndexError) as e:
+    except (KeyError, IndexError, TypeError) as e:
         # Malformed request
         return jsonify({"error": "Invalid request format", "details": str(e)}), 400
     except Exception as e:
@@ -588,26 +3743,12 @@ def shortest_path_endpoint():
 def community_detection_endpoint():
     """HTTP endpoint for community detection (Snowflake Service Function format)"""
     try:
-        payload = request.get_json() or {}
+        if wants_ndjson(request.headers.get('Accept'), request.args.get('format')):
+            return stream_service_function_batch(parse_community_row, NDJSON_PAGE_LOADERS[request.path])
+        # Service Functions send: {"data": [[row_number, graph_type], ...]}
+        return run_service_function_batch(parse_community_row, graph_community_detection)
         
-        # Service Functions send: {"data": [[row_number, graph_type]]}
-        row = payload['data'][0]
-        
-        row_number = row[0]
-        graph_type = row[1]
-        
-        # Call the graph analytics logic
-        result = asyncio.run(graph_community_detection(str(graph_type)))
-        
-        # Return in Service Function format
-        response_data = {
-            "data": [
-                [row_number, result]
-            ]
-        }
-        return jsonify(response_data)
-        
-    except (KeyError, IndexError) as e:
+    except (KeyError, IndexError, TypeError) as e:
         return jsonify({"error": "Invalid request format", "details": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -616,28 +3757,10 @@ def community_detection_endpoint():
 def centrality_endpoint():
     """HTTP endpoint for centrality analysis (Snowflake Service Function format)"""
     try:
-        payload = request.get_json() or {}
-        
-        # Service Functions send: {"data": [[row_number, graph_type, analysis_type, top_n]]}
-        row = payload['data'][0]
-        
-        row_number = row[0]
-        graph_type = row[1]
-        analysis_type = row[2]
-        top_n = row[3]
+        # Service Functions send: {"data": [[row_number, graph_type, analysis_type, top_n(, sample_size)], ...]}
+        return run_service_function_batch(parse_centrality_row, graph_centrality_analysis)
         
-        # Call the graph analytics logic
-        result = asyncio.run(graph_centrality_analysis(str(graph_type), str(analysis_type), int(top_n)))
-        
-        # Return in Service Function format
-        response_data = {
-            "data": [
-                [row_number, result]
-            ]
-        }
-        return jsonify(response_data)
-        
-    except (KeyError, IndexError) as e:
+    except (KeyError, IndexError, TypeError) as e:
         return jsonify({"error": "Invalid request format", "details": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -646,34 +3769,10 @@ def centrality_endpoint():
 def transfer_network_endpoint():
     """HTTP endpoint for transfer network analysis (Snowflake Service Function format)"""
     try:
-        payload = request.get_json() or {}
-        
-        # Service Functions send: {"data": [[row_number, club_id, player_id, start_date, end_date]]}
-        row = payload['data'][0]
-        
-        row_number = row[0]
-        club_id = row[1] if row[1] not in [None, 0] else None
-        player_id = row[2] if row[2] not in [None, 0] else None
-        start_date = row[3]
-        end_date = row[4]
-        
-        # Call the graph analytics logic
-        result = asyncio.run(graph_transfer_network_analysis(
-            int(club_id) if club_id is not None else None,
-            int(player_id) if player_id is not None else None,
-            str(start_date) if start_date else None,
-            str(end_date) if end_date else None
-        ))
-        
-        # Return in Service Function format
-        response_data = {
-            "data": [
-                [row_number, result]
-            ]
-        }
-        return jsonify(response_data)
+        # Service Functions send: {"data": [[row_number, club_id, player_id, start_date, end_date], ...]}
+        return run_service_function_batch(parse_transfer_row, graph_transfer_network_analysis)
         
-    except (KeyError, IndexError) as e:
+    except (KeyError, IndexError, TypeError) as e:
         return jsonify({"error": "Invalid request format", "details": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -682,51 +3781,353 @@ def transfer_network_endpoint():
 def temporal_analysis_endpoint():
     """HTTP endpoint for temporal graph analysis (Snowflake Service Function format)"""
     try:
-        payload = request.get_json() or {}
+        # Service Functions send: {"data": [[row_number, time_range, analysis_type(, group_by)], ...]}
+        return run_service_function_batch(parse_temporal_row, graph_temporal_analysis)
         
-        # Service Functions send: {"data": [[row_number, time_range, analysis_type]]}
-        row = payload['data'][0]
-        
-        row_number = row[0]
-        time_range = row[1]
-        analysis_type = row[2]
-        
-        # Call the graph analytics logic
-        result = asyncio.run(graph_temporal_analysis(str(time_range), str(analysis_type)))
-        
-        # Return in Service Function format
-        response_data = {
-            "data": [
-                [row_number, result]
-            ]
-        }
-        return jsonify(response_data)
+    except (KeyError, IndexError, TypeError) as e:
+        return jsonify({"error": "Invalid request format", "details": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@flask_app.route('/inferred-relations', methods=['POST'])
+def inferred_relations_endpoint():
+    """HTTP endpoint for inferred relationships (Snowflake Service Function format)"""
+    try:
+        # Service Functions send: {"data": [[row_number, rel_name, node_id, limit], ...]}
+        return run_service_function_batch(parse_inferred_row, graph_inferred_relations)
         
-    except (KeyError, IndexError) as e:
+    except (KeyError, IndexError, TypeError) as e:
         return jsonify({"error": "Invalid request format", "details": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @flask_app.route('/health', methods=['GET', 'POST'])
 def health_endpoint():
-    """Health check endpoint"""
-    return jsonify({"status": "healthy", "service": "soccer-mcp-server"})
+    """Health/readiness check endpoint (503 until the graph bundle is loaded)"""
+    body, status_code = graph_store.health()
+    return jsonify(body), status_code
 
-def run_http_server(host='0.0.0.0', port=5000):
-    """Run HTTP server for SPCS endpoints"""
-    flask_app.run(host=host, port=port, debug=False)
+@flask_app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics: tool/route latency and phases, cache and batch counters, graph and memory gauges"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
 
-async def preload_graph_data():
-    """Preload graph data at startup from static JSON files"""
+@flask_app.route('/admin/reload', methods=['POST'])
+def reload_endpoint():
+    """Rebuild the graph bundle from graph_data/ in the background and swap it in"""
+    started = request_reload()
+    bundle = graph_store.bundle
+    return jsonify({
+        "status": "reloading" if started else "already_loading",
+        "graph_version": bundle.version if bundle is not None else None
+    }), 202
+
+@flask_app.route('/admin/ingest', methods=['POST'])
+def ingest_endpoint():
+    """Append rows ({"table_name": [records], ...}) and update only the affected edges"""
+    if worker_parent_pid is not None:
+        return jsonify({"error": WORKER_INGEST_ERROR}), 409
+    try:
+        return jsonify(graph_store.ingest(request.get_json() or {}))
+    except ValueError as e:
+        return jsonify({"error": "Invalid request format", "details": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# ASGI app for SPCS endpoints: one long-lived event loop, graph work runs in bounded pools.
+# Whole-graph analytics ('heavy') and per-query lookups ('light') get separate pools, so a
+# Louvain run cannot starve shortest path or transfer lookups, and /health never waits.
+HEAVY_POOL_SIZE = int(os.getenv('HEAVY_POOL_SIZE', '2'))
+LIGHT_POOL_SIZE = int(os.getenv('LIGHT_POOL_SIZE', '8'))
+
+# path -> (row parser, tool, pool, max concurrent requests)
+SERVICE_FUNCTION_ENDPOINTS = {
+    '/shortest-path': (parse_shortest_path_row, graph_shortest_path, 'light',
+                       int(os.getenv('SHORTEST_PATH_CONCURRENCY', '16'))),
+    '/transfer-network': (parse_transfer_row, graph_transfer_network_analysis, 'light',
+                          int(os.getenv('TRANSFER_NETWORK_CONCURRENCY', '16'))),
+    '/centrality': (parse_centrality_row, graph_centrality_analysis, 'heavy',
+                    int(os.getenv('CENTRALITY_CONCURRENCY', '2'))),
+    '/community-detect': (parse_community_row, graph_community_detection, 'heavy',
+                          int(os.getenv('COMMUNITY_DETECT_CONCURRENCY', '1'))),
+    '/temporal-analysis': (parse_temporal_row, graph_temporal_analysis, 'heavy',
+                           int(os.getenv('TEMPORAL_ANALYSIS_CONCURRENCY', '2'))),
+    '/inferred-relations': (parse_inferred_row, graph_inferred_relations, 'light',
+                            int(os.getenv('INFERRED_RELATIONS_CONCURRENCY', '16')))
+}
+
+def make_tool_pools() -> dict:
+    """Thread pools for whole-graph ('heavy') and per-query ('light') tools"""
+    return {
+        'heavy': ThreadPoolExecutor(max_workers=HEAVY_POOL_SIZE, thread_name_prefix='graph-heavy'),
+        'light': ThreadPoolExecutor(max_workers=LIGHT_POOL_SIZE, thread_name_prefix='graph-light')
+    }
+
+tool_pools = make_tool_pools()
+
+# Each pool thread drives tool coroutines on its own long-lived event loop
+worker_loops = threading.local()
+
+def run_tool_in_worker(tool, args):
+    """Run an async tool to completion on the calling pool thread's event loop"""
+    loop = getattr(worker_loops, 'loop', None)
+    if loop is None:
+        loop = worker_loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(tool(*args))
+
+def make_asgi_endpoint(path, parse_row, tool, pool_name, limit, load_page=None):
+    """Build a Starlette handler that runs a Service Function batch in a bounded pool.
+    
+    With `load_page` (see NDJSON_PAGE_LOADERS), requests for NDJSON get a streamed response:
+    the pages are prepared in the pool, then encoded line by line as the client reads them.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def endpoint(http_request: Request):
+        try:
+            with span('parse', path):
+                payload = await http_request.json() or {}
+                calls, unique_args = parse_batch(payload, parse_row)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            return JSONResponse({"error": "Invalid request format", "details": str(e)}, status_code=400)
+        record_batch(path, calls, unique_args)
+        
+        if load_page is not None and wants_ndjson(http_request.headers.get('accept'),
+                                                  http_request.query_params.get('format')):
+            with span('tools', path):
+                async with semaphore:
+                    loop = asyncio.get_running_loop()
+                    pages = await asyncio.gather(*[
+                        loop.run_in_executor(tool_pools[pool_name], load_page, args) for args in unique_args
+                    ])
+            return StreamingResponse(page_ndjson_lines(calls, dict(zip(unique_args, pages))),
+                                     media_type=NDJSON_CONTENT_TYPE)
+        
+        try:
+            # Includes time queued for the semaphore and pool
+            with span('tools', path):
+                async with semaphore:
+                    loop = asyncio.get_running_loop()
+                    outputs = await asyncio.gather(*[
+                        loop.run_in_executor(tool_pools[pool_name], run_tool_in_worker, tool, args)
+                        for args in unique_args
+                    ])
+            with span('serialize', path):
+                return JSONResponse(batch_response(calls, dict(zip(unique_args, outputs))))
+        except Exception as e:
+            return JSONResponse({"error": str(e)}, status_code=500)
+    
+    return endpoint
+
+async def asgi_health_endpoint(http_request: Request):
+    """Health/readiness check endpoint (answered on the event loop, never queued behind graph work)"""
+    body, status_code = graph_store.health()
+    return JSONResponse(body, status_code=status_code)
+
+async def asgi_metrics_endpoint(http_request: Request):
+    """Prometheus metrics: tool/route latency and phases, cache and batch counters, graph and memory gauges"""
+    return PlainTextResponse(metrics.render(), headers={'Content-Type': METRICS_CONTENT_TYPE})
+
+async def asgi_reload_endpoint(http_request: Request):
+    """Rebuild the graph bundle from graph_data/ in the background and swap it in"""
+    started = request_reload()
+    bundle = graph_store.bundle
+    return JSONResponse({
+        "status": "reloading" if started else "already_loading",
+        "graph_version": bundle.version if bundle is not None else None
+    }, status_code=202)
+
+async def asgi_ingest_endpoint(http_request: Request):
+    """Append rows ({"table_name": [records], ...}) and update only the affected edges"""
+    if worker_parent_pid is not None:
+        return JSONResponse({"error": WORKER_INGEST_ERROR}, status_code=409)
     try:
-        logger.info("Starting graph data preloading from static files...")
+        payload = await http_request.json() or {}
+        loop = asyncio.get_running_loop()
+        summary = await loop.run_in_executor(tool_pools['heavy'], graph_store.ingest, payload)
+        return JSONResponse(summary)
+    except ValueError as e:
+        return JSONResponse({"error": "Invalid request format", "details": str(e)}, status_code=400)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+class RequestMetricsMiddleware:
+    """ASGI middleware counting and timing every HTTP request by route (unknown paths share one label)"""
+    
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = set(routes)
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = [500]
+        
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
         
-        # Load from static files (try multiple possible locations)
-        if not graph_loader.load_from_static_files():
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope['path'] if scope['path'] in self.routes else 'unmatched'
+            record_request(route, status[0], time.perf_counter() - start)
+
+asgi_routes = [
+    Route(path, make_asgi_endpoint(path, *spec, NDJSON_PAGE_LOADERS.get(path)), methods=['POST'])
+    for path, spec in SERVICE_FUNCTION_ENDPOINTS.items()
+] + [
+    Route('/health', asgi_health_endpoint, methods=['GET', 'POST']),
+    Route('/metrics', asgi_metrics_endpoint, methods=['GET']),
+    Route('/admin/reload', asgi_reload_endpoint, methods=['POST']),
+    Route('/admin/ingest', asgi_ingest_endpoint, methods=['POST'])
+]
+
+asgi_app = Starlette(routes=asgi_routes, middleware=[
+    Middleware(RequestMetricsMiddleware, routes=[route.path for route in asgi_routes])
+])
+
+class WorkerPool:
+    """Pre-fork ASGI workers sharing one graph bundle built by the parent process.
+    
+    The parent loads the bundle once, exempts it from garbage collection (gc.freeze) and
+    forks workers that accept connections on one shared listening socket. Workers inherit
+    the bundle copy-on-write: NumPy arrays (CSR copies, edge weights, contract and interval
+    indexes) and memory-mapped snapshot files are never written, so their pages stay shared
+    by all workers; Python objects such as the NetworkX graphs are only copied page by page
+    as workers touch them. On reload (SIGHUP, sent by a worker's /admin/reload, or the data
+    watcher) the parent builds the new bundle, forks a new generation of workers on it and
+    then stops the old generation gracefully.
+    """
+    
+    def __init__(self, host: str, port: int, size: int):
+        self.config = uvicorn.Config(asgi_app, host=host, port=port, log_level='info')
+        self.size = size
+        self.socket = None
+        # pid -> graph version of the current generation; retiring: pids of older generations
+        self.workers = {}
+        self.retiring = set()
+        self.version = None
+        self.reload_requested = False
+        self.stopping = False
+    
+    def serve_in_worker(self):
+        """Worker process body: serve asgi_app on the inherited socket until SIGTERM"""
+        global worker_parent_pid
+        worker_parent_pid = os.getppid()
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+        # Pool threads do not survive fork
+        tool_pools.update(make_tool_pools())
+        uvicorn.Server(self.config).run(sockets=[self.socket])
+    
+    def spawn(self):
+        """Fork one worker on the current bundle"""
+        pid = os.fork()
+        if pid == 0:
+            try:
+                self.serve_in_worker()
+            except BaseException as e:
+                logger.error(f"Worker {os.getpid()} failed: {e}")
+                os._exit(1)
+            os._exit(0)
+        self.workers[pid] = graph_store.bundle.version
+    
+    def spawn_generation(self):
+        """Fork a full set of workers on the current bundle and retire the previous set"""
+        # Free the replaced bundle, then keep the collector from touching (and so copying) the new one
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+        previous = list(self.workers)
+        self.workers = {}
+        self.version = graph_store.bundle.version
+        for _ in range(self.size):
+            self.spawn()
+        for pid in previous:
+            self.retiring.add(pid)
+            self.signal_worker(pid, signal.SIGTERM)
+        logger.info(f"Started {self.size} HTTP workers on graph version {self.version}: {sorted(self.workers)}")
+    
+    def signal_worker(self, pid: int, signum: int):
+        """Send a signal to a worker that may already have exited"""
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+    
+    def reap(self):
+        """Collect exited workers, replacing any of the current generation that died"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            self.retiring.discard(pid)
+            if self.workers.pop(pid, None) is not None and not self.stopping:
+                logger.warning(f"Worker {pid} exited with status {status}; starting a replacement")
+                self.spawn()
+    
+    def handle_signal(self, signum, frame):
+        """Parent signal handler: SIGHUP requests a reload, SIGTERM and SIGINT stop the pool"""
+        if signum == signal.SIGHUP:
+            self.reload_requested = True
+        else:
+            self.stopping = True
+    
+    def run(self):
+        """Load the bundle, fork the workers and supervise them until SIGTERM or SIGINT"""
+        if not graph_store.ensure_loaded():
+            logger.error("Could not load graph data; not starting HTTP workers")
             return False
+        self.socket = self.config.bind_socket()
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.handle_signal)
+        self.spawn_generation()
+        
+        while not self.stopping:
+            time.sleep(0.5)
+            if self.reload_requested:
+                self.reload_requested = False
+                graph_store.reload()
+            self.reap()
+            # Fork only once the reload thread has finished, so no lock is held across fork
+            if graph_store.bundle.version != self.version and not graph_store.reloading and not self.stopping:
+                self.spawn_generation()
+        
+        for pid in list(self.workers) + list(self.retiring):
+            self.signal_worker(pid, signal.SIGTERM)
+        for pid in list(self.workers) + list(self.retiring):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.socket.close()
+        logger.info("HTTP workers stopped")
+        return True
+
+def run_http_server(host='0.0.0.0', port=5000):
+    """Run HTTP server for SPCS endpoints (ASGI by default, HTTP_SERVER=flask for the dev server)"""
+    if os.getenv('HTTP_SERVER', 'asgi').lower() == 'flask':
+        flask_app.run(host=host, port=port, debug=False)
+    elif HTTP_WORKERS > 1:
+        # Pre-fork workers sharing one graph bundle (see WorkerPool)
+        WorkerPool(host, port, HTTP_WORKERS).run()
+    else:
+        uvicorn.run(asgi_app, host=host, port=port, log_level='info')
+
+async def preload_graph_data():
+    """Preload graph data at startup from the binary snapshot or static JSON files"""
+    try:
+        logger.info("Starting graph data preloading...")
         
-        # Build networks
-        if not graph_loader.build_networks():
+        # Load from snapshot or static files (try multiple possible locations)
+        if not graph_store.ensure_loaded():
             return False
         
         logger.info("✅ Graph data preloaded successfully")
@@ -734,10 +4135,24 @@ async def preload_graph_data():
     except Exception as e:
         logger.error(f"Failed to preload graph data: {e}")
         return False
+
+def build_snapshot(data_dir='/app/graph_data'):
+    """Build-time step: load JSON, build graphs and write the binary snapshot"""
+    loader = SoccerGraphLoader()
+    if not loader.load_from_static_files(data_dir):
+        return False
+    if not loader.build_networks():
+        return False
+    return loader.save_snapshot()
     
 # Main entry point for MCP server
 def main():
     """Main entry point for the MCP server"""
+    # `python soccer_mcp_server.py --build-snapshot [data_dir]` prebuilds the snapshot and exits
+    if len(sys.argv) > 1 and sys.argv[1] == '--build-snapshot':
+        data_dir = sys.argv[2] if len(sys.argv) > 2 else '/app/graph_data'
+        sys.exit(0 if build_snapshot(data_dir) else 1)
+    
     # Check if we should run HTTP server (for SPCS) or STDIO (for MCP)
     transport_mode = os.getenv('MCP_TRANSPORT', 'stdio')
     
@@ -749,11 +4164,21 @@ def main():
         try:
             if asyncio.run(preload_graph_data()):
                 logger.info("✅ Graph data preloaded successfully")
+                warm_setting = os.getenv('WARM_ANALYTICS_CACHE', 'false').lower()
+                if warm_setting == 'true':
+                    warm_analytics_cache(graph_store.bundle, list(CENTRALITY_ALGORITHMS) + ['louvain'])
+                elif warm_setting != 'false':
+                    warm_analytics_cache(graph_store.bundle, [a.strip() for a in warm_setting.split(',') if a.strip()])
             else:
                 logger.warning("⚠️  Failed to preload graph data. Data will be loaded on first request.")
         except Exception as e:
             logger.warning(f"⚠️  Could not preload graph data: {e}. Data will be loaded on first request.")
     
+    # Optionally watch graph_data/ and hot-reload when files change
+    watch_interval = float(os.getenv('GRAPH_DATA_WATCH_INTERVAL', '0'))
+    if watch_interval > 0:
+        graph_store.start_watcher(watch_interval)
+    
     if transport_mode == 'http':
         # Run HTTP server for SPCS service functions
         logger.info("Starting HTTP server for SPCS endpoints on 0.0.0.0:5000")
@@ -20,6 +20,9 @@ SHOW ENDPOINTS IN SERVICE SOCCER_GRAPH_ANALYTICS_SERVICE;
 -- ===============================================================
 -- STEP 2: Create Service Functions (Cortex Agent Custom Tools)
 -- ===============================================================
+-- Every endpoint processes the whole batch and computes identical
+-- argument rows once, so Snowflake can send up to MAX_BATCH_ROWS
+-- rows per HTTP request.
 
 -- Tool 1: Shortest Path Analysis
 CREATE OR REPLACE FUNCTION shortest_path_tool(
@@ -30,7 +33,7 @@ CREATE OR REPLACE FUNCTION shortest_path_tool(
 RETURNS STRING
 SERVICE = SOCCER_GRAPH_ANALYTICS_SERVICE
 ENDPOINT = 'graph-api'
-MAX_BATCH_ROWS = 1
+MAX_BATCH_ROWS = 2000
 AS '/shortest-path';
 
 -- Tool 2: Centrality Analysis
@@ -42,7 +45,20 @@ CREATE OR REPLACE FUNCTION centrality_tool(
 RETURNS STRING
 SERVICE = SOCCER_GRAPH_ANALYTICS_SERVICE
 ENDPOINT = 'graph-api'
-MAX_BATCH_ROWS = 1
+MAX_BATCH_ROWS = 2000
+AS '/centrality';
+
+-- Tool 2b: Approximate Betweenness Centrality (sampled pivots, for large graphs)
+CREATE OR REPLACE FUNCTION approx_centrality_tool(
+    graph_type STRING,
+    analysis_type STRING,
+    top_n INTEGER,
+    sample_size INTEGER
+)
+RETURNS STRING
+SERVICE = SOCCER_GRAPH_ANALYTICS_SERVICE
+ENDPOINT = 'graph-api'
+MAX_BATCH_ROWS = 2000
 AS '/centrality';
 
 -- Tool 3: Community Detection
@@ -52,7 +68,7 @@ CREATE OR REPLACE FUNCTION community_detection_tool(
 RETURNS STRING
 SERVICE = SOCCER_GRAPH_ANALYTICS_SERVICE
 ENDPOINT = 'graph-api'
-MAX_BATCH_ROWS = 1
+MAX_BATCH_ROWS = 2000
 AS '/community-detect';
 
 -- Tool 4: Transfer Network Analysis
@@ -65,7 +81,7 @@ CREATE OR REPLACE FUNCTION transfer_analysis_tool(
 RETURNS STRING
 SERVICE = SOCCER_GRAPH_ANALYTICS_SERVICE
 ENDPOINT = 'graph-api'
-MAX_BATCH_ROWS = 1
+MAX_BATCH_ROWS = 2000
 AS '/transfer-network';
 
 -- Tool 5: Temporal Analysis
@@ -76,18 +92,45 @@ CREATE OR REPLACE FUNCTION temporal_analysis_tool(
 RETURNS STRING
 SERVICE = SOCCER_GRAPH_ANALYTICS_SERVICE
 ENDPOINT = 'graph-api'
-MAX_BATCH_ROWS = 1
+MAX_BATCH_ROWS = 2000
+AS '/temporal-analysis';
+
+-- Tool 5b: Temporal Breakdown (evolution per nationality or position)
+CREATE OR REPLACE FUNCTION temporal_breakdown_tool(
+    time_range STRING,
+    analysis_type STRING,
+    group_by STRING
+)
+RETURNS STRING
+SERVICE = SOCCER_GRAPH_ANALYTICS_SERVICE
+ENDPOINT = 'graph-api'
+MAX_BATCH_ROWS = 2000
 AS '/temporal-analysis';
 
+-- Tool 6: Inferred Relations
+CREATE OR REPLACE FUNCTION inferred_relations_tool(
+    rel_name STRING,
+    node_id STRING,
+    max_edges INTEGER
+)
+RETURNS STRING
+SERVICE = SOCCER_GRAPH_ANALYTICS_SERVICE
+ENDPOINT = 'graph-api'
+MAX_BATCH_ROWS = 2000
+AS '/inferred-relations';
+
 -- ===============================================================
 -- STEP 3: Grant Usage Permissions
 -- ===============================================================
 
 GRANT USAGE ON FUNCTION shortest_path_tool(INTEGER, INTEGER, STRING) TO ROLE PUBLIC;
 GRANT USAGE ON FUNCTION centrality_tool(STRING, STRING, INTEGER) TO ROLE PUBLIC;
+GRANT USAGE ON FUNCTION approx_centrality_tool(STRING, STRING, INTEGER, INTEGER) TO ROLE PUBLIC;
 GRANT USAGE ON FUNCTION community_detection_tool(STRING) TO ROLE PUBLIC;
 GRANT USAGE ON FUNCTION transfer_analysis_tool(INTEGER, INTEGER, STRING, STRING) TO ROLE PUBLIC;
 GRANT USAGE ON FUNCTION temporal_analysis_tool(STRING, STRING) TO ROLE PUBLIC;
+GRANT USAGE ON FUNCTION temporal_breakdown_tool(STRING, STRING, STRING) TO ROLE PUBLIC;
+GRANT USAGE ON FUNCTION inferred_relations_tool(STRING, STRING, INTEGER) TO ROLE PUBLIC;
 
 -- ===============================================================
 -- STEP 4: Test Service Functions
@@ -99,6 +142,9 @@ SELECT shortest_path_tool(1, 5, 'player') AS result;
 -- Test 2: Centrality Analysis
 SELECT centrality_tool('player', 'betweenness', 5) AS result;
 
+-- Test 2b: Approximate Betweenness (200 sampled pivots)
+SELECT approx_centrality_tool('player', 'betweenness', 5, 200) AS result;
+
 -- Test 3: Community Detection
 SELECT community_detection_tool('player') AS result;
 
@@ -108,6 +154,12 @@ SELECT transfer_analysis_tool(1, 0, '2024-01-01', '2025-12-31') AS result;
 -- Test 5: Temporal Analysis
 SELECT temporal_analysis_tool('2024-2025', 'evolution') AS result;
 
+-- Test 5b: Temporal Breakdown (2023/24 season by position)
+SELECT temporal_breakdown_tool('2023/24', 'evolution', 'position') AS result;
+
+-- Test 6: Inferred Relations (players of club 1)
+SELECT inferred_relations_tool('HAS_PLAYER', '1', 50) AS result;
+
 -- ===============================================================
 -- STEP 5: Add Service Functions as Custom Tools to Cortex Agent
 -- ===============================================================
@@ -134,10 +186,10 @@ Tool 2: Centrality Analysis
 • Custom tool identifier: ONTOLOGY_DB.SOCCER_KG.CENTRALITY_TOOL
 • Parameters:
   - graph_type (STRING, required): "Type of graph: 'player' or 'club'"
-  - analysis_type (STRING, required): "Centrality type: 'betweenness', 'degree', 'eigenvector', 'closeness'"
+  - analysis_type (STRING, required): "Centrality type: 'betweenness', 'degree', 'eigenvector', 'closeness', 'pagerank'"
   - top_n (INTEGER, required): "Number of top results to return"
 • Warehouse: COMPUTE_WH
-• Description: "Use this tool to find the most influential players or clubs using centrality analysis. Specify graph_type, analysis_type (betweenness/degree/eigenvector/closeness), and top_n."
+• Description: "Use this tool to find the most influential players or clubs using centrality analysis. Specify graph_type, analysis_type (betweenness/degree/eigenvector/closeness/pagerank), and top_n."
 
 Tool 3: Community Detection
 ---------------------------